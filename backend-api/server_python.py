@@ -10,9 +10,12 @@ from pathlib import Path
 # Add parent directory to path for groq_client import
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-from groq_client import GroqClient, CompletionConfig, Temperature
+from groq_client import (
+    GroqClient, CompletionConfig, Temperature, HedgePolicy, PriorityScheduler, RequestPriority,
+    CostGovernor, BudgetExceeded, CircuitBreaker, CircuitOpen, RequestJournal
+)
 import os
 from datetime import datetime
 
@@ -31,7 +34,18 @@ except Exception as e:
 
 # Initialize GROQ client
 try:
-    groq_client = GroqClient()
+    # Hedge slow interactive calls to keep chat p99 latency down, let
+    # chat overtake queued background work sharing the same quota. Budgets
+    # come from GROQ_BUDGET_* environment variables when set. During a GROQ
+    # outage the circuit breaker fails requests fast instead of retrying.
+    # Set GROQ_JOURNAL_DIR to keep a replayable log of every request
+    groq_client = GroqClient(
+        hedging=HedgePolicy(),
+        scheduler=PriorityScheduler(),
+        governor=CostGovernor.from_env(),
+        circuit_breaker=CircuitBreaker(),
+        journal=RequestJournal.from_env()
+    )
     print('[OK] GROQ client initialized successfully')
 except Exception as e:
     print(f'[ERROR] Failed to initialize GROQ client: {e}')
@@ -92,7 +106,10 @@ def chat():
             prompt=message,
             system_prompt=SYSTEM_PROMPT,
             config=config,
-            conversation_id=conversation_id
+            conversation_id=conversation_id,
+            hedge=True,
+            priority=RequestPriority.INTERACTIVE,
+            session_id=session_id
         )
 
         response_time = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -112,6 +129,22 @@ def chat():
             }
         })
 
+    except BudgetExceeded as e:
+        print(f'Chat budget exceeded: {e}')
+        return jsonify({
+            'success': False,
+            'error': 'Usage budget exhausted, please try again later',
+            'details': str(e)
+        }), 429
+
+    except CircuitOpen as e:
+        print(f'Chat unavailable: {e}')
+        return jsonify({
+            'success': False,
+            'error': 'AI service temporarily unavailable, please try again shortly',
+            'details': str(e)
+        }), 503
+
     except Exception as e:
         print(f'Chat endpoint error: {e}')
         return jsonify({
@@ -153,6 +186,18 @@ def get_stats():
 
     return jsonify(stats)
 
+@app.route('/api/scheduler', methods=['GET'])
+def scheduler_stats():
+    """Queue depth and wait times per GROQ priority class"""
+    return jsonify(groq_client.scheduler.stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """GROQ telemetry in Prometheus text format (?format=json for JSON)"""
+    if request.args.get('format') == 'json':
+        return Response(groq_client.export_metrics('json'), mimetype='application/json')
+    return Response(groq_client.export_metrics(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     PORT = int(os.getenv('BACKEND_PORT', 3001))
 
@@ -167,6 +212,7 @@ if __name__ == '__main__':
     print(f'  [OK] Server:      http://localhost:{PORT}')
     print(f'  [OK] Health:      http://localhost:{PORT}/health')
     print(f'  [OK] Chat API:    POST http://localhost:{PORT}/api/chat')
+    print(f'  [OK] Metrics:     http://localhost:{PORT}/metrics')
     print('  [OK] GROQ Model:  llama-3.3-70b-versatile')
     print('  [OK] System Prompt: NL2SQL for candidates database')
     print('')
@@ -18,7 +18,7 @@ from datetime import datetime
 # Add parent directory to path to import groq_client
 sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
 
-from groq_client import GroqClient, CompletionConfig, Temperature
+from groq_client import get_shared_client, CompletionConfig, Temperature
 
 # ============================================================================
 # EMAIL CLASSIFICATION CONFIGURATION
@@ -246,8 +246,8 @@ def classify_email(
         Classification results as dictionary
     """
     try:
-        # Initialize GROQ client
-        client = GroqClient(api_key=groq_api_key)
+        # Reuse the process-wide GROQ client (warm connection pool)
+        client = get_shared_client(groq_api_key)
 
         # Build user prompt
         user_prompt = build_user_prompt(
@@ -0,0 +1,150 @@
+"""
+Shared pytest setup for the GROQ client tests
+
+utils/groq and utils/email are imported as top-level modules (as the scripts
+next to them do), so both go on sys.path here. The fake SDK clients below
+stand in for Groq/AsyncGroq so tests run offline without an API key;
+tests that need real HTTP use the MockGroqServer from utils/groq.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(ROOT, "utils", "groq"), os.path.join(ROOT, "utils", "email")]
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+# The client logs every call at INFO
+logging.getLogger("groq_client").setLevel(logging.WARNING)
+
+
+def make_completion(content: str = '{"ok": true}', model: str = "test-model",
+                    prompt_tokens: int = 10, completion_tokens: int = 5):
+    """Object shaped like an SDK ChatCompletion"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+        model=model,
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        ),
+        created=time.time()
+    )
+
+
+def make_chunks(content: str, size: int = 4):
+    """SDK-shaped stream chunks for content, size characters each"""
+    return [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + size]))])
+        for i in range(0, len(content), size)
+    ]
+
+
+def status_error(status: int, retry_after: Optional[float] = None):
+    """groq APIStatusError for an HTTP status"""
+    import groq
+    import httpx
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    error_class = {
+        400: groq.BadRequestError,
+        429: groq.RateLimitError,
+    }.get(status, groq.InternalServerError)
+    return error_class(f"HTTP {status}", response=response, body=None)
+
+
+class FakeCompletions:
+    """
+    Stand-in for client.chat.completions
+
+    Args:
+        content: Answer content, or a callable taking the request kwargs
+        delay: Seconds each call takes
+        fail: Optional callable (call number, request kwargs) -> exception
+            to raise, or None to answer normally
+    """
+
+    def __init__(self, content="{\"ok\": true}", delay: float = 0.0,
+                 fail: Optional[Callable[[int, dict], Optional[BaseException]]] = None):
+        self.content = content
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.requests: List[dict] = []
+
+    def _answer(self, kwargs: dict):
+        self.calls += 1
+        self.requests.append(kwargs)
+        if self.fail is not None:
+            error = self.fail(self.calls, kwargs)
+            if error is not None:
+                raise error
+        content = self.content(kwargs) if callable(self.content) else self.content
+        if kwargs.get("stream"):
+            return iter(make_chunks(content))
+        return make_completion(content, kwargs.get("model", "test-model"))
+
+    def create(self, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        return self._answer(kwargs)
+
+
+class FakeAsyncStream:
+    """Async iterator over SDK-shaped chunks, like AsyncStream"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        answer = self._answer(kwargs)
+        return FakeAsyncStream(answer) if kwargs.get("stream") else answer
+
+
+def install_fake(client, content="{\"ok\": true}", delay: float = 0.0, fail=None):
+    """
+    Replace a GroqClient's SDK clients with fakes
+
+    Returns:
+        (sync completions, async completions)
+    """
+    sync = FakeCompletions(content, delay, fail)
+    async_ = FakeAsyncCompletions(content, delay, fail)
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=sync))
+    client.async_client = SimpleNamespace(chat=SimpleNamespace(completions=async_))
+    return sync, async_
+
+
+@pytest.fixture
+def mock_server():
+    """Running MockGroqServer with near-zero latency"""
+    from mock_groq_server import LatencyProfile, MockGroqServer
+    server = MockGroqServer(latency=LatencyProfile.parse("fixed:1", 100000.0)).start()
+    yield server
+    server.stop()
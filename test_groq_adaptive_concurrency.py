@@ -0,0 +1,96 @@
+"""
+AIMD concurrency limit for async batches
+
+Run: python -m pytest -q test_groq_adaptive_concurrency.py
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import install_fake, status_error
+from groq_client import AdaptiveConcurrency, DeadlineExceeded, GroqClient, RetryPolicy, deadline
+
+
+def test_healthy_latency_adds_about_one_slot_per_window():
+    controller = AdaptiveConcurrency(initial_limit=2, max_limit=4)
+    for _ in range(2):
+        controller.on_success(0.1)
+    assert controller.stats()["limit"] == 2  # 2 + 1/2 + 1/2.5
+    controller.on_success(0.1)
+    assert controller.stats()["limit"] == 3
+    for _ in range(20):
+        controller.on_success(0.1)
+    assert controller.stats()["limit"] == 4  # capped at max_limit
+
+
+def test_slow_responses_do_not_increase_the_limit():
+    controller = AdaptiveConcurrency(initial_limit=2, latency_tolerance=2.0)
+    controller.on_success(0.1)
+    for _ in range(10):
+        controller.on_success(0.5)
+    assert controller.stats()["limit"] == 2
+
+
+def test_overload_halves_once_per_burst_and_respects_min_limit():
+    controller = AdaptiveConcurrency(initial_limit=16, min_limit=3)
+    controller.on_success(10.0)  # decreases are spaced by the recent latency
+    for _ in range(5):
+        controller.on_error(status_error(429))
+    assert controller.stats()["limit"] == 8
+
+    controller = AdaptiveConcurrency(initial_limit=4, min_limit=3)
+    controller.on_error(status_error(429))
+    assert controller.stats()["limit"] == 3
+    assert [entry["reason"] for entry in controller.stats()["history"]] == ["init", "overload"]
+
+
+def test_high_error_rate_decreases_the_limit():
+    controller = AdaptiveConcurrency(initial_limit=10, max_error_rate=0.1)
+    for _ in range(8):
+        controller.on_success(0.0)
+    controller.on_error(status_error(500))
+    assert controller.stats()["limit"] == 10  # fewer than 10 outcomes
+    controller.on_error(status_error(500))
+    assert controller.stats()["limit"] == 5
+    assert controller.stats()["history"][-1]["reason"] == "error_rate"
+
+
+def test_acquire_waits_for_a_released_slot():
+    controller = AdaptiveConcurrency(initial_limit=1)
+
+    async def run():
+        await controller.acquire()
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        assert controller.stats()["waiting"] == 1
+        controller.release()
+        await asyncio.wait_for(waiter, 1)
+        return controller.stats()
+
+    stats = asyncio.run(run())
+    assert (stats["in_flight"], stats["waiting"]) == (1, 0)
+
+
+def test_acquire_gives_up_at_the_deadline():
+    controller = AdaptiveConcurrency(initial_limit=1)
+
+    async def run():
+        await controller.acquire()
+        with deadline(0.02), pytest.raises(DeadlineExceeded):
+            await controller.acquire()
+        return controller.stats()["waiting"]
+
+    assert asyncio.run(run()) == 0
+
+
+def test_batch_backs_off_on_rate_limits():
+    client = GroqClient(retry_policy=RetryPolicy(max_attempts=1), single_flight=False)
+    install_fake(client, fail=lambda call, request: status_error(429) if call % 2 else None)
+    results = client.batch_complete(
+        [f"prompt {i}" for i in range(20)], max_concurrent=8, return_exceptions=True
+    )
+
+    assert sum(isinstance(result, Exception) for result in results) == 10
+    assert client.concurrency.stats()["limit"] < 8
@@ -0,0 +1,83 @@
+"""
+Streaming, loop-safe batch_complete with per-item results
+
+Run: python -m pytest -q test_groq_batch_complete.py
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import install_fake, status_error
+from groq_client import GroqClient, RequestPriority, RetryPolicy, current_priority
+
+
+def echo(request):
+    return request["messages"][-1]["content"].upper()
+
+
+def batch_client(**fake) -> GroqClient:
+    client = GroqClient(retry_policy=RetryPolicy(max_attempts=1))
+    install_fake(client, **fake)
+    return client
+
+
+def test_results_come_back_in_prompt_order():
+    client = batch_client(content=echo)
+    results = client.batch_complete(["a", "b", "c"])
+    assert [result.content for result in results] == ["A", "B", "C"]
+
+
+def test_failed_prompt_does_not_discard_the_rest():
+    client = batch_client(content=echo, fail=lambda call, request: (
+        status_error(400) if request["messages"][-1]["content"] == "bad" else None
+    ))
+    results = client.batch_complete(["a", "bad", "c"], return_exceptions=True)
+    assert results[0].content == "A" and results[2].content == "C"
+    assert "400" in str(results[1])
+
+    with pytest.raises(Exception, match="400"):
+        client.batch_complete(["a", "bad", "c"])
+
+
+def test_stream_yields_in_completion_order_and_calls_on_result():
+    client = batch_client(content=echo)
+    seen = []
+    items = list(client.batch_complete_stream(
+        ["a", "b"], adaptive=False, on_result=lambda index, result: seen.append(index)
+    ))
+    assert sorted(index for index, _ in items) == [0, 1]
+    assert seen == [index for index, _ in items]
+
+
+def test_batch_runs_from_inside_a_running_loop():
+    client = batch_client(content=echo)
+
+    async def run():
+        return client.batch_complete(["a", "b"])
+
+    assert [result.content for result in asyncio.run(run())] == ["A", "B"]
+
+
+def test_async_iterator_defaults_to_background_priority():
+    priorities = []
+
+    def content(request):
+        priorities.append(current_priority())
+        return "ok"
+
+    client = batch_client(content=content)
+
+    async def run():
+        return [item async for item in client.batch_complete_iter(["a", "b"])]
+
+    assert len(asyncio.run(run())) == 2
+    assert priorities == [RequestPriority.BACKGROUND] * 2
+
+
+def test_abandoning_the_stream_stops_the_batch():
+    client = batch_client(content=echo, delay=0.02)
+    stream = client.batch_complete_stream([str(i) for i in range(50)], max_concurrent=2, adaptive=False)
+    next(stream)
+    stream.close()
+    assert client.async_client.chat.completions.calls < 50
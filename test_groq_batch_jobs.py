@@ -0,0 +1,148 @@
+"""
+Offline batch jobs: JSONL files, submit/poll and result demultiplexing
+
+Run: python -m pytest -q test_groq_batch_jobs.py
+"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from groq_client import (
+    BatchError, CompletionConfig, DeadlineExceeded, GroqBatchTransport, GroqClient,
+    LocalBatchTransport, batch_dir
+)
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils", "groq")
+
+
+def test_batch_files_default_outside_the_source_tree(monkeypatch):
+    monkeypatch.delenv("GROQ_BATCH_DIR", raising=False)
+    assert not os.path.abspath(batch_dir()).startswith(PACKAGE_DIR)
+
+    client = GroqClient(batch_transport=LocalBatchTransport())
+    client.queue_batch("hello")
+    path, _ = client.write_batch_file()
+    try:
+        assert os.path.dirname(path) == batch_dir()
+    finally:
+        os.remove(path)
+
+
+def test_batch_dir_env_override(monkeypatch, tmp_path):
+    monkeypatch.setenv("GROQ_BATCH_DIR", str(tmp_path))
+    assert LocalBatchTransport().root == str(tmp_path)
+    client = GroqClient()
+    client.queue_batch("hello")
+    path, _ = client.write_batch_file()
+    assert os.path.dirname(path) == str(tmp_path)
+
+
+def test_batch_file_lines(tmp_path):
+    client = GroqClient()
+    client.queue_batch("first", "be brief", CompletionConfig(max_tokens=50), custom_id="a")
+    client.queue_batch("second", custom_id="b")
+    path, ids = client.write_batch_file(str(tmp_path / "input.jsonl"))
+    assert ids == ["a", "b"]
+
+    with open(path, encoding="utf-8") as handle:
+        lines = [json.loads(line) for line in handle]
+    assert [line["custom_id"] for line in lines] == ["a", "b"]
+    assert lines[0]["body"]["messages"][0] == {"role": "system", "content": "be brief"}
+    assert lines[0]["body"]["max_tokens"] == 50
+    assert "stream" not in lines[0]["body"]
+
+    with pytest.raises(ValueError):
+        client.write_batch_file()  # queue emptied
+
+
+def test_run_batch_maps_results_and_errors_by_id(tmp_path):
+    def responder(body):
+        prompt = body["messages"][-1]["content"]
+        if prompt == "boom":
+            raise ValueError("rejected")
+        return {
+            "model": body["model"],
+            "choices": [{"message": {"content": prompt.upper()}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4}
+        }
+
+    client = GroqClient(batch_transport=LocalBatchTransport(str(tmp_path), responder))
+    client.queue_batch("hello", custom_id="ok")
+    client.queue_batch("boom", custom_id="bad")
+    results = client.run_batch(poll_interval=0.01, timeout=5)
+
+    assert results["ok"].content == "HELLO"
+    assert isinstance(results["bad"], BatchError)
+    assert "rejected" in str(results["bad"])
+
+
+def test_polling_waits_for_the_batch_and_gives_up_at_the_timeout(tmp_path):
+    client = GroqClient(batch_transport=LocalBatchTransport(str(tmp_path), processing_delay=0.05))
+    client.queue_batch("hello", custom_id="a")
+    job = client.submit_batch()
+    assert job.status == "in_progress" and job.custom_ids == ["a"]
+
+    with pytest.raises(DeadlineExceeded):
+        client.wait_for_batch(job, poll_interval=0.01, timeout=0.02)
+    finished = client.wait_for_batch(job, poll_interval=0.01, timeout=5)
+    assert finished.status == "completed"
+    assert finished.request_counts == {"total": 1, "completed": 1, "failed": 0}
+
+
+def test_unanswered_ids_get_errors_and_usage_is_counted(tmp_path):
+    client = GroqClient(batch_transport=LocalBatchTransport(str(tmp_path)))
+    client.queue_batch("hello world", custom_id="a")
+    job = client.wait_for_batch(client.submit_batch(), poll_interval=0.01, timeout=5)
+    job.custom_ids.append("lost")
+    results = client.batch_results(job)
+
+    assert results["a"].content == "hello world"
+    assert isinstance(results["lost"], BatchError)
+    assert client.metrics.totals()["groq_batch_requests_total"] == 2
+    assert client.get_usage_stats()["prompt_tokens"] == results["a"].usage["prompt_tokens"]
+
+
+class RecordingBatchTransport(GroqBatchTransport):
+    """Groq batch transport over a fake SDK that records each call's timeout"""
+
+    def __init__(self):
+        super().__init__("test-key")
+        self.timeouts = []
+        batch = SimpleNamespace(id="batch_1", status="completed", input_file_id="file_in",
+                                output_file_id="file_out", error_file_id=None)
+
+        def record(result):
+            def call(*args, **kwargs):
+                self.timeouts.append(kwargs.get("timeout"))
+                return result
+            return call
+
+        self.fake = SimpleNamespace(
+            files=SimpleNamespace(create=record(SimpleNamespace(id="file_in")),
+                                  content=record(SimpleNamespace(text=lambda: ""))),
+            batches=SimpleNamespace(create=record(batch), retrieve=record(batch)),
+        )
+
+    @property
+    def client(self):
+        return self.fake
+
+
+def test_batch_api_calls_are_bounded_by_the_timeout(tmp_path, monkeypatch):
+    monkeypatch.setenv("GROQ_BATCH_DIR", str(tmp_path))
+    transport = RecordingBatchTransport()
+    client = GroqClient(batch_transport=transport)
+    client.queue_batch("hello", custom_id="a")
+    results = client.run_batch(poll_interval=0.01, timeout=5)
+
+    assert isinstance(results["a"], BatchError)  # the fake output file is empty
+    assert len(transport.timeouts) == 4  # upload, create, retrieve, download
+    assert all(0 < timeout <= 5 for timeout in transport.timeouts)
+
+    client.queue_batch("hello again")
+    with pytest.raises(DeadlineExceeded):
+        client.submit_batch(timeout=0)
+
@@ -0,0 +1,133 @@
+"""
+Two-tier response cache (in-memory LRU over SQLite)
+
+Run: python -m pytest -q test_groq_cache.py
+"""
+
+import time
+
+import pytest
+
+from conftest import install_fake, make_completion
+from groq_client import CompletionConfig, GroqClient, GroqResponse, ResponseCache, Temperature
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+def response(content: str = "pong") -> GroqResponse:
+    return GroqResponse.from_completion(make_completion(content))
+
+
+def key(index: int) -> str:
+    return ResponseCache.make_key(
+        [{"role": "user", "content": f"prompt {index}"}], CompletionConfig(temperature=0.0)
+    )
+
+
+def test_key_depends_on_messages_and_config():
+    base = ResponseCache.make_key(MESSAGES, CompletionConfig(temperature=0.0))
+    assert base == ResponseCache.make_key(list(MESSAGES), CompletionConfig(temperature=0.0))
+    assert base != ResponseCache.make_key(MESSAGES, CompletionConfig(temperature=0.0, max_tokens=10))
+    assert base != ResponseCache.make_key([{"role": "user", "content": "pong"}], CompletionConfig(temperature=0.0))
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put(key(1), response("one"))
+    cache.put(key(2), response("two"))
+    assert cache.get(key(1)).content == "one"  # 1 is now most recent
+    cache.put(key(3), response("three"))
+
+    assert cache.get(key(2)) is None
+    assert cache.get(key(1)).cached is True
+    assert cache.get(key(3)).content == "three"
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl_seconds=0.05)
+    cache.put(key(1), response())
+    assert cache.get(key(1)) is not None
+    time.sleep(0.06)
+    assert cache.get(key(1)) is None
+    assert cache.stats()["memory_entries"] == 0
+
+
+def test_disk_tier_survives_restart_and_promotes_to_memory(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(db_path=db_path)
+    cache.put(key(1), response("persisted"), latency=0.5)
+    cache.close()
+
+    cache = ResponseCache(db_path=db_path)
+    assert cache.get(key(1)).content == "persisted"
+    assert cache.get(key(1)).content == "persisted"
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+    assert stats["saved_latency_seconds"] == pytest.approx(1.0)
+    cache.close()
+
+
+def test_disk_tier_drops_expired_rows(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(db_path=db_path, ttl_seconds=0.05)
+    cache.put(key(1), response())
+    cache.close()
+    time.sleep(0.06)
+
+    cache = ResponseCache(db_path=db_path, ttl_seconds=0.05)
+    assert cache.get(key(1)) is None
+    cache.close()
+
+
+def test_disk_tier_evicts_over_entry_cap(tmp_path):
+    cache = ResponseCache(max_entries=1, db_path=str(tmp_path / "cache.sqlite"), max_disk_entries=2)
+    for index in range(3):
+        cache.put(key(index), response(str(index)))
+        time.sleep(0.001)  # distinct last_access times
+    assert cache.get(key(0)) is None
+    assert cache.get(key(1)).content == "1"
+    assert cache.get(key(2)).content == "2"
+    cache.close()
+
+
+def test_put_many_skips_expired_entries():
+    cache = ResponseCache(ttl_seconds=60)
+    now = time.time()
+    stored = cache.put_many([
+        (key(1), response(), 0.0, now),
+        (key(2), response(), 0.0, now - 120),
+    ])
+    assert stored == 1
+    assert cache.get(key(2)) is None
+
+
+def test_client_serves_repeated_deterministic_calls_from_cache():
+    client = GroqClient(cache=ResponseCache())
+    sync, _ = install_fake(client, content="cached answer")
+    config = CompletionConfig(temperature=Temperature.DETERMINISTIC.value)
+
+    first = client.complete("ping", config=config)
+    second = client.complete("ping", config=config)
+    assert (first.cached, second.cached) == (False, True)
+    assert second.content == "cached answer"
+    assert sync.calls == 1
+
+    stats = client.cache.stats()
+    assert stats["hits"] == 1
+    assert stats["saved_tokens"] == first.usage["total_tokens"]
+
+
+def test_client_skips_cache_for_sampled_or_opted_out_calls():
+    client = GroqClient(cache=ResponseCache())
+    sync, _ = install_fake(client)
+    creative = CompletionConfig(temperature=Temperature.CREATIVE.value)
+    client.complete("ping", config=creative)
+    client.complete("ping", config=creative)
+    client.complete("ping", config=CompletionConfig(temperature=0.0), use_cache=False)
+    client.complete("ping", config=CompletionConfig(temperature=0.0), use_cache=False)
+    assert sync.calls == 4
+
+    client.complete("ping", config=creative, use_cache=True)
+    client.complete("ping", config=creative, use_cache=True)
+    assert sync.calls == 5
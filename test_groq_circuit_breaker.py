@@ -0,0 +1,160 @@
+"""
+Circuit breaker and degraded local fallbacks
+
+Run: python -m pytest -q test_groq_circuit_breaker.py
+"""
+
+import time
+
+import pytest
+
+from conftest import install_fake, status_error
+from groq_client import (
+    CircuitBreaker, CircuitOpen, CircuitState, GroqClient, RetryPolicy, TaskType,
+    lexical_extract_skills
+)
+from email_classifier import CLASSIFIER_CIRCUIT_BREAKER, EmailClassifier
+
+
+def failing_client(breaker: CircuitBreaker) -> GroqClient:
+    """Client whose every call gets a 503"""
+    client = GroqClient(circuit_breaker=breaker, retry_policy=RetryPolicy(max_attempts=1))
+    install_fake(client, fail=lambda call, request: status_error(503))
+    return client
+
+
+def test_opens_at_error_rate_and_fails_fast():
+    breaker = CircuitBreaker(min_calls=4, error_rate=0.5, open_seconds=60)
+    for _ in range(3):
+        breaker.record(breaker.before_call(), status_error(503))
+    assert breaker.state == CircuitState.CLOSED  # below min_calls
+    breaker.record(breaker.before_call(), status_error(503))
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpen) as refused:
+        breaker.before_call()
+    assert 0 < refused.value.retry_in <= 60
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_client_errors_and_cancelled_calls_are_not_failures():
+    breaker = CircuitBreaker(min_calls=2, error_rate=0.5)
+    for _ in range(5):
+        breaker.record(breaker.before_call(), status_error(400))
+        breaker.record(breaker.before_call(), status_error(503), counted=False)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats()["recent_calls"] == 0
+
+
+def test_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0.05)
+    breaker.record(breaker.before_call(), status_error(500))
+    assert breaker.is_open()
+    time.sleep(0.06)
+
+    probe = breaker.before_call()
+    assert probe is True
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()  # one probe at a time
+    breaker.record(probe)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.before_call() is False
+
+
+def test_failed_probe_reopens_with_backoff():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0.05, max_open_seconds=0.15)
+    breaker.record(breaker.before_call(), status_error(500))
+    for expected in (0.1, 0.15):
+        time.sleep(breaker._open_for + 0.01)
+        breaker.record(breaker.before_call(), status_error(500))
+        assert breaker.state == CircuitState.OPEN
+        assert breaker._open_for == pytest.approx(expected)
+
+
+def test_recruitment_method_degrades_to_lexical_fallback():
+    breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+    client = failing_client(breaker)
+    for _ in range(2):
+        with pytest.raises(Exception):
+            client.complete("ping", use_cache=False)
+    assert breaker.is_open()
+
+    calls = client.client.chat.completions.calls
+    skills = client.extract_skills("Senior Python developer with SQL and AWS experience")
+    assert "Python" in skills["technical"]
+    assert "AWS" in skills["tools_and_technologies"]
+    assert client.client.chat.completions.calls == calls  # no API call attempted
+
+
+def test_email_classifier_uses_shared_breaker_by_default():
+    classifier = EmailClassifier()
+    assert classifier.groq.circuit_breaker is CLASSIFIER_CIRCUIT_BREAKER
+    assert EmailClassifier().groq is classifier.groq
+
+
+def test_email_classifier_degrades_to_rules_when_circuit_opens():
+    breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+    classifier = EmailClassifier(groq_client=failing_client(breaker))
+    email = (
+        "jane.doe@gmail.com", "Application for Sales Executive",
+        "Please find attached my CV. My notice period is one month."
+    )
+
+    # Errors before the circuit opens are reported, not degraded
+    for _ in range(2):
+        assert classifier.classify_email(*email)["method"] == "ai-error"
+    assert breaker.is_open()
+
+    result = classifier.classify_email(*email)
+    assert result["degraded"] is True
+    assert result["method"] == "rule-based"
+    assert result["category"] == "candidate"
+
+
+def test_email_fallback_does_not_leak_into_shared_client():
+    client = GroqClient(circuit_breaker=CircuitBreaker())
+    EmailClassifier(groq_client=client)
+    assert TaskType.EMAIL_CLASSIFICATION not in client.fallbacks
+
+
+def test_lexical_skills_ignore_everyday_words():
+    assert lexical_extract_skills("Happy to go ahead and excel in the role", categorize=False) == []
+    assert lexical_extract_skills("Backend in Go and Excel reporting", categorize=False) == ["Go", "Excel"]
+    assert lexical_extract_skills("golang microservices", categorize=False) == ["Go"]
+    assert lexical_extract_skills("c# and PYTHON", categorize=False) == ["Python", "C#"]
+
+
+def test_outcomes_older_than_the_window_are_forgotten():
+    breaker = CircuitBreaker(min_calls=3, error_rate=0.5, window=0.05)
+    breaker.record(breaker.before_call(), status_error(503))
+    time.sleep(0.06)
+    for error in (None, None, status_error(503)):
+        breaker.record(breaker.before_call(), error)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats()["recent_calls"] == 3
+
+
+def test_open_circuit_stops_retries_and_later_calls():
+    breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+    client = GroqClient(circuit_breaker=breaker, retry_policy=RetryPolicy(max_attempts=5, base_delay=0.001))
+    sync, _ = install_fake(client, fail=lambda call, request: status_error(503))
+    with pytest.raises(Exception):
+        client.complete("ping", use_cache=False)
+    assert sync.calls == 2
+    with pytest.raises(CircuitOpen):
+        client.complete("ping again", use_cache=False)
+    assert sync.calls == 2
+
+
+def test_registered_fallback_serves_a_task_while_open():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=60)
+    client = failing_client(breaker)
+    with pytest.raises(Exception):
+        client.complete("ping", use_cache=False)
+    with pytest.raises(CircuitOpen):
+        client.summarize_candidate({"name": "Jane"})
+
+    client.register_fallback(TaskType.CANDIDATE_SUMMARY, lambda candidate, *args, **kwargs: "Summary unavailable")
+    assert client.summarize_candidate({"name": "Jane"}) == "Summary unavailable"
+    assert client.metrics.totals()["groq_fallbacks_total"] == 1
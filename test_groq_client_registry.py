@@ -0,0 +1,64 @@
+"""
+Shared client registry and connection reuse
+
+Run: python -m pytest -q test_groq_client_registry.py
+"""
+
+import asyncio
+import uuid
+
+from groq_client import (
+    CLIENT_REGISTRY, ClientRegistry, GroqClient, ResponseCache, get_shared_client, quick_complete
+)
+
+
+def test_one_sdk_pair_per_key_without_sdk_retries():
+    registry = ClientRegistry(http2=False)
+    sync, async_ = registry.sdk_clients("gsk_a")
+    assert registry.sdk_clients("gsk_a") == (sync, async_)
+    assert registry.sdk_clients("gsk_b")[0] is not sync
+    assert registry.sdk_clients("gsk_a", "http://localhost:1")[0] is not sync
+    assert sync.max_retries == 0 and async_.max_retries == 0
+    assert registry.stats()["sdk_clients"] == 3
+
+
+def test_async_clients_are_per_event_loop():
+    registry = ClientRegistry(http2=False)
+
+    async def current():
+        client = registry.async_client("gsk_a")
+        assert registry.async_client("gsk_a") is client
+        return client
+
+    first, second = asyncio.run(current()), asyncio.run(current())
+    assert first is not second  # connections cannot cross event loops
+    assert registry.async_client("gsk_a") is registry.sdk_clients("gsk_a")[1]
+
+
+def test_shared_clients_are_keyed_by_key_and_options():
+    registry = ClientRegistry()
+    cache = ResponseCache()
+    client = registry.get("gsk_a", cache=cache, single_flight=True)
+    assert registry.get("gsk_a", single_flight=True, cache=cache) is client
+    assert registry.get("gsk_a", cache=ResponseCache(), single_flight=True) is not client
+    assert registry.get("gsk_b", cache=cache, single_flight=True) is not client
+    assert (registry.stats()["hits"], registry.stats()["misses"]) == (1, 3)
+
+    registry.clear()
+    assert registry.get("gsk_a", cache=cache, single_flight=True) is not client
+
+
+def test_clients_for_the_same_key_share_connections():
+    key = f"gsk_{uuid.uuid4().hex}"
+    assert GroqClient(key).client is GroqClient(key).client
+
+
+def test_quick_complete_reuses_the_shared_client(mock_server, monkeypatch):
+    monkeypatch.setenv("GROQ_BASE_URL", mock_server.url)
+    key = f"gsk_{uuid.uuid4().hex}"
+    hits = CLIENT_REGISTRY.stats()["hits"]
+    assert quick_complete("Hello", api_key=key)
+    assert quick_complete("Hello again", api_key=key)
+    assert CLIENT_REGISTRY.stats()["hits"] == hits + 1
+    assert get_shared_client(key).base_url == mock_server.url
+    assert mock_server.stats()["requests"] == 2
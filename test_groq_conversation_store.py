@@ -0,0 +1,101 @@
+"""
+Bounded, token-budgeted conversation history
+
+Run: python -m pytest -q test_groq_conversation_store.py
+"""
+
+import time
+
+from conftest import install_fake
+from groq_client import ConversationStore, GroqClient, Message
+
+
+def words(text: str) -> int:
+    return len(text.split())
+
+
+def turn(index: int, size: int = 1):
+    return [
+        Message(role="user", content=" ".join([f"q{index}"] * size)),
+        Message(role="assistant", content=" ".join([f"a{index}"] * size)),
+    ]
+
+
+def test_window_slides_by_whole_turns():
+    store = ConversationStore(max_messages_per_session=4, token_counter=words)
+    for index in range(3):
+        store.append("s", turn(index))
+    history = store.history("s")
+    assert [message.content for message in history] == ["q1", "a1", "q2", "a2"]
+    assert store.stats()["trimmed_messages"] == 2
+
+
+def test_token_budget_trims_but_keeps_the_last_turn():
+    store = ConversationStore(max_tokens_per_session=10, max_messages_per_session=None, token_counter=words)
+    store.append("s", turn(0, size=3))
+    store.append("s", turn(1, size=3))
+    assert len(store.history("s")) == 2
+    assert store.stats()["total_tokens"] == 6
+
+    store.append("s", turn(2, size=20))  # larger than the budget on its own
+    assert [message.content.split()[0] for message in store.history("s")] == ["q2", "a2"]
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = ConversationStore(max_sessions=2, token_counter=words)
+    store.append("a", turn(0))
+    store.append("b", turn(0))
+    store.history("a")  # a is now the most recent
+    store.append("c", turn(0))
+    assert store.sessions() == ["a", "c"]
+    assert store.stats()["evicted_sessions"] == 1
+
+
+def test_total_token_cap_evicts_other_sessions():
+    store = ConversationStore(max_total_tokens=10, token_counter=words)
+    store.append("a", turn(0, size=4))
+    store.append("b", turn(0, size=4))
+    assert store.sessions() == ["b"]
+    assert store.stats()["total_tokens"] == 8
+
+
+def test_idle_sessions_expire():
+    store = ConversationStore(idle_ttl=0.05, token_counter=words)
+    store.append("s", turn(0))
+    assert "s" in store
+    time.sleep(0.06)
+    assert "s" not in store
+    assert store.history("s") == []
+    assert store.stats()["total_tokens"] == 0
+
+
+def test_compaction_folds_evicted_turns_into_a_summary():
+    folded = []
+
+    def summarizer(previous, messages):
+        folded.append([message.content for message in messages])
+        return "earlier: " + ", ".join(message.content for message in messages)
+
+    store = ConversationStore(max_messages_per_session=2, compact=True, summarizer=summarizer, token_counter=words)
+    store.append("s", turn(0))
+    store.append("s", turn(1))
+    store._compactor.shutdown(wait=True)
+
+    history = store.history("s")
+    assert folded == [["q0", "a0"]]
+    assert history[0].role == "system" and "earlier: q0, a0" in history[0].content
+    assert [message.content for message in history[1:]] == ["q1", "a1"]
+    assert store.stats()["compactions"] == 1
+
+
+def test_client_sends_history_and_records_turns():
+    client = GroqClient(conversation_store=ConversationStore(max_messages_per_session=4))
+    sync, _ = install_fake(client, content="reply")
+    for index in range(3):
+        client.complete(f"question {index}", conversation_id="chat", use_cache=False)
+
+    sent = [message["content"] for message in sync.requests[-1]["messages"]]
+    assert sent == ["question 0", "reply", "question 1", "reply", "question 2"]
+    assert len(client.get_conversation_history("chat")) == 4
+    client.clear_conversation("chat")
+    assert client.get_conversation_history("chat") == []
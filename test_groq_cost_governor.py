@@ -0,0 +1,168 @@
+"""
+Cost governor: per-key, session and task budgets
+
+Run: python -m pytest -q test_groq_cost_governor.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from conftest import FakeAsyncCompletions, FakeCompletions, install_fake
+from groq_client import (
+    Budget, BudgetExceeded, BudgetPolicy, CompletionConfig, CostGovernor, CostLedger, GroqClient,
+    GroqModel, KeyPool, MODEL_PRICING, TaskType, api_key_label, cost_scope, estimate_cost
+)
+
+DEFAULT = GroqModel.DEFAULT.value
+
+
+def spent(governor: CostGovernor, scope: str):
+    return {row["key"]: row["spent"] for row in governor.stats()["accounts"] if row["scope"] == scope}
+
+
+def test_price_table_has_a_cheaper_tier_than_default():
+    assert GroqModel.LLAMA_3_1_8B.value != DEFAULT
+    assert DEFAULT in MODEL_PRICING
+    assert estimate_cost(1000, 1000, GroqModel.LLAMA_3_1_8B.value) < estimate_cost(1000, 1000, DEFAULT)
+    assert estimate_cost(1000, 1000, GroqModel.GEMMA2_9B.value) < estimate_cost(1000, 1000, DEFAULT)
+    governor = CostGovernor([Budget("global", 1.0)])
+    assert governor.cheaper_model(DEFAULT, 1000, 1000) == GroqModel.LLAMA_3_1_8B.value
+
+
+def test_reject_policy_raises_once_session_budget_is_spent():
+    governor = CostGovernor([Budget("session", 0.0001, policy=BudgetPolicy.REJECT)])
+    client = GroqClient(governor=governor)
+    install_fake(client)
+    config = CompletionConfig(max_tokens=10)
+    with cost_scope(session_id="s1"):
+        client.complete("hi", config=config, use_cache=False)
+        with pytest.raises(BudgetExceeded) as refused:
+            for _ in range(100):
+                client.complete("hi", config=config, use_cache=False)
+    assert refused.value.scope == "session"
+    with cost_scope(session_id="s2"):
+        client.complete("hi", config=config, use_cache=False)  # separate budget
+
+
+def test_downgrade_policy_switches_default_calls_to_cheaper_model():
+    prompt_cost = estimate_cost(20, 1000, DEFAULT)
+    governor = CostGovernor([Budget("global", prompt_cost * 1.5, policy=BudgetPolicy.DOWNGRADE, threshold=0.5)])
+    client = GroqClient(governor=governor)
+    sync, _ = install_fake(client)
+    config = CompletionConfig(max_tokens=1000)
+
+    client.complete("hello", config=config, use_cache=False)
+    assert sync.requests[-1]["model"] == GroqModel.LLAMA_3_1_8B.value
+    assert governor.stats()["decisions"]["downgraded"] == 1
+
+
+def test_queue_policy_waits_for_spend_to_leave_the_window():
+    budget = Budget("global", 1.0, window=0.3, policy=BudgetPolicy.QUEUE)
+    governor = CostGovernor([budget], poll_interval=0.05, max_queue_wait=5)
+    governor.ledger.bucket_seconds = 0.1
+    account = ("global", "*", budget.window)
+    governor.ledger.record(account, 0.95)
+
+    start = time.monotonic()
+    reservation = governor.admit(DEFAULT, 10, 10, {})
+    assert time.monotonic() - start >= 0.1
+    assert governor.stats()["decisions"]["queued"] == 1
+    governor.release(reservation)
+
+
+def test_key_labels_are_stable_and_do_not_collide_on_suffix():
+    assert api_key_label("gsk_aaaa1234") == api_key_label("gsk_aaaa1234")
+    assert api_key_label("gsk_aaaa1234") != api_key_label("gsk_bbbb1234")
+    assert "1234" not in api_key_label("gsk_aaaa1234")
+
+
+def test_pooled_calls_are_booked_to_the_key_that_served_them():
+    governor = CostGovernor([Budget("api_key", 10.0)])
+    pool = KeyPool(["gsk_first_0001", "gsk_second_0001"], limiter_factory=None)
+    for key in pool.keys:
+        key._clients = (
+            type("Sync", (), {"chat": type("Chat", (), {"completions": FakeCompletions()})()})(),
+            type("Async", (), {"chat": type("Chat", (), {"completions": FakeAsyncCompletions()})()})(),
+        )
+    client = GroqClient(key_pool=pool, governor=governor)
+
+    # Hold the first key busy so least-loaded selection picks the second
+    pool.keys[0].in_flight += 1
+    client.complete("hi", use_cache=False)
+    list(client.complete_stream("hi"))
+    pool.keys[0].in_flight -= 1
+
+    totals = spent(governor, "api_key")
+    assert set(totals) == {api_key_label("gsk_second_0001")}
+    assert totals[api_key_label("gsk_second_0001")] > 0
+    assert all(row["pending"] == 0 for row in governor.stats()["accounts"])
+
+
+def test_unpooled_client_labels_its_own_key():
+    governor = CostGovernor([Budget("api_key", 10.0)])
+    client = GroqClient("gsk_single_key", governor=governor)
+    install_fake(client)
+    client.complete("hi", use_cache=False)
+    assert set(spent(governor, "api_key")) == {api_key_label("gsk_single_key")}
+
+
+def test_concurrent_admission_does_not_overshoot():
+    estimate = estimate_cost(10, 10, DEFAULT)
+    governor = CostGovernor([Budget("global", estimate * 5, threshold=1.0)])
+    admitted, rejected = [], []
+
+    def admit():
+        try:
+            admitted.append(governor.admit(DEFAULT, 10, 10, {}))
+        except BudgetExceeded:
+            rejected.append(True)
+
+    threads = [threading.Thread(target=admit) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(admitted) == 5 and len(rejected) == 15
+
+
+def test_estimate_is_held_until_the_actual_cost_replaces_it():
+    governor = CostGovernor([Budget("task", 10.0)])
+    account = ("task", "parse", 86400.0)
+    reservation = governor.admit(DEFAULT, 100, 1000, {"task": "parse"})
+    assert reservation.estimate == estimate_cost(100, 1000, DEFAULT)
+    assert governor.ledger.spent(account) == reservation.estimate
+
+    governor.charge(reservation, estimate_cost(100, 20, DEFAULT))
+    governor.release(reservation)
+    assert governor.ledger.spent(account) == pytest.approx(estimate_cost(100, 20, DEFAULT))
+
+
+def test_calls_are_totalled_per_task():
+    governor = CostGovernor([Budget("task", 10.0)])
+    client = GroqClient(governor=governor)
+    install_fake(client)
+    client.complete("hi", use_cache=False)
+    with cost_scope(task=TaskType.SKILL_EXTRACTION):
+        client.complete("hi", use_cache=False)
+        client.complete("hi again", use_cache=False)
+
+    rows = {row["key"]: row for row in governor.stats()["accounts"]}
+    assert rows["complete"]["requests"] == 1
+    assert rows["skill_extraction"]["requests"] == 2
+    assert rows["skill_extraction"]["spent"] == pytest.approx(2 * estimate_cost(10, 5, DEFAULT))
+    assert rows["skill_extraction"]["limit"] == 10.0
+
+
+def test_ledger_survives_restarts_and_drops_expired_spend(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    ledger = CostLedger(path, bucket_seconds=0.1)
+    ledger.record(("session", "s1", 3600.0), 0.25)
+    ledger.record(("session", "s1", 0.2), 0.5)
+    ledger.flush()
+
+    reloaded = CostLedger(path, bucket_seconds=0.1)
+    assert reloaded.spent(("session", "s1", 3600.0)) == 0.25
+    time.sleep(0.35)
+    assert reloaded.spent(("session", "s1", 0.2)) == 0.0
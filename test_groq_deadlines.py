@@ -0,0 +1,116 @@
+"""
+Deadline propagation and cooperative cancellation
+
+Run: python -m pytest -q test_groq_deadlines.py
+"""
+
+import asyncio
+import inspect
+import time
+from functools import partial
+
+import pytest
+
+from conftest import install_fake, make_chunks, status_error
+from groq_client import (
+    DeadlineExceeded, GroqClient, KeyPool, RateLimiter, RetryPolicy, TaskType, deadline,
+    remaining_time
+)
+
+
+def test_key_lease_released_when_limiter_wait_hits_deadline():
+    pool = KeyPool(["key-a", "key-b"], limiter_factory=partial(RateLimiter, requests_per_minute=1, headroom=1.0))
+    first = pool.acquire()
+    pool.release(first)
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceeded):
+            pool.acquire(exclude=("key-b",))
+    assert [key.in_flight for key in pool.keys] == [0, 0]
+
+
+def test_nested_deadlines_keep_the_earliest_expiry():
+    assert remaining_time() is None
+    with deadline(0.5):
+        with deadline(10):
+            assert remaining_time() <= 0.5
+        with deadline(None):
+            assert remaining_time() <= 0.5
+    assert remaining_time() is None
+
+
+def test_timeout_kwarg_bounds_the_http_request():
+    client = GroqClient()
+    sync, _ = install_fake(client)
+    client.complete("hi", use_cache=False)
+    client.complete("hi again", use_cache=False, timeout=5)
+    assert "timeout" not in sync.requests[0]
+    assert 4 < sync.requests[1]["timeout"] <= 5
+
+
+def test_expired_deadline_sends_nothing():
+    client = GroqClient()
+    sync, async_ = install_fake(client)
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            client.complete("hi", use_cache=False)
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(client.complete_async("hi", use_cache=False))
+    assert sync.calls == async_.calls == 0
+
+
+def test_backoff_that_would_outlast_the_deadline_is_skipped():
+    client = GroqClient(retry_policy=RetryPolicy(max_attempts=3))
+    sync, _ = install_fake(client, fail=lambda call, request: status_error(429, retry_after=5))
+    started = time.monotonic()
+    with pytest.raises(Exception, match="429"):
+        client.complete("hi", use_cache=False, timeout=1)
+    assert time.monotonic() - started < 0.5
+    assert sync.calls == 1
+
+
+class SlowStream:
+    """Stream whose chunks trickle in every interval seconds"""
+
+    def __init__(self, content: str, interval: float):
+        self.chunks = make_chunks(content)
+        self.interval = interval
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            time.sleep(self.interval)
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def test_slow_stream_is_closed_at_the_deadline():
+    client = GroqClient()
+    sync, _ = install_fake(client)
+    stream = SlowStream("a long answer " * 10, interval=0.02)
+    sync.create = lambda **kwargs: stream
+    received = []
+    with pytest.raises(DeadlineExceeded):
+        for text in client.complete_stream("hi", timeout=0.1):
+            received.append(text)
+    assert stream.closed
+    assert 0 < len(received) < len(stream.chunks)
+
+
+def test_scope_keywords_are_part_of_the_published_signatures():
+    for method in (GroqClient.complete, GroqClient.extract_skills, GroqClient.complete_stream,
+                   GroqClient.complete_async, GroqClient.with_fallback, GroqClient.submit_batch,
+                   GroqClient.batch_results, GroqClient.wait_for_batch, GroqClient.run_batch):
+        assert "timeout" in inspect.signature(method).parameters, method.__name__
+    parameters = inspect.signature(GroqClient.complete).parameters
+    assert parameters["priority"].kind == inspect.Parameter.KEYWORD_ONLY
+    assert "session_id" in parameters
+
+
+def test_with_fallback_bounds_the_call():
+    client = GroqClient()
+    sync, _ = install_fake(client)
+    with pytest.raises(DeadlineExceeded):
+        client.with_fallback(TaskType.GENERAL, client.complete, "hi", use_cache=False, timeout=0)
+    assert sync.calls == 0
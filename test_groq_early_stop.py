@@ -0,0 +1,100 @@
+"""
+Closing streamed completions once the JSON answer is complete
+
+Run: python -m pytest -q test_groq_early_stop.py
+"""
+
+from typing import Optional
+
+from conftest import install_fake, make_chunks
+from groq_client import GroqClient
+
+ANSWER = '{"category": "candidate", "confidence": 0.9}'
+TRAILER = "\n\nThis email is from a job seeker applying for a role."
+
+
+class ClosableStream:
+    """Stream of chunks that records how far it was read and whether it was closed"""
+
+    def __init__(self, content: str):
+        self.chunks = make_chunks(content)
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def streaming_client(content: str, trailing_tokens: Optional[float] = 12.0):
+    client = GroqClient()
+    client.json_trailing_tokens = trailing_tokens
+    sync, _ = install_fake(client)
+    streams = []
+
+    def create(**kwargs):
+        sync.calls += 1
+        streams.append(ClosableStream(content))
+        return streams[-1]
+
+    sync.create = create
+    return client, streams
+
+
+def test_stream_closes_after_the_json_value():
+    client, streams = streaming_client(ANSWER + TRAILER)
+    assert "".join(client.complete_stream("classify", stop_at_json=True)) == ANSWER
+    assert streams[0].closed
+    assert streams[0].read < len(streams[0].chunks)
+    assert client.metrics.totals()["groq_early_stops_total"] == 1
+
+
+def test_without_stop_at_json_the_whole_answer_streams():
+    client, streams = streaming_client(ANSWER + TRAILER)
+    assert "".join(client.complete_stream("classify")) == ANSWER + TRAILER
+    assert streams[0].read == len(streams[0].chunks)
+
+
+def test_invalid_json_keeps_streaming():
+    broken = '{"category": candidate}'
+    client, streams = streaming_client(broken + TRAILER)
+    assert "".join(client.complete_stream("classify", stop_at_json=True)) == broken + TRAILER
+    assert streams[0].read == len(streams[0].chunks)
+
+
+def test_complete_reports_what_the_early_stop_saved():
+    client, streams = streaming_client(ANSWER + TRAILER)
+    response = client.complete("classify", stop_at_json=True, use_cache=False)
+    assert response.content == ANSWER
+    assert response.finish_reason == "json_complete"
+    assert response.early_stop["stopped"] is True
+    assert response.early_stop["saved_tokens"] > 0
+    assert response.usage["completion_tokens"] > 0
+    assert streams[0].closed
+
+
+def test_first_answer_runs_to_its_end_to_learn_the_trailing_text():
+    client, streams = streaming_client(ANSWER + TRAILER, trailing_tokens=None)
+    response = client.complete("classify", stop_at_json=True, use_cache=False)
+    assert response.content == ANSWER
+    assert response.early_stop == {"stopped": False}
+    assert streams[0].read == len(streams[0].chunks)
+    assert client.json_trailing_tokens == client.token_counter.count(TRAILER)
+
+    response = client.complete("classify again", stop_at_json=True, use_cache=False)
+    assert response.early_stop["stopped"] is True
+    assert response.early_stop["saved_tokens"] > 0
+    assert streams[1].closed
+
+
+def test_abandoned_stream_is_closed():
+    client, streams = streaming_client(ANSWER + TRAILER)
+    stream = client.complete_stream("classify")
+    next(stream)
+    stream.close()  # the consumer stops iterating
+    assert streams[0].closed
+    assert streams[0].read < len(streams[0].chunks)
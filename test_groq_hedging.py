@@ -0,0 +1,146 @@
+"""
+Hedged requests: delay from observed latency, spend cap, queue bypass
+
+Run: python -m pytest -q test_groq_hedging.py
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future
+
+from conftest import install_fake
+from groq_client import GroqClient, HedgePolicy, PriorityScheduler
+
+MODEL = "llama-3.3-70b-versatile"
+
+
+def primed_policy(latency: float = 0.01, **kwargs) -> HedgePolicy:
+    kwargs.setdefault("min_samples", 5)
+    kwargs.setdefault("min_delay", 0.05)
+    kwargs.setdefault("max_extra_fraction", 1.0)
+    policy = HedgePolicy(**kwargs)
+    for _ in range(kwargs["min_samples"]):
+        policy.observe(MODEL, latency)
+    return policy
+
+
+def slow_first_call(client: GroqClient, first: float = 1.0):
+    """Fakes where the first call stalls and later ones answer at once"""
+    sync, async_ = install_fake(client, content="answer")
+    stalled = []
+
+    def create(**kwargs):
+        if not stalled:
+            stalled.append(True)
+            time.sleep(first)
+        return sync._answer(kwargs)
+
+    async def create_async(**kwargs):
+        if not stalled:
+            stalled.append(True)
+            await asyncio.sleep(first)
+        return async_._answer(kwargs)
+
+    sync.create = create
+    async_.create = create_async
+
+
+def test_no_hedge_until_enough_samples():
+    policy = HedgePolicy(min_samples=3)
+    assert policy.hedge_delay(MODEL) is None
+    for latency in (0.1, 0.2, 0.3):
+        policy.observe(MODEL, latency)
+    assert policy.hedge_delay(MODEL) == 0.3
+
+
+def test_hedges_capped_at_extra_fraction():
+    policy = HedgePolicy(max_extra_fraction=0.1, min_samples=1)
+    policy.observe(MODEL, 0.01)
+    allowed = 0
+    for _ in range(50):
+        policy.hedge_delay(MODEL)
+        allowed += policy.allow_hedge()
+    assert allowed == 5
+    assert policy.stats()["skipped"] == 45
+
+
+def test_hedge_overtakes_a_stalled_call():
+    client = GroqClient(hedging=primed_policy())
+    slow_first_call(client)
+    start = time.monotonic()
+    assert client.complete("hi", hedge=True, use_cache=False).content == "answer"
+    assert time.monotonic() - start < 0.5
+    assert client.hedging.stats()["hedge_wins"] == 1
+
+
+def test_hedge_skips_scheduler_queue_without_rate_limiter():
+    # The stalled primary holds the only slot; the hedge must not wait for it
+    client = GroqClient(hedging=primed_policy(), scheduler=PriorityScheduler(max_in_flight=1))
+    slow_first_call(client)
+    start = time.monotonic()
+    client.complete("hi", hedge=True, use_cache=False)
+    assert time.monotonic() - start < 0.5
+    assert client.hedging.stats()["hedge_wins"] == 1
+
+
+def test_async_hedge_skips_scheduler_queue_without_rate_limiter():
+    client = GroqClient(hedging=primed_policy(), scheduler=PriorityScheduler(max_in_flight=1))
+    slow_first_call(client)
+
+    async def run():
+        start = time.monotonic()
+        await client.complete_async("hi", hedge=True, use_cache=False)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.5
+    assert client.hedging.stats()["hedge_wins"] == 1
+
+
+def test_fast_primary_sends_no_hedge():
+    client = GroqClient(hedging=primed_policy())
+    sync, _ = install_fake(client, content="answer")
+    client.complete("hi", hedge=True, use_cache=False)
+    assert sync.calls == 1
+    assert client.hedging.stats()["hedges"] == 0
+
+
+def test_calls_without_hedge_flag_never_hedge():
+    client = GroqClient(hedging=primed_policy())
+    slow_first_call(client, first=0.2)
+    client.complete("hi", use_cache=False)
+    assert client.client.chat.completions.calls == 1
+    assert client.hedging.stats()["requests"] == 0
+
+
+def test_async_hedge_overtakes_a_stalled_call():
+    client = GroqClient(hedging=primed_policy())
+    slow_first_call(client)
+
+    async def run():
+        start = time.monotonic()
+        response = await client.complete_async("hi", hedge=True, use_cache=False)
+        return response, time.monotonic() - start
+
+    response, elapsed = asyncio.run(run())
+    assert response.content == "answer"
+    assert elapsed < 0.5
+    assert client.hedging.stats()["hedge_wins"] == 1
+
+
+def test_tokens_of_a_loser_that_completes_are_counted():
+    client = GroqClient(hedging=primed_policy())
+    slow_first_call(client, first=0.2)
+    client.complete("hi", hedge=True, use_cache=False)
+    assert client.hedging.stats()["extra_tokens"] == 0  # the stalled primary is still running
+    time.sleep(0.3)
+    assert client.hedging.stats()["extra_tokens"] == 15
+
+
+def test_cancelled_or_failed_losers_cost_nothing():
+    policy = HedgePolicy()
+    cancelled, failed = Future(), Future()
+    cancelled.cancel()
+    failed.set_exception(RuntimeError("boom"))
+    for future in (cancelled, failed):
+        policy.record_loser(future)
+    assert policy.stats()["extra_tokens"] == 0
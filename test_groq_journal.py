@@ -0,0 +1,127 @@
+"""
+Request journal: background writes, rotation, cache warm-start and replay
+
+Run: python -m pytest -q test_groq_journal.py
+"""
+
+import gzip
+import json
+
+import pytest
+
+from conftest import install_fake, status_error
+from groq_client import (
+    CompletionConfig, GroqClient, RequestJournal, ResponseCache, RetryPolicy, Temperature,
+    read_journal, replay_entry
+)
+
+DETERMINISTIC = CompletionConfig(temperature=Temperature.DETERMINISTIC.value)
+
+
+def journaled_client(directory, **options) -> GroqClient:
+    return GroqClient(journal=RequestJournal(str(directory)), **options)
+
+
+def test_calls_and_failures_are_journaled(tmp_path):
+    client = journaled_client(tmp_path, retry_policy=RetryPolicy(max_attempts=1))
+    install_fake(client, content="pong", fail=lambda call, request: status_error(400) if call == 2 else None)
+    client.complete("ping", config=DETERMINISTIC, use_cache=False)
+    with pytest.raises(Exception):
+        client.complete("boom", use_cache=False)
+    client.journal.close()
+
+    first, second = read_journal(str(tmp_path))
+    assert first["operation"] == "complete"
+    assert first["request"]["messages"][-1] == {"role": "user", "content": "ping"}
+    assert first["request"]["config"]["temperature"] == Temperature.DETERMINISTIC.value
+    assert first["response"]["content"] == "pong" and first["error"] is None
+    assert second["response"] is None and second["error"].endswith("HTTP 400")
+    assert client.journal.stats()["written"] == 2
+
+
+def test_files_rotate_and_old_ones_are_deleted(tmp_path):
+    # Every entry fills a file (about 300 compressed bytes each); keep two
+    journal = RequestJournal(str(tmp_path), max_file_bytes=1, max_total_bytes=700)
+    for index in range(6):
+        journal.record("complete", [{"role": "user", "content": f"prompt {index}"}], CompletionConfig())
+    journal.close()
+
+    stats = journal.stats()
+    assert stats["written"] == 6 and stats["rotations"] == 6
+    assert stats["files"] == 2 and stats["bytes"] <= 700
+    remaining = [entry["request"]["messages"][0]["content"] for entry in read_journal(str(tmp_path))]
+    assert remaining == ["prompt 4", "prompt 5"]
+
+
+def test_records_after_close_are_ignored(tmp_path):
+    journal = RequestJournal(str(tmp_path))
+    journal.close()
+    journal.record("complete", [], CompletionConfig())
+    assert journal.stats()["queued"] == 0 and journal.stats()["dropped"] == 0
+
+
+def test_reader_stops_at_a_file_cut_off_mid_write(tmp_path):
+    lines = "".join(json.dumps({"n": n}) + "\n" for n in range(3)) + '{"n": 3, "tor'
+    data = gzip.compress(lines.encode("utf-8"))
+    (tmp_path / "journal-cut.jsonl.gz").write_bytes(data[:-8])  # no gzip trailer
+    (tmp_path / "journal-plain.jsonl").write_text(json.dumps({"n": 4}) + "\n\n")
+    assert [entry["n"] for entry in read_journal(str(tmp_path))] == [0, 1, 2, 4]
+
+
+def test_cache_is_warmed_from_the_journal(tmp_path):
+    recorder = journaled_client(tmp_path)
+    install_fake(recorder, content="pong")
+    recorder.complete("ping", config=DETERMINISTIC, use_cache=False)
+    recorder.complete("creative ping", use_cache=False)  # balanced temperature: not cacheable
+    recorder.journal.close()
+
+    client = GroqClient(cache=ResponseCache())
+    sync, _ = install_fake(client, content="fresh")
+    assert client.warm_cache(str(tmp_path)) == 1
+    assert client.complete("ping", config=DETERMINISTIC).content == "pong"
+    assert sync.calls == 0
+    assert GroqClient(cache=ResponseCache()).warm_cache(str(tmp_path), cacheable_only=False) == 2
+
+    with pytest.raises(ValueError):
+        GroqClient().warm_cache(str(tmp_path))
+
+
+def test_entries_replay_against_another_model_or_prompt(tmp_path):
+    recorder = journaled_client(tmp_path)
+    install_fake(recorder, content="old answer")
+    recorder.complete("Summarize the CV", system_prompt="Be brief", use_cache=False)
+    recorder.journal.close()
+    entry = next(read_journal(str(tmp_path)))
+
+    client = GroqClient()
+    sync, _ = install_fake(client, content="new answer")
+    response = replay_entry(client, entry, model="llama-3.1-8b-instant", system_prompt="Be thorough")
+    assert response.content == "new answer"
+    request = sync.requests[0]
+    assert request["model"] == "llama-3.1-8b-instant"
+    assert request["messages"][0] == {"role": "system", "content": "Be thorough"}
+    assert request["messages"][1:] == entry["request"]["messages"][1:]
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("GROQ_JOURNAL_DIR", raising=False)
+    assert RequestJournal.from_env() is None
+    monkeypatch.setenv("GROQ_JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setenv("GROQ_JOURNAL_MAX_MB", "0.5")
+    journal = RequestJournal.from_env()
+    assert journal.max_total_bytes == 512 * 1024
+    journal.close()
+
+
+def test_entries_keep_the_values_sent_even_if_reused_objects_change(tmp_path):
+    journal = RequestJournal(str(tmp_path), flush_interval=60)
+    config = CompletionConfig(max_tokens=10)
+    messages = [{"role": "user", "content": "first"}]
+    journal.record("complete", messages, config)
+    config.max_tokens = 99
+    messages[0]["content"] = "second"
+    journal.close()
+
+    entry = next(read_journal(str(tmp_path)))
+    assert entry["request"]["config"]["max_tokens"] == 10
+    assert entry["request"]["messages"] == [{"role": "user", "content": "first"}]
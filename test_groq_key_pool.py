@@ -0,0 +1,129 @@
+"""
+Multi-key API key pool with per-key rate state and failover
+
+Run: python -m pytest -q test_groq_key_pool.py
+"""
+
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeAsyncCompletions, FakeCompletions, status_error
+from groq_client import GroqClient, KeyPool, RateLimiter, RetryPolicy, api_key_label
+
+
+def fake_pool(keys, fail_keys=(), status=429, retry_after=None, **options) -> KeyPool:
+    """Pool whose keys in fail_keys answer every call with status"""
+    options.setdefault("limiter_factory", None)
+    pool = KeyPool(keys, **options)
+    for key in pool.keys:
+        fail = None
+        if key.api_key in fail_keys:
+            fail = lambda call, request: status_error(status, retry_after)
+        key._clients = (
+            SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(key.api_key, fail=fail))),
+            SimpleNamespace(chat=SimpleNamespace(completions=FakeAsyncCompletions(key.api_key, fail=fail))),
+        )
+    return pool
+
+
+def calls(pool: KeyPool):
+    return {key.api_key: key._clients[0].chat.completions.calls for key in pool.keys}
+
+
+def test_keys_are_deduplicated_and_required():
+    assert [key.api_key for key in KeyPool(["a", "b", "a", ""]).keys] == ["a", "b"]
+    with pytest.raises(ValueError):
+        KeyPool([])
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEYS", "gsk_one, gsk_two,")
+    assert [key.api_key for key in KeyPool.from_env().keys] == ["gsk_one", "gsk_two"]
+    monkeypatch.setenv("GROQ_API_KEYS", "")
+    assert KeyPool.from_env() is None
+
+
+def test_least_loaded_key_is_picked():
+    pool = fake_pool(["a", "b"])
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first.key.api_key, second.key.api_key} == {"a", "b"}
+    pool.release(first)
+    assert pool.acquire().key is first.key
+
+
+def test_throttled_key_fails_over_and_rests_for_retry_after():
+    pool = fake_pool(["a", "b"], fail_keys=("a",), retry_after=5)
+    pool.keys[1].in_flight += 1  # make "a" the first choice
+    client = GroqClient(key_pool=pool, retry_policy=RetryPolicy(max_attempts=1))
+    assert client.complete("hi", use_cache=False).content == "b"
+    pool.keys[1].in_flight -= 1
+
+    stats = pool.stats()
+    assert stats["failovers"] == 1
+    assert not pool.keys[0].available(time.monotonic())
+    assert 4 < stats["keys"][api_key_label("a")]["cooldown_remaining"] <= 5
+    client.complete("again", use_cache=False)
+    assert calls(pool) == {"a": 1, "b": 2}
+
+
+def test_rejected_key_is_removed_from_the_pool():
+    pool = fake_pool(["a", "b"], fail_keys=("a",), status=401)
+    pool.keys[1].in_flight += 1
+    client = GroqClient(key_pool=pool, retry_policy=RetryPolicy(max_attempts=1))
+    assert client.complete("hi", use_cache=False).content == "b"
+    assert pool.keys[0].disabled
+
+    only = fake_pool(["a"], fail_keys=("a",), status=401)
+    client = GroqClient(key_pool=only, retry_policy=RetryPolicy(max_attempts=1))
+    with pytest.raises(Exception, match="401"):
+        client.complete("hi", use_cache=False)
+    with pytest.raises(RuntimeError, match="No usable API keys"):
+        only.acquire()
+
+
+def test_repeated_transient_errors_rest_a_key():
+    pool = fake_pool(["a"], unhealthy_after=2, unhealthy_cooldown=60)
+    for _ in range(2):
+        pool.release(pool.acquire(), error=status_error(503))
+    assert pool.stats()["keys"][api_key_label("a")]["cooldown_remaining"] > 59
+
+
+def test_client_errors_do_not_fail_over():
+    pool = fake_pool(["a", "b"], fail_keys=("a", "b"), status=400)
+    client = GroqClient(key_pool=pool, retry_policy=RetryPolicy(max_attempts=1))
+    with pytest.raises(Exception, match="400"):
+        client.complete("hi", use_cache=False)
+    assert sum(calls(pool).values()) == 1
+    assert pool.stats()["failovers"] == 0
+
+
+def test_per_key_limiters_are_reconciled():
+    pool = fake_pool(["a"], limiter_factory=lambda: RateLimiter(headroom=1.0))
+    client = GroqClient(key_pool=pool)
+    client.complete("hi", use_cache=False)
+    limiter = pool.keys[0].limiter
+    assert limiter.stats()["total_requests"] == 1
+    assert pool.keys[0].in_flight == 0
+
+
+def test_keys_with_the_same_suffix_keep_separate_stats():
+    pool = fake_pool(["gsk_first_1234", "gsk_second_1234"])
+    assert len(pool.stats()["keys"]) == 2
+    assert all("1234" not in name for name in pool.stats()["keys"])
+
+
+def test_pooled_calls_go_to_the_client_base_url(mock_server):
+    keys = [f"gsk_{uuid.uuid4().hex}" for _ in range(2)]
+    pool = KeyPool(keys, limiter_factory=None)
+    client = GroqClient(base_url=mock_server.url, key_pool=pool)
+    assert client.complete("Hello", use_cache=False).content
+    assert pool.base_url == mock_server.url
+    assert mock_server.stats()["requests"] == 1
+
+    own = KeyPool(keys, limiter_factory=None, base_url="http://localhost:1")
+    GroqClient(base_url=mock_server.url, key_pool=own)
+    assert own.base_url == "http://localhost:1"
@@ -0,0 +1,43 @@
+"""
+Lazy imports: importing groq_client must not load the SDK or its dependencies
+
+Run: python -m pytest -q test_groq_lazy_imports.py
+"""
+
+import os
+import subprocess
+import sys
+
+GROQ_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils", "groq")
+HEAVY = ("groq", "httpx", "dotenv", "pydantic")
+
+
+def loaded_after(code: str) -> list:
+    """Heavy modules present in a fresh interpreter after running code"""
+    probe = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=GROQ_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, "GROQ_API_KEY": "test-key"}
+    )
+    lines = result.stdout.strip().splitlines() or [""]
+    return [name for name in lines[-1].split(",") if name]
+
+
+def test_import_loads_no_sdk():
+    assert loaded_after("import groq_client") == []
+
+
+def test_building_a_client_defers_the_sdk_until_first_use():
+    assert loaded_after("import groq_client\nclient = groq_client.GroqClient()") == ["dotenv"]
+    loaded = loaded_after("import groq_client\ngroq_client.GroqClient().client")
+    assert {"groq", "httpx"} <= set(loaded)
+
+
+def test_error_classification_works_before_the_sdk_is_loaded():
+    code = (
+        "import groq_client\n"
+        "assert groq_client.is_retryable_error(TimeoutError())\n"
+        "assert not groq_client.is_retryable_error(ValueError())\n"
+        "assert groq_client._groq_errors('APITimeoutError') == ()"
+    )
+    assert loaded_after(code) == []
@@ -0,0 +1,97 @@
+"""
+Usage telemetry: metrics registry, Prometheus/JSON export, get_usage_stats
+
+Run: python -m pytest -q test_groq_metrics.py
+"""
+
+import json
+
+import pytest
+
+from conftest import install_fake, status_error
+from groq_client import (
+    CompletionConfig, GroqClient, MetricsRegistry, ResponseCache, RetryBudget, RetryPolicy
+)
+
+
+def series(registry: MetricsRegistry, name: str):
+    return {
+        tuple(sorted(entry["labels"].items())): entry["value"]
+        for entry in registry.snapshot()["counters"] if entry["name"] == name
+    }
+
+
+def test_prometheus_export_formats_counters_and_histograms():
+    registry = MetricsRegistry()
+    registry.inc("groq_requests_total", operation="parse_cv", model='say "hi"', status="ok")
+    registry.observe("groq_request_duration_seconds", 0.3, operation="parse_cv", model="m")
+    text = registry.to_prometheus()
+
+    assert "# TYPE groq_requests_total counter" in text
+    assert 'groq_requests_total{model="say \\"hi\\"",operation="parse_cv",status="ok"} 1' in text
+    assert 'groq_request_duration_seconds_bucket{model="m",operation="parse_cv",le="0.25"} 0' in text
+    assert 'groq_request_duration_seconds_bucket{model="m",operation="parse_cv",le="0.5"} 1' in text
+    assert 'groq_request_duration_seconds_bucket{model="m",operation="parse_cv",le="+Inf"} 1' in text
+    assert 'groq_request_duration_seconds_count{model="m",operation="parse_cv"} 1' in text
+    assert "groq_retries_total" not in text  # no series, no header
+
+
+def test_totals_sum_across_labels_and_reset_clears():
+    registry = MetricsRegistry()
+    registry.inc("groq_prompt_tokens_total", 10, operation="a", model="m")
+    registry.inc("groq_prompt_tokens_total", 5, operation="b", model="m")
+    assert registry.totals() == {"groq_prompt_tokens_total": 15}
+    registry.reset()
+    assert registry.totals() == {}
+
+
+def test_client_records_usage_cost_errors_and_retries():
+    policy = RetryPolicy(base_delay=0.001, max_delay=0.01, budget=RetryBudget())
+    client = GroqClient(retry_policy=policy)
+    install_fake(client, fail=lambda call, request: status_error(503) if call == 2 else None)
+    client.complete("one", use_cache=False)
+    client.complete("two", use_cache=False)  # one retry, then success
+    client.retry_policy = RetryPolicy(max_attempts=1)
+    install_fake(client, fail=lambda call, request: status_error(400))
+    with pytest.raises(Exception):
+        client.complete("three", use_cache=False)
+
+    stats = client.get_usage_stats()
+    assert stats["requests"] == 3
+    assert (stats["prompt_tokens"], stats["completion_tokens"]) == (20, 10)
+    assert stats["estimated_cost_usd"] == pytest.approx(
+        2 * client.calculate_cost(10, 5, CompletionConfig().model), abs=1e-6
+    )
+    requests = series(client.metrics, "groq_requests_total")
+    assert sorted(key[-1][1] for key in requests) == ["error", "ok"]
+    assert client.metrics.totals()["groq_retries_total"] == 1
+
+
+def test_cache_hits_are_counted_without_tokens():
+    client = GroqClient(cache=ResponseCache())
+    install_fake(client)
+    config = CompletionConfig(temperature=0.0)
+    client.complete("ping", config=config)
+    client.complete("ping", config=config)
+
+    totals = client.metrics.totals()
+    assert totals["groq_cache_hits_total"] == 1
+    assert totals["groq_prompt_tokens_total"] == 10
+    assert client.get_usage_stats()["cache"]["hits"] == 1
+
+
+def test_streams_record_time_to_first_token():
+    client = GroqClient()
+    install_fake(client, content="streamed answer")
+    assert "".join(client.complete_stream("hi")) == "streamed answer"
+    names = {entry["name"] for entry in client.metrics.snapshot()["histograms"]}
+    assert "groq_stream_ttft_seconds" in names
+
+
+def test_json_export_round_trips():
+    client = GroqClient()
+    install_fake(client)
+    client.complete("ping", use_cache=False)
+    snapshot = json.loads(client.export_metrics("json"))
+    assert {"counters", "gauges", "histograms"} <= set(snapshot)
+    assert "groq_operation_duration_seconds" in client.export_metrics()
@@ -0,0 +1,116 @@
+"""
+Local Groq-compatible mock server: canned answers, streaming, faults, replay
+
+Run: python -m pytest -q test_groq_mock_server.py
+"""
+
+import json
+import urllib.request
+import uuid
+
+import pytest
+
+from groq_client import GroqClient, RetryPolicy, TaskType, get_retry_after, is_retryable_error
+from mock_groq_server import (
+    CANNED_RESPONSES, DEFAULT_REPLY, LatencyProfile, MockGroqServer, detect_task
+)
+
+FAST = "fixed:1"
+
+
+def mock_client(server: MockGroqServer, **options) -> GroqClient:
+    """Client for server with its own connections and no cache"""
+    return GroqClient(api_key=f"mock-{uuid.uuid4().hex}", base_url=server.url, **options)
+
+
+def post(server: MockGroqServer, body: dict) -> dict:
+    request = urllib.request.Request(
+        f"{server.url}/openai/v1/chat/completions", data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_tasks_are_recognised_from_the_prompts():
+    assert detect_task([{"role": "user", "content": "Extract skills from this text: ..."}]) == TaskType.SKILL_EXTRACTION
+    assert detect_task([{"role": "user", "content": "Hello"}]) is None
+
+
+def test_recruitment_methods_get_canned_answers(mock_server):
+    client = mock_client(mock_server)
+    assert client.extract_skills("Python developer") == CANNED_RESPONSES[TaskType.SKILL_EXTRACTION]
+    assert client.analyze_sentiment("Great interview")["sentiment"] == "positive"
+    assert client.complete("Hello", use_cache=False).content == DEFAULT_REPLY
+    assert mock_server.stats()["canned"] == 3
+
+
+def test_answers_over_max_tokens_are_cut_with_length(mock_server):
+    body = {
+        "model": "mock", "max_tokens": 5,
+        "messages": [{"role": "user", "content": "Analyze the sentiment of this text: fine"}]
+    }
+    choice = post(mock_server, body)["choices"][0]
+    assert choice["finish_reason"] == "length"
+    assert len(choice["message"]["content"]) == 20
+
+
+def test_streams_are_served_as_server_sent_events(mock_server):
+    client = mock_client(mock_server)
+    text = "".join(client.complete_stream("Write a candidate summary for Alex"))
+    assert text == CANNED_RESPONSES[TaskType.CANDIDATE_SUMMARY]
+    assert mock_server.stats()["streams"] == 1
+
+
+def test_rate_limited_requests_carry_retry_after():
+    with MockGroqServer(latency=LatencyProfile.parse(FAST), error_429=1.0, retry_after=7) as server:
+        client = mock_client(server, retry_policy=RetryPolicy(max_attempts=1))
+        with pytest.raises(Exception) as refused:
+            client.complete("Hello", use_cache=False)
+        assert refused.value.status_code == 429
+        assert get_retry_after(refused.value) == 7
+        assert server.stats()["429"] == 1
+
+
+def test_server_errors_are_retryable():
+    with MockGroqServer(latency=LatencyProfile.parse(FAST), error_5xx=1.0, seed=1) as server:
+        client = mock_client(server, retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01))
+        with pytest.raises(Exception) as failed:
+            client.complete("Hello", use_cache=False)
+        assert failed.value.status_code in (500, 502, 503)
+        assert is_retryable_error(failed.value)
+        assert server.stats()["5xx"] == 2
+
+
+def test_journaled_exchanges_are_replayed(tmp_path):
+    messages = [{"role": "user", "content": "What is the notice period?"}]
+    journal = tmp_path / "journal.jsonl"
+    rows = [
+        {"request": {"model": "recorded-model", "messages": messages},
+         "response": {"content": "first answer"}, "latency": 0.001},
+        {"request": {"model": "recorded-model", "messages": messages},
+         "response": {"content": "One month", "usage": {"prompt_tokens": 9, "completion_tokens": 2,
+                                                        "total_tokens": 11}}, "latency": 0.001},
+        {"request": {"model": "recorded-model", "messages": []}, "response": {"content": "ignored"}},
+    ]
+    journal.write_text("\n".join(json.dumps(row) for row in rows))
+
+    with MockGroqServer(journal=str(journal), latency=LatencyProfile.parse("journal")) as server:
+        assert server.recorded == 2
+        answer = post(server, {"model": "other-model", "messages": messages})
+        assert answer["choices"][0]["message"]["content"] == "One month"  # newest record wins
+        assert answer["usage"]["total_tokens"] == 11
+        assert post(server, {"model": "mock", "messages": [{"role": "user", "content": "Hi"}]})[
+            "choices"][0]["message"]["content"] == DEFAULT_REPLY
+
+        with urllib.request.urlopen(f"{server.url}/openai/v1/models") as response:
+            assert [model["id"] for model in json.loads(response.read())["data"]] == ["recorded-model"]
+        assert (server.stats()["replayed"], server.stats()["canned"]) == (1, 1)
+
+
+def test_latency_profiles():
+    assert LatencyProfile.parse("uniform:100,400").params == (100.0, 400.0)
+    assert LatencyProfile.parse("fixed:50", tokens_per_second=100).generation(50) == 0.5
+    for spec in ("fixed", "uniform:1", "gaussian:1,2"):
+        with pytest.raises(ValueError):
+            LatencyProfile.parse(spec)
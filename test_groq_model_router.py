@@ -0,0 +1,82 @@
+"""
+Task-based model routing with a cheap-first cascade
+
+Run: python -m pytest -q test_groq_model_router.py
+"""
+
+import json
+
+from conftest import install_fake
+from groq_client import (
+    SENTIMENT_SCHEMA, CompletionConfig, GroqClient, GroqModel, ModelRouter, TaskType
+)
+
+CHEAP = GroqModel.GEMMA2_9B.value
+STRONG = GroqModel.DEFAULT.value
+
+SKILLS = {"technical": ["Python"], "soft_skills": [], "domain_knowledge": [], "tools_and_technologies": []}
+
+
+def sentiment(confidence: float) -> str:
+    return json.dumps({
+        "sentiment": "positive", "confidence": confidence, "key_themes": [],
+        "emotional_tone": "warm", "summary": "Happy candidate"
+    })
+
+
+def routed_client(answers_by_model, **router_options) -> GroqClient:
+    client = GroqClient(router=ModelRouter(**router_options))
+    install_fake(client, content=lambda request: answers_by_model[request["model"]])
+    return client
+
+
+def test_valid_cheap_answer_is_kept():
+    client = routed_client({CHEAP: json.dumps(SKILLS), STRONG: "unused"})
+    assert client.extract_skills("Python developer") == SKILLS
+    assert [request["model"] for request in client.client.chat.completions.requests] == [CHEAP]
+    assert client.router.stats()["skill_extraction"]["escalations"] == 0
+
+
+def test_invalid_answer_escalates_to_the_next_tier():
+    client = routed_client({CHEAP: '{"technical": "Python"}', STRONG: json.dumps(SKILLS)})
+    assert client.extract_skills("Python developer") == SKILLS
+    assert [request["model"] for request in client.client.chat.completions.requests] == [CHEAP, STRONG]
+
+    stats = client.router.stats()["skill_extraction"]
+    assert stats["reasons"] == {"invalid": 1}
+    assert set(stats["tiers"]) == {CHEAP, STRONG}
+
+
+def test_low_confidence_escalates():
+    client = routed_client({CHEAP: sentiment(0.3), STRONG: sentiment(0.9)}, confidence_threshold=0.6)
+    result = client.complete_routed(
+        TaskType.SENTIMENT_ANALYSIS, "How does this read?", None, CompletionConfig(), SENTIMENT_SCHEMA
+    )
+    assert result["confidence"] == 0.9
+    assert client.router.stats()["sentiment_analysis"]["reasons"] == {"low_confidence": 1}
+    assert client.metrics.totals()["groq_route_escalations_total"] == 1
+
+
+def test_last_tier_answer_is_returned_even_if_invalid():
+    client = routed_client({CHEAP: "not json", STRONG: "still not json"})
+    assert client.extract_skills("Python developer") == {"raw_response": "still not json"}
+
+
+def test_single_tier_tasks_and_custom_routes():
+    router = ModelRouter(routes={TaskType.JOB_MATCHING: (CHEAP, STRONG)})
+    assert router.tiers(TaskType.GENERAL) == (STRONG,)
+    assert router.tiers(TaskType.JOB_MATCHING) == (CHEAP, STRONG)
+    assert router.escalation_reason({"confidence": True}, []) is None
+    assert router.escalation_reason([], [((), "expected object")]) == "invalid"
+
+
+def test_free_form_tasks_escalate_only_on_empty_text():
+    client = routed_client({CHEAP: "  ", STRONG: "A summary"})
+    result = client.complete_routed(TaskType.CANDIDATE_SUMMARY, "Summarize", None, CompletionConfig())
+    assert result == "A summary"
+
+
+def test_unparsable_list_answers_stay_lists():
+    client = routed_client({CHEAP: "not json", STRONG: "still not json"})
+    assert client.extract_skills("Python developer", categorize=False) == []
+    assert client.generate_interview_questions("Analyst", ["SQL"], num_questions=2) == []
@@ -0,0 +1,109 @@
+"""
+Weighted fair queuing and preemption in the priority scheduler
+
+Run: python -m pytest -q test_groq_priority_scheduler.py
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import install_fake
+from groq_client import (
+    DeadlineExceeded, GroqClient, MetricsRegistry, PriorityScheduler, RequestPriority, deadline,
+    priority
+)
+
+INTERACTIVE = RequestPriority.INTERACTIVE
+EMAIL = RequestPriority.EMAIL
+BACKGROUND = RequestPriority.BACKGROUND
+
+
+def dispatch_order(scheduler: PriorityScheduler, requests) -> list:
+    """
+    Queue (name, level, tokens) requests behind a held slot, then record
+    the order in which the scheduler lets them run
+    """
+    order = []
+
+    async def run(name, level, tokens):
+        ticket = await scheduler.acquire_async(tokens, level)
+        order.append(name)
+        scheduler.release(ticket)
+
+    async def main():
+        holder = await scheduler.acquire_async(level=INTERACTIVE)
+        tasks = [asyncio.create_task(run(*request)) for request in requests]
+        await asyncio.sleep(0)  # every request is queued
+        scheduler.release(holder)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    return order
+
+
+def test_classes_share_dispatches_by_weight():
+    scheduler = PriorityScheduler(max_in_flight=1)
+    requests = [(f"i{n}", INTERACTIVE, 100) for n in range(6)] + [(f"e{n}", EMAIL, 100) for n in range(6)]
+    order = dispatch_order(scheduler, requests)
+    first = [name[0] for name in order[:6]]
+    assert first.count("i") == 4 and first.count("e") == 2  # weights 8:4
+    assert order.index("e0") < order.index("i5")  # email is not starved
+
+
+def test_cost_is_measured_in_reserved_tokens():
+    scheduler = PriorityScheduler(max_in_flight=1, weights={EMAIL: 8.0})
+    requests = [("big", INTERACTIVE, 4000), ("small1", EMAIL, 100), ("small2", EMAIL, 100)]
+    assert dispatch_order(scheduler, requests) == ["small1", "small2", "big"]
+
+
+def test_background_waits_while_other_classes_are_queued():
+    scheduler = PriorityScheduler(max_in_flight=1)
+    requests = [(f"b{n}", BACKGROUND, 1) for n in range(3)] + [("i0", INTERACTIVE, 5000), ("e0", EMAIL, 5000)]
+    order = dispatch_order(scheduler, requests)
+    assert order == ["i0", "e0", "b0", "b1", "b2"]
+    stats = scheduler.stats()["classes"]
+    assert stats["background"]["preempted"] == 1  # counted once per waiting request
+    assert stats["background"]["dispatched"] == 3
+
+
+def test_max_in_flight_and_stats():
+    scheduler = PriorityScheduler(max_in_flight=2, metrics=MetricsRegistry())
+    first, second = scheduler.acquire(level=EMAIL), scheduler.acquire(level=BACKGROUND)
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 2
+    assert stats["classes"]["email"]["in_flight"] == 1
+    scheduler.release(first)
+    scheduler.release(second)
+    assert scheduler.stats()["in_flight"] == 0
+    waits = [
+        entry["labels"]["priority"] for entry in scheduler.metrics.snapshot()["histograms"]
+        if entry["name"] == "groq_scheduler_wait_seconds"
+    ]
+    assert waits == ["background", "email"]
+
+
+def test_queued_request_leaves_the_queue_at_its_deadline():
+    scheduler = PriorityScheduler(max_in_flight=1)
+    holder = scheduler.acquire()
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceeded, match="queued as email"):
+            scheduler.acquire(level=EMAIL)
+    assert scheduler.stats()["classes"]["email"]["queued"] == 0
+    scheduler.release(holder)
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_client_calls_are_scheduled_at_the_caller_priority():
+    scheduler = PriorityScheduler()
+    client = GroqClient(scheduler=scheduler)
+    install_fake(client)
+    client.complete("chat", use_cache=False)
+    with priority("background"):
+        client.complete("backfill", use_cache=False)
+    client.complete("inbox", use_cache=False, priority=EMAIL)
+
+    classes = client.get_usage_stats()["scheduler"]["classes"]
+    assert [classes[level.value]["dispatched"] for level in RequestPriority] == [1, 1, 1]
+    assert scheduler.in_flight == 0
+    assert scheduler.metrics is client.metrics
@@ -0,0 +1,82 @@
+"""
+Prompt packing: several small tasks per request, split back per item
+
+Run: python -m pytest -q test_groq_prompt_packing.py
+"""
+
+import json
+import re
+
+from conftest import install_fake
+from groq_client import SKILLS_LIST_SCHEMA, GroqClient, get_validator, pack_prompt, unpack_results
+
+validate_skills = get_validator(SKILLS_LIST_SCHEMA)
+
+
+def test_pack_prompt_indexes_every_item():
+    prompt = pack_prompt("Extract skills.", '["skill"]', ["SQL dev", "Go dev"])
+    assert "There are 2 independent items" in prompt
+    assert "### ITEM 0\nSQL dev" in prompt and "### ITEM 1\nGo dev" in prompt
+
+
+def test_unpack_keeps_only_valid_in_range_first_answers():
+    answer = json.dumps([
+        {"index": 0, "result": ["SQL"]},
+        {"index": "1", "result": ["Go"]},
+        {"index": 1, "result": ["duplicate"]},
+        {"index": 2, "result": "not a list"},
+        {"index": 7, "result": ["out of range"]},
+        {"result": ["no index"]},
+    ])
+    assert unpack_results(answer, 3, validate_skills) == {0: ["SQL"], 1: ["Go"]}
+
+
+def test_unpack_accepts_a_wrapped_or_truncated_array():
+    wrapped = json.dumps({"results": [{"index": 0, "result": ["SQL"]}]})
+    assert unpack_results(wrapped, 1, validate_skills) == {0: ["SQL"]}
+    truncated = '[{"index": 0, "result": ["SQL"]}, {"index": 1, "result": ["G'
+    assert unpack_results(truncated, 2, validate_skills) == {0: ["SQL"]}
+    assert unpack_results("no json", 2, validate_skills) == {}
+
+
+def answer_packs(request):
+    """Answer packed prompts item by item, leaving out items that mention SKIP"""
+    prompt = request["messages"][-1]["content"]
+    items = re.findall(r"### ITEM (\d+)\n(.*)", prompt)
+    if not items:
+        return json.dumps(["single"])
+    return json.dumps([
+        {"index": int(index), "result": [text.split()[0]]}
+        for index, text in items if "SKIP" not in text
+    ])
+
+
+def test_packed_extraction_uses_few_requests_and_falls_back_per_item():
+    client = GroqClient()
+    sync, async_ = install_fake(client, content=answer_packs)
+    texts = ["SQL developer", "Go engineer", "SKIP this one", "AWS architect", "Excel analyst"]
+    results = client.extract_skills_packed(texts, categorize=False, pack_size=2)
+
+    assert results == [["SQL"], ["Go"], ["single"], ["AWS"], ["Excel"]]
+    assert async_.calls == 3  # three packs
+    assert sync.calls == 1    # one item retried on its own
+    counters = client.metrics.snapshot()["counters"]
+    outcomes = {
+        entry["labels"]["outcome"]: entry["value"]
+        for entry in counters if entry["name"] == "groq_packed_items_total"
+    }
+    assert outcomes == {"packed": 4, "fallback": 1}
+
+
+def test_pack_max_tokens_scales_with_pack_size():
+    client = GroqClient()
+    _, async_ = install_fake(client, content=answer_packs)
+    client.extract_skills_packed(["SQL dev"] * 3, categorize=False, pack_size=3)
+    assert async_.requests[0]["max_tokens"] == 3000
+
+
+def test_empty_input_sends_nothing():
+    client = GroqClient()
+    sync, async_ = install_fake(client)
+    assert client.extract_skills_packed([]) == []
+    assert sync.calls == async_.calls == 0
@@ -0,0 +1,101 @@
+"""
+Token-bucket pacing of requests and tokens per minute
+
+Run: python -m pytest -q test_groq_rate_limiter.py
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from conftest import install_fake
+from groq_client import (
+    CompletionConfig, DeadlineExceeded, GroqClient, RateLimiter, RetryPolicy, deadline
+)
+
+
+def test_reservation_covers_prompt_and_completion_within_capacity():
+    limiter = RateLimiter(tokens_per_minute=1000, headroom=1.0, default_max_tokens=300)
+    assert limiter.reservation_size(100, 50) == 150
+    assert limiter.reservation_size(100, None) == 400
+    assert limiter.reservation_size(900, 500) == 1000
+
+
+def test_request_bucket_blocks_until_refill():
+    limiter = RateLimiter(requests_per_minute=600, headroom=1.0)  # 10 per second
+    for _ in range(600):
+        assert limiter.try_acquire(1) is not None
+    assert limiter.try_acquire(1) is None
+
+    start = time.monotonic()
+    reservation = limiter.acquire(1)
+    assert 0.05 < time.monotonic() - start < 0.5
+    assert reservation.waited > 0
+    assert limiter.stats()["total_waits"] == 1
+
+
+def test_token_bucket_limits_large_requests():
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600, headroom=1.0)
+    assert limiter.try_acquire(500) is not None
+    assert limiter.try_acquire(200) is None
+    assert limiter.try_acquire(100) is not None
+
+
+def test_reconcile_refunds_over_estimates_and_charges_debt():
+    limiter = RateLimiter(tokens_per_minute=1000, headroom=1.0)
+    reservation = limiter.acquire(600)
+    limiter.reconcile(reservation, 100)
+    assert limiter.stats()["available_tokens"] >= 900
+    assert limiter.stats()["refunded_tokens"] == 500
+
+    reservation = limiter.acquire(100)
+    limiter.reconcile(reservation, 700)  # the response was bigger than reserved
+    assert limiter.stats()["available_tokens"] < 400
+
+
+def test_release_returns_the_whole_reservation():
+    limiter = RateLimiter(tokens_per_minute=1000, headroom=1.0)
+    limiter.release(limiter.acquire(800))
+    assert limiter.stats()["available_tokens"] >= 999
+
+
+def test_wait_is_bounded_by_the_deadline():
+    limiter = RateLimiter(requests_per_minute=1, headroom=1.0)
+    limiter.acquire(1)
+    with deadline(0.05), pytest.raises(DeadlineExceeded):
+        limiter.acquire(1)
+
+
+def test_async_acquire_waits_without_blocking_the_loop():
+    limiter = RateLimiter(requests_per_minute=600, headroom=1.0)
+    while limiter.try_acquire(1) is not None:
+        pass
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        await limiter.acquire_async(1)
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(run()) > 1
+
+
+def test_client_reconciles_reservations_with_reported_usage():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=10000, headroom=1.0)
+    client = GroqClient(rate_limiter=limiter, retry_policy=RetryPolicy(max_attempts=1))
+    install_fake(client)
+    client.complete("ping", config=CompletionConfig(max_tokens=500), use_cache=False)
+
+    stats = limiter.stats()
+    assert stats["total_requests"] == 1
+    # The fake reports 15 tokens used against a reservation of prompt + 500
+    assert stats["refunded_tokens"] > 450
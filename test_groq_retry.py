@@ -0,0 +1,190 @@
+"""
+Retry policy: error classification, backoff, retry budget and streams
+
+Run: python -m pytest -q test_groq_retry.py
+"""
+
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from conftest import install_fake, make_chunks, status_error
+from groq_client import (
+    GroqClient, RetryBudget, RetryPolicy, get_retry_after, is_retryable_error, retry_on_error
+)
+
+
+def fast_policy(**kwargs) -> RetryPolicy:
+    kwargs.setdefault("budget", RetryBudget())
+    return RetryPolicy(base_delay=0.001, max_delay=0.01, **kwargs)
+
+
+def fail_first(count: int, status: int = 503):
+    return lambda call, request: status_error(status) if call <= count else None
+
+
+def flaky(failures: int, status: int = 503):
+    """Callable failing `failures` times with status, then returning ok"""
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise status_error(status)
+        return "ok"
+    call.calls = calls
+    return call
+
+
+def test_errors_are_classified_by_status_and_type():
+    assert is_retryable_error(status_error(429))
+    assert is_retryable_error(status_error(503))
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(ConnectionError())
+    assert not is_retryable_error(status_error(400))
+    assert not is_retryable_error(ValueError("bad JSON"))
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert get_retry_after(status_error(429, retry_after=2.5)) == 2.5
+    assert get_retry_after(status_error(429)) is None
+    error = status_error(429)
+    error.response.headers["retry-after"] = formatdate(time.time() + 30, usegmt=True)
+    assert 25 < get_retry_after(error) <= 30
+
+
+def test_transient_errors_are_retried_and_fatal_ones_are_not():
+    policy = fast_policy(max_attempts=3)
+    call = flaky(2)
+    assert policy.call(call) == "ok"
+    assert len(call.calls) == 3
+
+    call = flaky(1, 400)
+    with pytest.raises(Exception, match="400"):
+        policy.call(call)
+    assert len(call.calls) == 1
+    assert policy.stats() == {"calls": 2, "retries": 2, "fatal_errors": 1, "budget_exhausted": 0}
+
+
+def test_gives_up_after_max_attempts():
+    call = flaky(5)
+    with pytest.raises(Exception, match="503"):
+        fast_policy(max_attempts=2).call(call)
+    assert len(call.calls) == 2
+
+
+def test_retry_after_sets_the_backoff_up_to_max_delay():
+    policy = RetryPolicy(base_delay=0.001, max_delay=0.05, budget=RetryBudget())
+    attempts = []
+
+    def call():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise status_error(429, retry_after=60)
+        return "ok"
+
+    assert policy.call(call) == "ok"
+    assert 0.04 < attempts[1] - attempts[0] < 0.5
+
+
+def test_empty_budget_stops_retries():
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=1)
+    policy = fast_policy(max_attempts=5, budget=budget)
+    call = flaky(10)
+    with pytest.raises(Exception, match="503"):
+        policy.call(call)
+    assert len(call.calls) == 2  # one retry, then the budget is empty
+    assert policy.stats()["budget_exhausted"] == 1
+
+
+def test_first_attempts_refill_the_budget():
+    budget = RetryBudget(ratio=0.5, min_per_second=0.0, max_tokens=1)
+    assert budget.withdraw() and not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_async_calls_are_retried():
+    policy = fast_policy(max_attempts=3)
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise status_error(502)
+        return "ok"
+
+    assert asyncio.run(policy.call_async(call)) == "ok"
+    assert len(attempts) == 3
+
+
+def test_retry_on_error_wraps_sync_and_async_functions():
+    call = flaky(1)
+    assert retry_on_error(max_retries=2, delay=0.001)(call)() == "ok"
+
+    attempts = []
+
+    @retry_on_error(max_retries=2, delay=0.001)
+    async def call_async():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise status_error(500)
+        return "ok"
+
+    assert asyncio.run(call_async()) == "ok"
+
+
+def test_client_retries_transient_completion_errors():
+    client = GroqClient(retry_policy=fast_policy(max_attempts=3))
+    sync, _ = install_fake(client, content="done", fail=fail_first(2))
+    assert client.complete("ping", use_cache=False).content == "done"
+    assert sync.calls == 3
+
+
+def test_stream_open_errors_are_retried():
+    client = GroqClient(retry_policy=fast_policy(max_attempts=3))
+    sync, _ = install_fake(client, content="hello world", fail=fail_first(2, 429))
+    assert "".join(client.complete_stream("hi")) == "hello world"
+    assert sync.calls == 3
+    assert client.retry_policy.stats()["retries"] == 2
+
+
+def test_async_stream_open_errors_are_retried():
+    client = GroqClient(retry_policy=fast_policy(max_attempts=3))
+    _, async_ = install_fake(client, content="hello world", fail=fail_first(1))
+
+    async def collect():
+        return "".join([chunk async for chunk in client.complete_stream_async("hi")])
+
+    assert asyncio.run(collect()) == "hello world"
+    assert async_.calls == 2
+
+
+def test_stream_client_errors_are_not_retried():
+    client = GroqClient(retry_policy=fast_policy(max_attempts=3))
+    sync, _ = install_fake(client, fail=fail_first(5, 400))
+    with pytest.raises(Exception) as raised:
+        list(client.complete_stream("hi"))
+    assert getattr(raised.value, "status_code", None) == 400
+    assert sync.calls == 1
+
+
+def test_stream_errors_after_first_chunk_propagate():
+    client = GroqClient(retry_policy=fast_policy(max_attempts=3))
+    sync, _ = install_fake(client)
+
+    def broken(**kwargs):
+        sync.calls += 1
+        yield from make_chunks("partial")
+        raise status_error(503)
+
+    sync.create = broken
+    received = []
+    with pytest.raises(Exception):
+        for chunk in client.complete_stream("hi"):
+            received.append(chunk)
+    assert "".join(received) == "partial"
+    assert sync.calls == 1
@@ -0,0 +1,96 @@
+"""
+Coalescing of concurrent identical requests (single-flight)
+
+Run: python -m pytest -q test_groq_single_flight.py
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import install_fake, status_error
+from groq_client import DeadlineExceeded, GroqClient, RetryPolicy, SingleFlight, deadline
+
+
+def test_concurrent_identical_calls_share_one_request():
+    client = GroqClient()
+    sync, _ = install_fake(client, content="shared", delay=0.1)
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: client.complete("ping", use_cache=False), range(5)))
+
+    assert [result.content for result in results] == ["shared"] * 5
+    assert sync.calls == 1
+    assert client.flights.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_different_requests_are_not_coalesced():
+    client = GroqClient()
+    sync, _ = install_fake(client, delay=0.05)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(lambda i: client.complete(f"ping {i}", use_cache=False), range(3)))
+    assert sync.calls == 3
+
+
+def test_disabled_single_flight_sends_every_call():
+    client = GroqClient(single_flight=False)
+    sync, _ = install_fake(client, delay=0.05)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(lambda _: client.complete("ping", use_cache=False), range(3)))
+    assert sync.calls == 3
+
+
+def test_leader_error_reaches_followers():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise status_error(503)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "key", fail)
+        started.wait()
+        follower = pool.submit(flights.do, "key", lambda: pytest.fail("follower must not call"))
+        for future in (leader, follower):
+            with pytest.raises(Exception, match="503"):
+                future.result()
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_follower_gives_up_at_its_deadline_but_leader_finishes():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.15)
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(flights.do, "key", slow)
+        started.wait()
+        with deadline(0.02), pytest.raises(DeadlineExceeded):
+            flights.do("key", slow)
+        assert leader.result() == "done"
+
+
+def test_cancelling_one_async_waiter_keeps_the_shared_request():
+    client = GroqClient(retry_policy=RetryPolicy(max_attempts=1))
+    _, async_ = install_fake(client, content="shared", delay=0.1)
+
+    async def run():
+        tasks = [asyncio.ensure_future(client.complete_async("ping", use_cache=False)) for _ in range(3)]
+        await asyncio.sleep(0.02)
+        tasks[0].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return results
+
+    results = asyncio.run(run())
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert [result.content for result in results[1:]] == ["shared", "shared"]
+    assert async_.calls == 1
+    assert client.flights.stats()["in_flight"] == 0
@@ -0,0 +1,73 @@
+"""
+Incremental parsing of streamed JSON answers
+
+Run: python -m pytest -q test_groq_streaming_json.py
+"""
+
+import json
+
+from conftest import install_fake
+from groq_client import GroqClient, StreamingJSONParser, salvage_json
+
+
+def feed_chars(parser: StreamingJSONParser, text: str):
+    """Feed one character at a time, recording after which character each member closed"""
+    events = []
+    for position, char in enumerate(text):
+        events += [(position, member) for member in parser.feed(char)]
+    return events
+
+
+def test_object_members_are_emitted_as_they_close():
+    text = '{"name": "Jane", "skills": ["SQL", "AWS"], "years": 7}'
+    parser = StreamingJSONParser()
+    events = feed_chars(parser, text)
+
+    assert [member for _, member in events] == [
+        ("name", "Jane"), ("skills", ["SQL", "AWS"]), ("years", 7)
+    ]
+    # "name" is available before the rest of the answer has arrived
+    assert events[0][0] == text.index(", \"skills\"")
+    assert parser.done and parser.result == json.loads(text)
+
+
+def test_array_items_are_indexed():
+    parser = StreamingJSONParser()
+    members = parser.feed('[{"question": "Why?"}, {"question": "How?"}')
+    assert members == [(0, {"question": "Why?"})]
+    assert parser.feed("]") == [(1, {"question": "How?"})]
+
+
+def test_strings_with_delimiters_and_escapes_do_not_split_members():
+    text = '{"summary": "a, b} and \\"c]\\"", "next": {"x": [1, 2]}}'
+    parser = StreamingJSONParser()
+    assert [key for _, (key, _) in feed_chars(parser, text)] == ["summary", "next"]
+    assert parser.result == json.loads(text)
+
+
+def test_fences_and_trailing_text_are_ignored():
+    parser = StreamingJSONParser()
+    parser.feed('```json\n{"a": 1}\n```\nHope this helps!')
+    assert parser.done
+    assert parser.text[parser.start:] == '{"a": 1}'
+    assert parser.feed('{"b": 2}') == []
+
+
+def test_malformed_members_are_skipped_and_counted():
+    parser = StreamingJSONParser()
+    members = parser.feed('{"a": 1, "b": nope, "c": 3}')
+    assert members == [("a", 1), ("c", 3)]
+    assert parser.errors == 1
+
+
+def test_salvage_keeps_members_of_a_truncated_answer():
+    assert salvage_json('{"a": 1, "b": [1, 2], "c": "unfinis') == {"a": 1, "b": [1, 2]}
+    assert salvage_json('Sure! ["x", "y"]') == ["x", "y"]
+    assert salvage_json("no json here") is None
+
+
+def test_client_yields_members_of_a_streamed_answer():
+    client = GroqClient()
+    install_fake(client, content='{"technical": ["Python"], "soft_skills": ["Teamwork"]}')
+    members = list(client.complete_json_stream("Extract skills"))
+    assert members == [("technical", ["Python"]), ("soft_skills", ["Teamwork"])]
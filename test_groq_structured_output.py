@@ -0,0 +1,97 @@
+"""
+Schema-enforced structured output with partial repair
+
+Run: python -m pytest -q test_groq_structured_output.py
+"""
+
+import json
+
+from conftest import install_fake
+from groq_client import (
+    INTERVIEW_QUESTIONS_SCHEMA, MATCH_SCHEMA, SKILLS_SCHEMA, GroqClient, compile_schema, get_validator
+)
+
+VALID_MATCH = {
+    "match_score": 80, "strengths": ["SQL"], "gaps": [], "recommendations": [], "summary": "Good fit"
+}
+
+
+def answers(*contents):
+    """Fake content returning each answer in turn"""
+    queue = list(contents)
+    return lambda request: queue.pop(0) if len(queue) > 1 else queue[0]
+
+
+def test_validator_reports_paths_of_bad_fields():
+    validate = compile_schema(MATCH_SCHEMA)
+    assert validate(VALID_MATCH) == []
+    errors = validate({**VALID_MATCH, "match_score": 140, "strengths": ["SQL", 3]})
+    assert [path for path, _ in errors] == [("match_score",), ("strengths", 1)]
+
+    missing = {key: value for key, value in VALID_MATCH.items() if key != "summary"}
+    assert validate(missing) == [(("summary",), "missing")]
+    assert compile_schema({"type": "integer"})(True)  # booleans are not integers
+
+
+def test_array_items_and_enums_are_checked():
+    validate = compile_schema(INTERVIEW_QUESTIONS_SCHEMA)
+    assert validate([{"question": "Why?", "category": "behavioral"}]) == []
+    errors = validate([{"question": "Why?", "category": "trivia"}])
+    assert errors[0][0] == (0, "category")
+
+
+def test_validators_are_compiled_once_per_schema():
+    assert get_validator(SKILLS_SCHEMA) is get_validator(SKILLS_SCHEMA)
+
+
+def test_valid_answer_needs_no_repair():
+    client = GroqClient()
+    sync, _ = install_fake(client, content=json.dumps(VALID_MATCH))
+    assert client.complete_structured("match", schema=MATCH_SCHEMA) == VALID_MATCH
+    assert sync.calls == 1
+    assert sync.requests[0]["response_format"] == {"type": "json_object"}
+
+
+def test_only_invalid_fields_are_asked_for_again():
+    first = {**VALID_MATCH, "match_score": "high"}
+    client = GroqClient()
+    sync, _ = install_fake(client, content=answers(json.dumps(first), '{"match_score": 75, "summary": "ignored"}'))
+    result = client.complete_structured("match", schema=MATCH_SCHEMA)
+
+    assert result == {**VALID_MATCH, "match_score": 75}
+    assert sync.calls == 2
+    repair_prompt = sync.requests[1]["messages"][-1]["content"]
+    assert "match_score" in repair_prompt and "strengths" not in repair_prompt
+    assert client.metrics.totals()["groq_structured_repairs_total"] == 1
+
+
+def test_truncated_answer_keeps_completed_fields():
+    truncated = json.dumps(VALID_MATCH)[:-25]  # cut inside "recommendations"
+    client = GroqClient()
+    sync, _ = install_fake(client, content=answers(truncated, '{"recommendations": [], "summary": "Good fit"}'))
+    result = client.complete_structured("match", schema=MATCH_SCHEMA)
+    assert result == VALID_MATCH
+    assert sync.calls == 2
+    assert '"strengths": ["SQL"]' not in sync.requests[1]["messages"][-1]["content"]
+
+
+def test_failure_after_repairs_is_counted_and_best_effort_returned():
+    client = GroqClient()
+    install_fake(client, content='{"match_score": "high"}')
+    result = client.complete_structured("match", schema=MATCH_SCHEMA, max_repairs=2)
+    assert result["match_score"] == "high"
+    totals = client.metrics.totals()
+    assert totals["groq_structured_repairs_total"] == 2
+    assert totals["groq_structured_failures_total"] == 1
+
+
+def test_validators_are_cached_by_schema_content():
+    def string_validator():
+        return get_validator({"type": "string"})
+
+    validate_string = string_validator()
+    validate_object = get_validator({"type": "object"})
+    assert validate_object is not validate_string
+    assert validate_object({}) == []
+    assert string_validator() is validate_string
+    assert get_validator({"required": ["a"], "type": "object"}) is get_validator({"type": "object", "required": ["a"]})
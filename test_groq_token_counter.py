@@ -0,0 +1,60 @@
+"""
+Token counting by model family, with memoization
+
+Run: python -m pytest -q test_groq_token_counter.py
+"""
+
+from groq_client import MESSAGE_OVERHEAD_TOKENS, GroqClient, TokenCounter
+
+
+def offline_counter(tmp_path, **kwargs) -> TokenCounter:
+    """Counter with no vocabulary files, so counts use the pre-tokenizer estimate"""
+    return TokenCounter(tokenizer_dir=str(tmp_path), **kwargs)
+
+
+def test_models_map_to_tokenizer_families():
+    assert TokenCounter.family("llama-3.3-70b-versatile") == "llama3"
+    assert TokenCounter.family("mixtral-8x7b-32768") == "mixtral"
+    assert TokenCounter.family("gemma-7b-it") == "gemma"
+
+
+def test_estimate_counts_words_and_punctuation(tmp_path):
+    counter = offline_counter(tmp_path)
+    assert counter.count("") == 0
+    assert counter.count("hello world") == 2
+    # Digits split in groups of three for Llama 3 and one by one elsewhere
+    assert counter.count("123456") == 2
+    assert counter.count("123456", "gemma-7b-it") == 6
+
+
+def test_structured_text_costs_more_than_a_flat_ratio(tmp_path):
+    counter = offline_counter(tmp_path)
+    record = '{"id": 1042, "name": "Jane", "skills": ["SQL", "AWS"]}, ' * 20
+    assert counter.count(record) > len(record) // 4
+
+
+def test_counts_are_memoized_per_family(tmp_path):
+    counter = offline_counter(tmp_path, cache_size=2)
+    counter.count("system prompt")
+    counter.count("system prompt")
+    counter.count("system prompt", "gemma-7b-it")
+    stats = counter.stats()
+    assert (stats["cache_hits"], stats["cache_misses"]) == (1, 2)
+
+    counter.count("another")
+    assert counter.stats()["cached_segments"] == 2
+    assert counter.stats()["vocabularies"] == []
+
+
+def test_batch_and_message_counts(tmp_path):
+    counter = offline_counter(tmp_path)
+    texts = ["one two", "three"]
+    assert counter.count_batch(texts) == [counter.count(text) for text in texts]
+
+    messages = [{"role": "system", "content": "one two"}, {"role": "user", "content": "three"}]
+    assert counter.count_messages(messages) == 3 + 2 * MESSAGE_OVERHEAD_TOKENS["llama3"]
+
+
+def test_client_estimate_uses_the_shared_counter():
+    client = GroqClient()
+    assert client.estimate_tokens("hello world") == client.token_counter.count("hello world")
@@ -9,7 +9,33 @@ import json
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from groq_client import GroqClient, TaskType
+from groq_client import (
+    get_shared_client, GroqClient, TaskType, CompletionConfig, ModelRouter, RequestPriority,
+    EMAIL_CLASSIFICATION_SCHEMA, CircuitBreaker, CircuitOpen
+)
+
+
+CLASSIFICATION_SYSTEM_PROMPT = """You are an email classification expert for a recruitment agency.
+Classify emails into exactly one category: candidate, client, supplier, staff, or other.
+Also identify: subcategory, priority (urgent/high/normal/low), sentiment (positive/neutral/negative),
+keywords, and whether action is required.
+
+Respond ONLY with valid JSON in this format:
+{
+  "category": "candidate|client|supplier|staff|other",
+  "subcategory": "string",
+  "confidence": 0.0-1.0,
+  "priority": "urgent|high|normal|low",
+  "sentiment": "positive|neutral|negative|mixed",
+  "keywords": ["keyword1", "keyword2"],
+  "requires_action": true|false,
+  "suggested_actions": ["action1", "action2"],
+  "reasoning": "brief explanation"
+}"""
+
+# Shared by every classifier on the default client, so an outage seen by one
+# sends them all to rule-based classification
+CLASSIFIER_CIRCUIT_BREAKER = CircuitBreaker()
 
 
 class EmailClassifier:
@@ -18,9 +44,25 @@ class EmailClassifier:
     Categorizes emails and extracts relevant entities and metadata.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the email classifier with GROQ client."""
-        self.groq = GroqClient(api_key=api_key)
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        router: Optional[ModelRouter] = None,
+        groq_client: Optional[GroqClient] = None
+    ):
+        """
+        Initialize the email classifier with GROQ client.
+
+        Args:
+            api_key: GROQ API key (defaults to GROQ_API_KEY)
+            router: Optional cheap-first model router; triage then starts on
+                a small model and escalates only low-confidence answers
+            groq_client: Client to use instead of the shared one (give it a
+                circuit_breaker for rule-based answers during outages)
+        """
+        self.groq = groq_client or get_shared_client(
+            api_key, router=router, circuit_breaker=CLASSIFIER_CIRCUIT_BREAKER
+        )
 
         # Category detection patterns (rule-based fallback)
         self.patterns = {
@@ -93,10 +135,14 @@ class EmailClassifier:
             from_email, subject, body_text, attachments
         )
 
-        # Then apply AI classification
-        ai_result = self._ai_classification(
-            from_email, subject, body_text, to_emails, attachments
+        # Then apply AI classification (rules only while GROQ's circuit is open)
+        ai_result = self.groq.with_fallback(
+            TaskType.EMAIL_CLASSIFICATION, self._ai_classification,
+            from_email, subject, body_text, to_emails, attachments,
+            fallback=self._degraded_classification
         )
+        if ai_result.get('degraded'):
+            return ai_result
 
         # Combine results (AI takes precedence if confidence > 0.7)
         final_result = self._merge_classifications(rule_based_result, ai_result)
@@ -168,6 +214,20 @@ class EmailClassifier:
             'reason': f'Pattern matches: {scores[category]}'
         }
 
+    def _degraded_classification(
+        self,
+        from_email: str,
+        subject: str,
+        body_text: str,
+        to_emails: Optional[List[str]] = None,
+        attachments: Optional[List[str]] = None
+    ) -> Dict:
+        """Rule-based result used in place of AI classification while GROQ is unavailable."""
+        return {
+            **self._rule_based_classification(from_email, subject, body_text, attachments),
+            'degraded': True
+        }
+
     def _ai_classification(
         self,
         from_email: str,
@@ -192,45 +252,31 @@ class EmailClassifier:
 
         try:
             # Use GROQ for classification
-            response = self.groq.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an email classification expert for a recruitment agency.
-Classify emails into exactly one category: candidate, client, supplier, staff, or other.
-Also identify: subcategory, priority (urgent/high/normal/low), sentiment (positive/neutral/negative),
-keywords, and whether action is required.
-
-Respond ONLY with valid JSON in this format:
-{
-  "category": "candidate|client|supplier|staff|other",
-  "subcategory": "string",
-  "confidence": 0.0-1.0,
-  "priority": "urgent|high|normal|low",
-  "sentiment": "positive|neutral|negative|mixed",
-  "keywords": ["keyword1", "keyword2"],
-  "requires_action": true|false,
-  "suggested_actions": ["action1", "action2"],
-  "reasoning": "brief explanation"
-}"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            config = CompletionConfig(
                 model="llama-3.3-70b-versatile",
                 temperature=0.1,  # Low temperature for consistent classification
                 max_tokens=500
             )
+            result = self.groq.complete_routed(
+                TaskType.EMAIL_CLASSIFICATION,
+                prompt,
+                CLASSIFICATION_SYSTEM_PROMPT,
+                config,
+                EMAIL_CLASSIFICATION_SCHEMA,
+                priority=RequestPriority.EMAIL
+            )
 
             # Parse AI response
-            ai_output = response.choices[0].message.content.strip()
-            result = self._parse_ai_response(ai_output)
+            if 'raw_response' in result:
+                result = self._parse_ai_response(result['raw_response'].strip())
+            result.setdefault('category', 'other')
+            result.setdefault('confidence', 0.5)
             result['method'] = 'ai'
 
             return result
 
+        except CircuitOpen:
+            raise
         except Exception as e:
             print(f"AI classification error: {e}")
             return {
@@ -0,0 +1,82 @@
+"""
+Benchmark: fresh GroqClient per call vs. the shared client registry
+
+Sends the same short prompt repeatedly, once building a new GroqClient for
+every call (the old quick_complete / classify_email behaviour) and once
+through get_shared_client, and prints per-call latency for both.
+
+Usage:
+    python benchmark_client_reuse.py --calls 20
+    python benchmark_client_reuse.py --calls 50 --base-url http://localhost:8000
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from groq_client import (
+    CLIENT_REGISTRY, ClientRegistry, CompletionConfig, GroqClient, GroqModel, get_shared_client
+)
+
+PROMPT = "Reply with the single word: ok"
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(label: str, get_client: Callable[[], GroqClient], calls: int, config: CompletionConfig) -> Dict[str, float]:
+    """Time `calls` short completions, each through get_client()"""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        get_client().complete(PROMPT, config=config, use_cache=False)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    result = {
+        "mean": statistics.mean(latencies),
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "first": latencies[0],
+    }
+    print(
+        f"{label:<22} mean {result['mean']:8.1f} ms   p50 {result['p50']:8.1f} ms   "
+        f"p95 {result['p95']:8.1f} ms   first call {result['first']:8.1f} ms"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fresh vs shared GroqClient latency")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per scenario")
+    parser.add_argument("--model", default=GroqModel.GEMMA2_9B.value, help="Model to call")
+    parser.add_argument("--api-key", dest="api_key", help="GROQ API key (defaults to GROQ_API_KEY)")
+    parser.add_argument("--base-url", dest="base_url", help="API base URL (e.g. a local mock server)")
+    args = parser.parse_args()
+
+    config = CompletionConfig(model=args.model, temperature=0.0, max_tokens=5)
+
+    def fresh_client() -> GroqClient:
+        # A brand-new registry per call reproduces the old behaviour:
+        # new Groq/AsyncGroq objects and new connection pools every time
+        client = GroqClient(args.api_key)
+        client.client, client.async_client = ClientRegistry().sdk_clients(client.api_key, args.base_url)
+        return client
+
+    def shared_client() -> GroqClient:
+        return get_shared_client(args.api_key, base_url=args.base_url)
+
+    print(f"\n{args.calls} calls per scenario, model {args.model}\n")
+    before = run("fresh client per call", fresh_client, args.calls, config)
+    after = run("shared registry client", shared_client, args.calls, config)
+
+    saved = before["mean"] - after["mean"]
+    print(f"\nMean saving per call: {saved:.1f} ms ({saved / before['mean']:.0%})")
+    print(f"Registry: {CLIENT_REGISTRY.stats()}")
+
+
+if __name__ == "__main__":
+    main()
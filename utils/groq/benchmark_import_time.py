@@ -0,0 +1,107 @@
+"""
+Benchmark: cold-start import cost of groq_client
+
+Runs a fresh interpreter with `-X importtime` and reports where import time
+goes (the heaviest modules by cumulative and self time), then measures the
+wall-clock cold start of `import <module>` against an empty interpreter.
+Short-lived CLIs such as classify_email.py pay this on every invocation.
+
+Usage:
+    python benchmark_import_time.py
+    python benchmark_import_time.py --module email_classifier --path ../email --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def child_env(paths: List[str]) -> dict:
+    """Environment for child interpreters with the extra import paths"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(paths + [env.get("PYTHONPATH", "")]).rstrip(os.pathsep)
+    return env
+
+
+def import_report(module: str, env: dict) -> List[Tuple[int, int, int, str]]:
+    """
+    Run `-X importtime` for a module
+
+    Returns:
+        (self_us, cumulative_us, depth, name) for every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def cold_start_ms(code: str, env: dict, runs: int) -> List[float]:
+    """Wall-clock milliseconds for `python -c code`, once per run"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import-time cost of a module")
+    parser.add_argument("--module", default="groq_client", help="Module to import")
+    parser.add_argument("--path", action="append", default=[], help="Extra import path (repeatable)")
+    parser.add_argument("--runs", type=int, default=10, help="Cold starts to time")
+    parser.add_argument("--top", type=int, default=10, help="Modules to list")
+    args = parser.parse_args()
+
+    env = child_env([HERE] + [os.path.abspath(path) for path in args.path])
+    rows = import_report(args.module, env)
+    end = next(index for index, row in enumerate(rows) if row[3] == args.module and row[2] == 0)
+    start = end
+    while start > 0 and rows[start - 1][2] > 0:
+        start -= 1
+    # Only the target's own import tree, not interpreter start-up (site etc.)
+    rows = rows[start:end + 1]
+    target = rows[-1]
+
+    print(f"\nimport {args.module}: {target[1] / 1000:.1f} ms cumulative, {target[0] / 1000:.1f} ms self\n")
+
+    print("Heaviest imports (cumulative):")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda r: -r[1])[1:args.top + 1]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    print("\nHeaviest module bodies (self):")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda r: -r[0])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    for heavy in ("groq", "httpx", "dotenv", "pydantic"):
+        if any(row[3] == heavy for row in rows):
+            print(f"\nNote: '{heavy}' is imported eagerly")
+
+    baseline = cold_start_ms("pass", env, args.runs)
+    loaded = cold_start_ms(f"import {args.module}", env, args.runs)
+    print(f"\nCold start over {args.runs} runs (median):")
+    print(f"  empty interpreter     {statistics.median(baseline):8.1f} ms")
+    print(f"  import {args.module:<14} {statistics.median(loaded):8.1f} ms")
+    print(f"  import overhead       {statistics.median(loaded) - statistics.median(baseline):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Benchmark: throughput and tail latency of the client against a mock API
+
+Starts a local MockGroqServer (or uses --base-url for one already running)
+and drives complete, complete_stream, batch_complete and both email
+classifiers with concurrent callers, printing throughput and p50/p95/p99
+latency for each. No tokens are spent; latency, token rate and error
+injection come from the mock's settings.
+
+Usage:
+    python benchmark_throughput.py --requests 200 --concurrency 16
+    python benchmark_throughput.py --latency uniform:50,400 --rate-429 0.05 --rate-5xx 0.01
+    python benchmark_throughput.py --journal journal/ --latency journal --scenarios complete classify_email
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "email"))
+
+from groq_client import CompletionConfig, GroqClient, RetryPolicy
+from mock_groq_server import LatencyProfile, MockGroqServer
+
+SCENARIOS = ("complete", "complete_stream", "batch_complete", "classify_email", "classify_email_with_prompts")
+
+SAMPLE_EMAILS = [
+    ("john.smith@gmail.com", "Application for Sales Executive Role",
+     "Dear Hiring Manager, please find attached my CV. I have 5 years experience in B2B sales."),
+    ("hr@techcorp.co.uk", "Feedback on candidate - Sarah Jones",
+     "Thanks for sending Sarah for interview. We would like to proceed to a second interview."),
+    ("support@bullhorn.com", "API Rate Limit Notification",
+     "Your account has exceeded the API rate limit. Please review your integration."),
+    ("manager@proactivepeople.com", "Team meeting tomorrow",
+     "Reminder that the weekly team meeting is at 10am tomorrow in the main office."),
+]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def timed_calls(call: Callable[[int], None], count: int, concurrency: int) -> Tuple[List[float], int, float]:
+    """
+    Run call(0..count-1) from `concurrency` threads
+
+    Returns:
+        (latencies in ms of successful calls, error count, wall-clock seconds)
+    """
+    def one(index: int) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            call(index)
+        except Exception:
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(count)))
+    wall = time.perf_counter() - start
+    latencies = [latency for latency in results if latency is not None]
+    return latencies, len(results) - len(latencies), wall
+
+
+def report(label: str, latencies: List[float], errors: int, wall: float) -> Dict[str, float]:
+    """Print and return one scenario's throughput and latency percentiles"""
+    calls = len(latencies) + errors
+    result = {"calls": calls, "errors": errors, "throughput": calls / wall if wall else 0.0}
+    for name, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        result[name] = percentile(latencies, fraction) if latencies else float("nan")
+    print(
+        f"{label:<30} {calls:>6} {errors:>6} {result['throughput']:>9.1f}/s "
+        f"{result['p50']:>9.1f} {result['p95']:>9.1f} {result['p99']:>9.1f}"
+    )
+    return result
+
+
+def run_scenario(name: str, client: GroqClient, args: argparse.Namespace) -> None:
+    """Benchmark one scenario and print its rows"""
+    config = CompletionConfig(temperature=0.0, max_tokens=args.max_tokens)
+
+    if name == "complete":
+        report(name, *timed_calls(
+            lambda i: client.complete(f"Benchmark request {i}", config=config, use_cache=False),
+            args.requests, args.concurrency
+        ))
+
+    elif name == "complete_stream":
+        first_tokens: List[float] = []
+
+        def stream(i: int):
+            start = time.perf_counter()
+            for index, _ in enumerate(client.complete_stream(f"Benchmark stream {i}", config=config)):
+                if index == 0:
+                    first_tokens.append((time.perf_counter() - start) * 1000)
+
+        latencies, errors, wall = timed_calls(stream, args.requests, args.concurrency)
+        report(name, latencies, errors, wall)
+        report(f"{name} (first token)", first_tokens, 0, wall)
+
+    elif name == "batch_complete":
+        # Latency of an item is from the start of its batch to its result
+        latencies: List[float] = []
+        errors = 0
+        start = time.perf_counter()
+        for offset in range(0, args.requests, args.batch_size):
+            prompts = [f"Benchmark batch item {i}" for i in range(offset, min(args.requests, offset + args.batch_size))]
+            batch_start = time.perf_counter()
+            done: Dict[int, float] = {}
+            results = client.batch_complete(
+                prompts, config=config, max_concurrent=args.concurrency, return_exceptions=True,
+                on_result=lambda index, _: done.setdefault(index, (time.perf_counter() - batch_start) * 1000)
+            )
+            for index, result in enumerate(results):
+                if isinstance(result, Exception):
+                    errors += 1
+                elif index in done:
+                    latencies.append(done[index])
+        report(name, latencies, errors, time.perf_counter() - start)
+
+    elif name == "classify_email":
+        from email_classifier import EmailClassifier
+        classifier = EmailClassifier(client.api_key)
+
+        def classify(i: int):
+            from_email, subject, body = SAMPLE_EMAILS[i % len(SAMPLE_EMAILS)]
+            result = classifier.classify_email(from_email, subject, f"{body} (ref {i})")
+            if result.get("method") == "ai-error":
+                raise RuntimeError(result.get("error"))
+
+        report(name, *timed_calls(classify, args.requests, args.concurrency))
+
+    elif name == "classify_email_with_prompts":
+        from example_email_classification_groq import classify_email_with_prompts
+
+        def classify(i: int):
+            from_email, subject, body = SAMPLE_EMAILS[i % len(SAMPLE_EMAILS)]
+            classify_email_with_prompts(from_email, subject, f"{body} (ref {i})")
+
+        report(name, *timed_calls(classify, args.requests, args.concurrency))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GroqClient throughput against a mock API")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent callers")
+    parser.add_argument("--batch-size", dest="batch_size", type=int, default=50, help="Prompts per batch_complete")
+    parser.add_argument("--max-tokens", dest="max_tokens", type=int, default=200, help="max_tokens per call")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Scenarios to run")
+    parser.add_argument("--base-url", dest="base_url", help="Use an already running mock instead of starting one")
+    parser.add_argument("--journal", help="Journal file or directory for the mock to replay")
+    parser.add_argument("--latency", default="lognormal:200,0.35", help="Mock first-token latency profile")
+    parser.add_argument("--tps", type=float, default=400.0, help="Mock generated tokens per second")
+    parser.add_argument("--rate-429", dest="rate_429", type=float, default=0.0, help="Share of mock 429s")
+    parser.add_argument("--rate-5xx", dest="rate_5xx", type=float, default=0.0, help="Share of mock 5xx")
+    parser.add_argument("--seed", type=int, default=0, help="Mock random seed")
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url is None:
+        server = MockGroqServer(
+            journal=args.journal, latency=LatencyProfile.parse(args.latency, args.tps),
+            error_429=args.rate_429, error_5xx=args.rate_5xx, retry_after=0.5, seed=args.seed
+        ).start()
+        args.base_url = server.url
+    # Clients built inside the classifiers pick these up too
+    os.environ["GROQ_BASE_URL"] = args.base_url
+    os.environ.setdefault("GROQ_API_KEY", "mock")
+
+    client = GroqClient(retry_policy=RetryPolicy(max_delay=2.0))
+    # Per-call INFO logs would dominate the measurements (retries still show)
+    for name in ("groq_client", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    print(f"\nMock API {args.base_url}: {args.requests} calls per scenario, {args.concurrency} concurrent\n")
+    print(f"{'scenario':<30} {'calls':>6} {'errors':>6} {'throughput':>11} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    try:
+        # Keep one-off SDK imports and connection setup out of the numbers
+        client.complete("Warm-up", use_cache=False)
+        client.batch_complete(["Warm-up"])
+        for name in args.scenarios:
+            run_scenario(name, client, args)
+    finally:
+        if server is not None:
+            print(f"\nMock server: {server.stats()}")
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
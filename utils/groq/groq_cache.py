@@ -0,0 +1,264 @@
+"""
+Response cache for the GROQ client
+
+Two tiers: an in-process LRU in front of an optional SQLite file shared by
+processes on the same host.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Tuple, Iterable
+
+from groq_core import CompletionConfig, GroqResponse, request_fingerprint
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+class ResponseCache:
+    """
+    Two-tier response cache: a bounded in-process LRU backed by an optional
+    persistent SQLite store with TTL and size-based eviction.
+
+    Keys are derived from the model, the full message list and every
+    CompletionConfig field, so only byte-identical requests share an entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        db_path: Optional[str] = None,
+        ttl_seconds: Optional[float] = 24 * 60 * 60,
+        max_disk_entries: int = 50_000,
+        max_disk_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Initialize the response cache
+
+        Args:
+            max_entries: Maximum entries held in memory
+            db_path: SQLite file for the persistent tier (None disables it)
+            ttl_seconds: Entry lifetime in seconds (None never expires)
+            max_disk_entries: Maximum rows kept in the SQLite tier
+            max_disk_bytes: Maximum total payload size of the SQLite tier
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.saved_tokens = 0
+        self.saved_latency = 0.0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    latency REAL NOT NULL,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, str]], config: 'CompletionConfig') -> str:
+        """
+        Build a cache key from the request
+
+        Args:
+            messages: Message dictionaries sent to the API
+            config: Completion configuration (includes the model)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        return request_fingerprint(messages, config)
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional['GroqResponse']:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached GroqResponse or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                data, latency, created = entry
+                if self._expired(created, now):
+                    del self._memory[key]
+                else:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return self._hit(data, latency)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT payload, latency, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    payload, latency, created = row
+                    if self._expired(created, now):
+                        self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._db.commit()
+                    else:
+                        self._db.execute(
+                            "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        data = json.loads(payload)
+                        self._remember(key, data, latency, created)
+                        self.disk_hits += 1
+                        return self._hit(data, latency)
+
+            self.misses += 1
+            return None
+
+    def _hit(self, data: Dict[str, Any], latency: float) -> 'GroqResponse':
+        self.hits += 1
+        self.saved_tokens += data["usage"].get("total_tokens", 0)
+        self.saved_latency += latency
+        return GroqResponse.from_dict(data, cached=True)
+
+    def _remember(self, key: str, data: Dict[str, Any], latency: float, created: float):
+        self._memory[key] = (data, latency, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, key: str, response: 'GroqResponse', latency: float = 0.0):
+        """
+        Store a response
+
+        Args:
+            key: Key from make_key
+            response: Response to cache
+            latency: Seconds the upstream call took (reported as saved on hits)
+        """
+        data = response.to_dict()
+        now = time.time()
+        with self._lock:
+            self._remember(key, data, latency, now)
+            if self._db is not None:
+                payload = json.dumps(data, ensure_ascii=False)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, payload, latency, now, now, len(payload))
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    def put_many(self, entries: Iterable[Tuple[str, 'GroqResponse', float, float]]) -> int:
+        """
+        Store many responses in one transaction (e.g. a warm start)
+
+        Args:
+            entries: (key, response, latency, created timestamp) tuples;
+                entries already past the TTL are skipped
+
+        Returns:
+            Number of entries stored
+        """
+        now = time.time()
+        rows = []
+        stored = 0
+        with self._lock:
+            for key, response, latency, created in entries:
+                if self._expired(created, now):
+                    continue
+                stored += 1
+                data = response.to_dict()
+                self._remember(key, data, latency, created)
+                if self._db is not None:
+                    payload = json.dumps(data, ensure_ascii=False)
+                    rows.append((key, payload, latency, created, created, len(payload)))
+            if self._db is not None and rows:
+                self._db.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._evict_disk(now)
+                self._db.commit()
+        return stored
+
+    def _evict_disk(self, now: float):
+        """Drop expired rows, then least recently used rows over the size limits"""
+        if self.ttl_seconds is not None:
+            self._db.execute(
+                "DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,)
+            )
+        count, total = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_disk_entries and total <= self.max_disk_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if count <= self.max_disk_entries and total <= self.max_disk_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self):
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Hit/miss counts plus tokens and seconds saved by hits
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "saved_tokens": self.saved_tokens,
+                "saved_latency_seconds": round(self.saved_latency, 3)
+            }
+
+    def close(self):
+        """Close the SQLite tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
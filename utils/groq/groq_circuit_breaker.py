@@ -0,0 +1,364 @@
+"""
+Circuit breaker and degraded answers for the GROQ client
+
+Stops calling the API after repeated failures and serves lexical fallbacks
+for the tasks that have one until it recovers.
+"""
+
+import re
+import json
+import time
+import threading
+from collections import deque
+from typing import List, Dict, Optional, Union, Any, Callable
+from enum import Enum
+from functools import wraps
+import logging
+
+from groq_core import TaskType
+from groq_metrics import MetricsRegistry
+from groq_retry import is_retryable_error
+
+logger = logging.getLogger("groq_client.circuit_breaker")
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"        # Calls flow normally
+    OPEN = "open"            # Calls fail fast
+    HALF_OPEN = "half_open"  # A few probe calls test whether the API recovered
+
+
+class CircuitOpen(Exception):
+    """A call was refused without being sent because the circuit is open"""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Groq circuit open, next probe in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Stops calling Groq while it is failing.
+
+    Outcomes of the last `window` seconds are tracked; once at least
+    min_calls are recorded and the share of transient failures (5xx, 429,
+    timeouts, connection errors) reaches error_rate, the circuit opens and
+    every call fails fast with CircuitOpen instead of retrying. After
+    open_seconds the circuit lets half_open_probes calls through: a success
+    closes it, a failure re-opens it for twice as long (up to
+    max_open_seconds). Client errors such as 400s are not health signals
+    and are ignored.
+    """
+
+    STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        min_calls: int = 10,
+        window: float = 30.0,
+        open_seconds: float = 15.0,
+        max_open_seconds: float = 300.0,
+        half_open_probes: int = 1,
+        classifier: Callable[[BaseException], bool] = is_retryable_error,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        Initialize the breaker
+
+        Args:
+            error_rate: Failure share that opens the circuit
+            min_calls: Outcomes needed in the window before it can open
+            window: Seconds of outcomes considered
+            open_seconds: First wait before probing
+            max_open_seconds: Cap for the doubling wait after failed probes
+            half_open_probes: Concurrent probe calls while half-open
+            classifier: Decides which errors count as failures
+            metrics: Registry for state changes and fast failures
+                (GroqClient fills in its own when left empty)
+        """
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_probes = half_open_probes
+        self.classifier = classifier
+        self.metrics = metrics
+
+        self.state = CircuitState.CLOSED
+        self._outcomes: deque = deque()
+        self._failures = 0
+        self._open_for = open_seconds
+        self._open_until = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state: CircuitState):
+        if state == self.state:
+            return
+        logger.warning(f"Groq circuit {self.state.value} -> {state.value}")
+        self.state = state
+        if self.metrics is not None:
+            self.metrics.inc("groq_circuit_transitions_total", state=state.value)
+            self.metrics.set_gauge("groq_circuit_state", self.STATE_VALUES[state])
+
+    def _open(self, now: float, backoff: bool = False):
+        self._open_for = min(self.max_open_seconds, self._open_for * 2) if backoff else self.open_seconds
+        self._open_until = now + self._open_for
+        self._outcomes.clear()
+        self._failures = 0
+        self.opened += 1
+        self._transition(CircuitState.OPEN)
+
+    def is_open(self) -> bool:
+        """Whether calls are currently refused outright (no probe is due)"""
+        return self.state == CircuitState.OPEN and time.monotonic() < self._open_until
+
+    def before_call(self) -> bool:
+        """
+        Ask to send a call
+
+        Returns:
+            True if the call is a half-open probe (pass it back to record)
+
+        Raises:
+            CircuitOpen: If the call must not be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CircuitState.OPEN:
+                if now < self._open_until:
+                    self.rejected += 1
+                    raise CircuitOpen(self._open_until - now)
+                self._transition(CircuitState.HALF_OPEN)
+            if self.state == CircuitState.HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    raise CircuitOpen(0.0)
+                self._probes += 1
+                return True
+            return False
+
+    def record(self, probe: bool, error: Optional[BaseException] = None, counted: bool = True):
+        """
+        Report how a call allowed by before_call ended
+
+        Args:
+            probe: Value before_call returned
+            error: Exception the call raised, or None on success
+            counted: False when the outcome says nothing about Groq's health
+                (e.g. the caller's own deadline expired)
+        """
+        failed = counted and error is not None and self.classifier(error)
+        neutral = not counted or (error is not None and not failed)
+        with self._lock:
+            now = time.monotonic()
+            if probe:
+                self._probes -= 1
+                if failed:
+                    self._open(now, backoff=True)
+                elif not neutral:
+                    self._open_for = self.open_seconds
+                    self._transition(CircuitState.CLOSED)
+                return
+            if neutral:
+                return
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            while self._outcomes and self._outcomes[0][0] < now - self.window:
+                self._failures -= self._outcomes.popleft()[1]
+            if (
+                self.state == CircuitState.CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and self._failures / len(self._outcomes) >= self.error_rate
+            ):
+                self._open(now)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get breaker state and counters
+
+        Returns:
+            State, recent error rate, times opened and calls refused
+        """
+        with self._lock:
+            total = len(self._outcomes)
+            return {
+                "state": self.state.value,
+                "recent_calls": total,
+                "recent_error_rate": self._failures / total if total else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "retry_in": max(0.0, self._open_until - time.monotonic()) if self.state == CircuitState.OPEN else 0.0
+            }
+
+
+# ----------------------------------------------------------------------------
+# Local fallbacks: cheap lexical answers used while the circuit is open
+# ----------------------------------------------------------------------------
+
+SKILL_LEXICON = {
+    "technical": [
+        "Python", "Java", "JavaScript", "TypeScript", "C#", "C++", "Go", "Ruby", "PHP", "SQL",
+        "HTML", "CSS", "REST", "GraphQL", "Machine Learning", "Data Analysis", "Data Engineering",
+        "DevOps", "Cloud Computing", "Cyber Security", "Networking", "Software Testing", "Agile", "Scrum"
+    ],
+    "soft_skills": [
+        "Communication", "Leadership", "Teamwork", "Problem Solving", "Time Management",
+        "Stakeholder Management", "Negotiation", "Adaptability", "Attention to Detail",
+        "Customer Service", "Presentation", "Mentoring", "Organisation", "Critical Thinking"
+    ],
+    "domain_knowledge": [
+        "Recruitment", "Finance", "Accounting", "Healthcare", "Logistics", "Sales", "Marketing",
+        "Compliance", "GDPR", "Payroll", "Procurement", "Project Management", "Retail",
+        "Manufacturing", "Insurance", "Banking", "Legal", "Education", "Construction"
+    ],
+    "tools_and_technologies": [
+        "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Git", "Jira", "Confluence",
+        "Excel", "Salesforce", "Bullhorn", "Broadbean", "React", "Angular", "Vue", "Django",
+        "Flask", "Node.js", ".NET", "Spring", "Tableau", "Power BI", "SAP", "Linux", "Supabase"
+    ],
+}
+
+# Skills that are also everyday words ("let's go", "excel at", "in spring")
+# only count when written as the product name; "Golang" also means Go
+_CASE_SENSITIVE_SKILLS = frozenset(("Go", "Excel", "Spring", "Ruby"))
+_SKILL_ALIASES = {"Go": ("Golang",)}
+
+
+def _skill_pattern(skill: str) -> 're.Pattern':
+    name = re.escape(skill)
+    names = [name if skill in _CASE_SENSITIVE_SKILLS else f"(?i:{name})"]
+    names += [f"(?i:{re.escape(alias)})" for alias in _SKILL_ALIASES.get(skill, ())]
+    return re.compile(rf"(?<![\w+#.])(?:{'|'.join(names)})(?![\w+#])")
+
+
+_SKILL_PATTERNS = {
+    category: [(skill, _skill_pattern(skill)) for skill in skills]
+    for category, skills in SKILL_LEXICON.items()
+}
+
+_POSITIVE_WORDS = frozenset((
+    "good great excellent happy pleased delighted impressed strong positive thanks thank "
+    "appreciate love enjoyed keen excited interested perfect helpful brilliant fantastic success"
+).split())
+_NEGATIVE_WORDS = frozenset((
+    "bad poor unhappy disappointed concerned concern issue issues problem problems complaint "
+    "late delay delayed unfortunately weak negative angry frustrated reject rejected fail failed"
+).split())
+
+
+def lexical_extract_skills(text: str, categorize: bool = True) -> Union[List[str], Dict[str, List[str]]]:
+    """
+    Find known skills in text by keyword matching (fallback for extract_skills)
+
+    Args:
+        text: Text to analyze
+        categorize: Group skills as extract_skills does
+
+    Returns:
+        List of skills or categorized dictionary
+    """
+    found = {
+        category: [skill for skill, pattern in patterns if pattern.search(text)]
+        for category, patterns in _SKILL_PATTERNS.items()
+    }
+    if categorize:
+        return found
+    return [skill for skills in found.values() for skill in skills]
+
+
+def lexical_sentiment(text: str, context: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Estimate sentiment from word lists (fallback for analyze_sentiment)
+
+    Args:
+        text: Text to analyze
+        context: Ignored; accepted for signature compatibility
+
+    Returns:
+        Sentiment analysis in the analyze_sentiment format, marked degraded
+    """
+    words = re.findall(r"[a-z']+", text.lower())
+    positive = [word for word in words if word in _POSITIVE_WORDS]
+    negative = [word for word in words if word in _NEGATIVE_WORDS]
+    cues = len(positive) + len(negative)
+    score = (len(positive) - len(negative)) / cues if cues else 0.0
+    if not cues:
+        sentiment = "neutral"
+    elif score > 0.25:
+        sentiment = "positive"
+    elif score < -0.25:
+        sentiment = "negative"
+    else:
+        sentiment = "mixed"
+    themes = list(dict.fromkeys(positive + negative))[:5]
+    return {
+        "sentiment": sentiment,
+        "confidence": min(0.6, 0.3 + 0.05 * cues),
+        "key_themes": themes,
+        "emotional_tone": {"positive": "upbeat", "negative": "concerned"}.get(sentiment, "neutral"),
+        "summary": f"Keyword estimate: {len(positive)} positive and {len(negative)} negative cues",
+        "degraded": True
+    }
+
+
+def lexical_match(
+    candidate_profile: Dict[str, Any],
+    job_description: str,
+    return_score: bool = True
+) -> Dict[str, Any]:
+    """
+    Score a candidate by skill overlap with the job (fallback for match_candidate_to_job)
+
+    Args:
+        candidate_profile: Structured candidate data
+        job_description: Job description text
+        return_score: Accepted for signature compatibility (a score is always returned)
+
+    Returns:
+        Match analysis in the match_candidate_to_job format, marked degraded
+    """
+    required = lexical_extract_skills(job_description, categorize=False)
+    offered = set(lexical_extract_skills(json.dumps(candidate_profile, default=str), categorize=False))
+    strengths = [skill for skill in required if skill in offered]
+    gaps = [skill for skill in required if skill not in offered]
+    score = round(100 * len(strengths) / len(required)) if required else 50
+    return {
+        "match_score": score,
+        "strengths": strengths,
+        "gaps": gaps,
+        "recommendations": ["Re-run the match once AI analysis is available"],
+        "summary": f"Keyword match: {len(strengths)} of {len(required)} required skills found",
+        "degraded": True
+    }
+
+
+DEFAULT_FALLBACKS: Dict[TaskType, Callable[..., Any]] = {
+    TaskType.SKILL_EXTRACTION: lexical_extract_skills,
+    TaskType.SENTIMENT_ANALYSIS: lexical_sentiment,
+    TaskType.JOB_MATCHING: lexical_match,
+}
+
+
+def degrades_to(task: TaskType):
+    """
+    Serve a GroqClient method from the fallback registered for task while
+    the client's circuit is open
+
+    The fallback is called with the method's own arguments.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            return self.with_fallback(task, lambda *a, **k: func(self, *a, **k), *args, **kwargs)
+        return wrapper
+    return decorator
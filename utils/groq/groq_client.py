@@ -10,174 +10,1799 @@ Version: 1.0.0
 """
 
 import os
+import re
 import json
 import time
-from typing import List, Dict, Optional, Union, Any, Generator
-from dataclasses import dataclass, asdict
-from enum import Enum
+import uuid
+import queue
+import threading
+from collections import OrderedDict, deque
+from itertools import chain
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures, FIRST_COMPLETED
+from typing import List, Dict, Optional, Union, Any, Generator, AsyncIterator, Callable, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-import logging
 from functools import wraps
+from contextlib import contextmanager
+import inspect
 import asyncio
+import contextvars
+import logging
+
+if TYPE_CHECKING:
+    from groq import Groq, AsyncGroq
+
+# Each subsystem lives in its own groq_* module; everything is re-exported
+# here so callers keep importing from groq_client.
+from groq_core import (
+    CACHEABLE_TEMPERATURES, CompletionConfig, GroqModel, GroqResponse, Message, RequestPriority, TaskType,
+    Temperature, request_fingerprint, _groq_errors, _groq_sdk, _init_runtime
+)
+from groq_metrics import (
+    LATENCY_BUCKETS, TOKENS_PER_SECOND_BUCKETS, TTFT_BUCKETS, Histogram, MetricsRegistry, current_operation,
+    _current_operation
+)
+from groq_deadlines import (
+    DeadlineExceeded, bounded_wait, check_deadline, deadline, remaining_time, _current_deadline
+)
+from groq_retry import DEFAULT_RETRY_BUDGET, RetryBudget, RetryPolicy, get_retry_after, is_retryable_error
+from groq_cache import ResponseCache
+from groq_journal import RequestJournal, journal_config, read_journal, replay_entry, warm_cache_from_journal
+from groq_rate_limit import (
+    DEFAULT_COMPLETION_RESERVATION, AdaptiveConcurrency, RateLimiter, RateReservation, is_overload_error
+)
+from groq_scheduler import (
+    DEFAULT_PRIORITY_WEIGHTS, PriorityScheduler, SchedulerTicket, current_priority, priority,
+    _current_priority
+)
+from groq_cost import (
+    MODEL_PRICING, Budget, BudgetExceeded, BudgetPolicy, CostGovernor, CostLedger, CostReservation,
+    api_key_label, cost_scope, estimate_cost, _current_session, _current_task
+)
+from groq_registry import CLIENT_REGISTRY, ClientRegistry, get_shared_client
+from groq_key_pool import KeyLease, KeyPool, PooledKey
+from groq_circuit_breaker import (
+    DEFAULT_FALLBACKS, SKILL_LEXICON, CircuitBreaker, CircuitOpen, CircuitState, degrades_to,
+    lexical_extract_skills, lexical_match, lexical_sentiment
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# DECORATORS
+# ============================================================================
+
+def retry_on_error(max_retries: int = 3, delay: float = 1.0):
+    """Retry decorator for API calls (sync or async) using RetryPolicy"""
+    policy = RetryPolicy(max_attempts=max_retries, base_delay=delay)
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await policy.call_async(func, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return policy.call(func, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def log_completion(func):
+    """
+    Logging decorator for completions
+
+    Also tags API calls made inside the method with its name (the outermost
+    decorated method wins) and records its end-to-end latency in the
+    client's metrics registry. Unless the method has parameters of the same
+    name, it accepts a timeout=seconds keyword that bounds everything the
+    call does (see deadline), a priority=RequestPriority keyword for the
+    client's scheduler (see priority) and a session_id keyword for cost
+    budgets (see cost_scope). These keywords are added to the method's
+    published signature, so help() and inspect.signature show them.
+    Generator methods keep the operation name, deadline, priority and
+    session while each item is produced, not between items.
+    """
+    signature = inspect.signature(func)
+    parameters = signature.parameters
+    scope_keywords = [
+        inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=annotation)
+        for name, annotation in (
+            ("timeout", Optional[float]),
+            ("priority", Optional[RequestPriority]),
+            ("session_id", Optional[str]),
+        )
+        if name not in parameters
+    ]
+
+    def publish(wrapper):
+        params = list(parameters.values())
+        at = next((i for i, p in enumerate(params) if p.kind == p.VAR_KEYWORD), len(params))
+        wrapper.__signature__ = signature.replace(parameters=params[:at] + scope_keywords + params[at:])
+        return wrapper
+
+    def start():
+        token = None
+        if _current_operation.get() is None:
+            token = _current_operation.set(func.__name__)
+        logger.info(f"Starting {func.__name__}")
+        return token, time.time()
+
+    def finish(self, token, start_time):
+        elapsed = time.time() - start_time
+        if token is not None:
+            _current_operation.reset(token)
+        metrics = getattr(self, "metrics", None)
+        if metrics is not None:
+            metrics.observe("groq_operation_duration_seconds", elapsed, operation=func.__name__)
+        logger.info(f"Completed {func.__name__} in {elapsed:.2f}s")
+
+    @contextmanager
+    def scope(kwargs):
+        timeout = None if "timeout" in parameters else kwargs.pop("timeout", None)
+        level = None if "priority" in parameters else kwargs.pop("priority", None)
+        session_id = None if "session_id" in parameters else kwargs.pop("session_id", None)
+        with deadline(timeout), priority(level), cost_scope(session_id):
+            yield
+
+    def capture(kwargs) -> Tuple:
+        # Generators run lazily, so fix the operation and call scope now
+        with scope(kwargs):
+            return (
+                (_current_operation, _current_operation.get() or func.__name__),
+                (_current_deadline, _current_deadline.get()),
+                (_current_priority, _current_priority.get()),
+                (_current_session, _current_session.get()),
+                (_current_task, _current_task.get()),
+            )
+
+    def enter(captured):
+        return [(var, var.set(value)) for var, value in captured]
+
+    def leave(tokens):
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+    if inspect.isasyncgenfunction(func):
+        @wraps(func)
+        async def async_gen_wrapper(self, *args, **kwargs):
+            captured = capture(kwargs)
+            logger.info(f"Starting {func.__name__}")
+            start_time = time.time()
+            agen = func(self, *args, **kwargs)
+            try:
+                while True:
+                    tokens = enter(captured)
+                    try:
+                        item = await agen.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        leave(tokens)
+                    yield item
+            finally:
+                tokens = enter(captured)
+                try:
+                    await agen.aclose()
+                finally:
+                    leave(tokens)
+                    finish(self, None, start_time)
+        return publish(async_gen_wrapper)
+
+    if inspect.isgeneratorfunction(func):
+        @wraps(func)
+        def gen_wrapper(self, *args, **kwargs):
+            captured = capture(kwargs)
+            logger.info(f"Starting {func.__name__}")
+            start_time = time.time()
+            gen = func(self, *args, **kwargs)
+            try:
+                while True:
+                    tokens = enter(captured)
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        break
+                    finally:
+                        leave(tokens)
+                    yield item
+            finally:
+                tokens = enter(captured)
+                try:
+                    gen.close()
+                finally:
+                    leave(tokens)
+                    finish(self, None, start_time)
+        return publish(gen_wrapper)
+
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            with scope(kwargs):
+                token, start_time = start()
+                try:
+                    return await func(self, *args, **kwargs)
+                finally:
+                    finish(self, token, start_time)
+        return publish(async_wrapper)
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with scope(kwargs):
+            token, start_time = start()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                finish(self, token, start_time)
+    return publish(wrapper)
+
+
+# ============================================================================
+# REQUEST DEDUPLICATION
+# ============================================================================
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests into one upstream call.
+
+    The first caller for a key becomes the leader and performs the call;
+    callers arriving while it is in flight wait for the same result (or
+    exception). Works for threads (do) and for asyncio tasks (do_async).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._async_inflight: Dict[tuple, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn):
+        """
+        Run fn once per key across concurrent threads
+
+        Args:
+            key: Request fingerprint
+            fn: Zero-argument callable performing the request
+
+        Returns:
+            The leader's result
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # A follower stops waiting at its own deadline; the leader carries on
+            try:
+                return future.result(timeout=remaining_time())
+            except TimeoutError as e:
+                if future.done():
+                    # The leader finished as the wait ran out; use its outcome
+                    return future.result()
+                raise DeadlineExceeded("Deadline exceeded waiting for the response") from e
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def do_async(self, key: str, coro_fn):
+        """
+        Await coro_fn() once per key across concurrent tasks on the same loop
+
+        The upstream call runs in its own task, so cancelling one waiter
+        does not cancel the request for the others.
+
+        Args:
+            key: Request fingerprint
+            coro_fn: Zero-argument callable returning a coroutine
+
+        Returns:
+            The shared result
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._async_inflight.get(flight_key)
+            if task is None:
+                task = asyncio.ensure_future(coro_fn())
+                self._async_inflight[flight_key] = task
+                task.add_done_callback(lambda _: self._forget(flight_key))
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        remaining = remaining_time()
+        if remaining is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), remaining)
+        except asyncio.TimeoutError as e:
+            if task.done():
+                # The request finished as the wait ran out; use its outcome
+                return task.result()
+            raise DeadlineExceeded("Deadline exceeded waiting for the response") from e
+
+    def _forget(self, flight_key: tuple):
+        with self._lock:
+            self._async_inflight.pop(flight_key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters
+
+        Returns:
+            Upstream calls made (leaders) and requests that piggybacked
+        """
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight) + len(self._async_inflight)
+            }
+
+
+# ============================================================================
+# HEDGED REQUESTS
+# ============================================================================
+
+class HedgePolicy:
+    """
+    Decides when to fire a duplicate ("hedge") of a slow request.
+
+    Latencies of recent successful calls are kept per model; once enough
+    samples exist, a request still running after the configured percentile
+    gets one duplicate and the first successful response wins. Hedges are
+    capped at a fraction of all requests so the extra spend stays bounded;
+    tokens billed for losing requests that still completed are counted in
+    stats()["extra_tokens"].
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        min_delay: float = 0.25,
+        max_extra_fraction: float = 0.05,
+        window: int = 200
+    ):
+        """
+        Initialize the hedge policy
+
+        Args:
+            percentile: Latency percentile after which a hedge is fired
+            min_samples: Samples needed per model before hedging starts
+            min_delay: Never hedge earlier than this many seconds
+            max_extra_fraction: Maximum hedges as a fraction of requests
+            window: Recent latencies kept per model
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_extra_fraction = max_extra_fraction
+        self.window = window
+
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.skipped = 0
+        self.extra_tokens = 0
+
+    def observe(self, model: str, latency: float):
+        """
+        Record the latency of a successful call
+
+        Args:
+            model: Model name
+            latency: Seconds the call took
+        """
+        with self._lock:
+            samples = self._latencies.get(model)
+            if samples is None:
+                samples = self._latencies[model] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """
+        Seconds to wait before hedging a request for a model
+
+        Args:
+            model: Model name
+
+        Returns:
+            Delay, or None while there are too few samples
+        """
+        with self._lock:
+            self.requests += 1
+            samples = self._latencies.get(model)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile))
+            return max(self.min_delay, ordered[index])
+
+    def allow_hedge(self) -> bool:
+        """
+        Check the extra-spend cap and count the hedge if allowed
+
+        Returns:
+            True if a hedge may be fired now
+        """
+        with self._lock:
+            if self.hedges + 1 > self.requests * self.max_extra_fraction:
+                self.skipped += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def skip(self):
+        """Count a hedge that was wanted but not fired (e.g. rate limited)"""
+        with self._lock:
+            self.skipped += 1
+
+    def record_outcome(self, hedge_won: bool):
+        """
+        Record which request of a hedged pair won
+
+        Args:
+            hedge_won: True if the duplicate answered first
+        """
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def record_loser(self, future: Union[Future, asyncio.Future]):
+        """
+        Done-callback for the losing request of a hedged pair
+
+        Counts the tokens of a loser that completed anyway (a cancelled or
+        failed one is not billed for a completion).
+
+        Args:
+            future: Future or task of the losing request
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        tokens = future.result().usage.get("total_tokens", 0)
+        with self._lock:
+            self.extra_tokens += tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hedging counters
+
+        Returns:
+            Requests seen, hedges fired and won, and skipped hedges
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "skipped": self.skipped,
+                "extra_tokens": self.extra_tokens,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0
+            }
+
+
+# ============================================================================
+# TOKEN COUNTING
+# ============================================================================
+
+# Directory holding Hugging Face tokenizer.json files, one per model family
+# (llama3.json, mixtral.json, gemma.json). Files are only ever read locally.
+TOKENIZER_DIR = os.getenv(
+    "GROQ_TOKENIZER_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tokenizers")
+)
+
+# Chat-template tokens added around every message (role header + end of turn)
+MESSAGE_OVERHEAD_TOKENS = {"llama3": 4, "mixtral": 4, "gemma": 5}
+
+# Pre-tokenizer patterns used when no vocabulary file is available. Llama 3
+# uses the tiktoken split (digits in groups of up to 3); the SentencePiece
+# families split every digit and attach leading spaces to words.
+_PRETOKENIZE_PATTERNS = {
+    "llama3": re.compile(
+        r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\w]?[^\W\d_]+|\d{1,3}| ?[^\s\w]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+    ),
+    "sentencepiece": re.compile(
+        r""" ?[^\W\d_]+|\d| ?[^\s\w]|\n|[ \t]+(?=[ \t])|[ \t]+$"""
+    ),
+}
+
+# Average characters per sub-word token for long words, by vocabulary size
+_CHARS_PER_SUBWORD = {"llama3": 6, "mixtral": 4, "gemma": 6}
+
+
+class TokenCounter:
+    """
+    Token counter for the GroqModel families.
+
+    Uses the real tokenizer when a tokenizer.json for the model family is
+    present in TOKENIZER_DIR and the optional `tokenizers` package is
+    installed; otherwise falls back to the family's pre-tokenizer split with
+    a sub-word estimate, which tracks punctuation-heavy CSV/JSON/SQL text far
+    better than a flat characters-per-token ratio. Counts are memoized per
+    segment, so repeated system prompts are only tokenized once.
+    """
+
+    def __init__(self, tokenizer_dir: str = TOKENIZER_DIR, cache_size: int = 4096):
+        """
+        Initialize the token counter
+
+        Args:
+            tokenizer_dir: Directory with <family>.json tokenizer files
+            cache_size: Number of segment counts memoized
+        """
+        self.tokenizer_dir = tokenizer_dir
+        self.cache_size = cache_size
+        self._tokenizers: Dict[str, Any] = {}
+        self._cache: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def family(model: str) -> str:
+        """
+        Map a model name to its tokenizer family
+
+        Args:
+            model: Model name (GroqModel value)
+
+        Returns:
+            'llama3', 'mixtral' or 'gemma'
+        """
+        if model.startswith("gemma"):
+            return "gemma"
+        if model.startswith("mixtral"):
+            return "mixtral"
+        return "llama3"
+
+    def _tokenizer(self, family: str):
+        """Load the family's vocabulary once; None when unavailable"""
+        if family not in self._tokenizers:
+            tokenizer = None
+            path = os.path.join(self.tokenizer_dir, f"{family}.json")
+            if os.path.exists(path):
+                try:
+                    from tokenizers import Tokenizer as HFTokenizer
+                    tokenizer = HFTokenizer.from_file(path)
+                except ImportError:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to load tokenizer {path}: {str(e)}")
+            self._tokenizers[family] = tokenizer
+        return self._tokenizers[family]
+
+    def _estimate(self, family: str, text: str) -> int:
+        """Estimate tokens from the pre-tokenizer split"""
+        pattern = _PRETOKENIZE_PATTERNS["llama3" if family == "llama3" else "sentencepiece"]
+        chars_per_subword = _CHARS_PER_SUBWORD[family]
+        total = 0
+        for piece in pattern.findall(text):
+            stripped = piece.strip()
+            if not stripped:
+                total += 1
+            elif stripped[-1].isalpha():
+                total += 1 + (len(stripped) - 1) // chars_per_subword
+            elif stripped.isdigit():
+                # The pattern already splits digits into single tokens
+                total += 1
+            else:
+                # Punctuation runs merge into roughly two-character tokens
+                total += (len(stripped) + 1) // 2
+        return total
+
+    def _count_uncached(self, family: str, text: str) -> int:
+        tokenizer = self._tokenizer(family)
+        if tokenizer is not None:
+            return len(tokenizer.encode(text, add_special_tokens=False).ids)
+        return self._estimate(family, text)
+
+    def count(self, text: str, model: str = GroqModel.DEFAULT.value) -> int:
+        """
+        Count tokens in a text segment
+
+        Args:
+            text: Text to count
+            model: Model whose tokenizer applies
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        key = (self.family(model), text)
+        with self._lock:
+            count = self._cache.get(key)
+            if count is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return count
+            self.cache_misses += 1
+
+        count = self._count_uncached(key[0], text)
+        with self._lock:
+            self._cache[key] = count
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def count_batch(self, texts: List[str], model: str = GroqModel.DEFAULT.value) -> List[int]:
+        """
+        Count tokens for many texts (e.g. thousands of CSV records)
+
+        Args:
+            texts: Texts to count
+            model: Model whose tokenizer applies
+
+        Returns:
+            Token counts in input order
+        """
+        family = self.family(model)
+        tokenizer = self._tokenizer(family)
+        if tokenizer is None:
+            return [self.count(text, model) for text in texts]
+        encodings = tokenizer.encode_batch(list(texts), add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+    def count_messages(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = GroqModel.DEFAULT.value
+    ) -> int:
+        """
+        Count the prompt tokens of a chat request
+
+        Args:
+            messages: Message dictionaries sent to the API
+            model: Model whose tokenizer applies
+
+        Returns:
+            Token count including chat-template overhead
+        """
+        overhead = MESSAGE_OVERHEAD_TOKENS[self.family(model)]
+        return sum(self.count(m["content"], model) + overhead for m in messages)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get memoization counters
+
+        Returns:
+            Cache hits/misses and which families have a real vocabulary
+        """
+        with self._lock:
+            return {
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "cached_segments": len(self._cache),
+                "vocabularies": sorted(f for f, t in self._tokenizers.items() if t is not None)
+            }
+
+
+# Shared counter used by GroqClient and ConversationStore
+TOKEN_COUNTER = TokenCounter()
+
+
+def count_tokens(text: str, model: str = GroqModel.DEFAULT.value) -> int:
+    """
+    Count tokens with the shared TokenCounter
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer applies
+
+    Returns:
+        Token count
+    """
+    return TOKEN_COUNTER.count(text, model)
+
+
+# ============================================================================
+# CONVERSATION STORE
+# ============================================================================
+
+@dataclass
+class ConversationSession:
+    """History kept for one conversation"""
+    messages: List[Message]
+    tokens: int = 0
+    summary: Optional[str] = None
+    last_used: float = 0.0
+    compacting: bool = False
+
+
+class ConversationStore:
+    """
+    Bounded conversation history for GroqClient.
+
+    Each session keeps a sliding window of turns within a token budget.
+    Turns pushed out of the window are dropped or, when compaction is on,
+    folded into a running summary in a background thread. Idle sessions
+    expire after a TTL, and the least recently used sessions are evicted
+    when the session count or total token cap is exceeded.
+
+    Subclass and override history/append/clear to back it with another store.
+    """
+
+    def __init__(
+        self,
+        max_tokens_per_session: int = 4000,
+        max_messages_per_session: Optional[int] = 40,
+        max_sessions: int = 1000,
+        idle_ttl: Optional[float] = 60 * 60,
+        max_total_tokens: int = 2_000_000,
+        compact: bool = False,
+        summarizer: Optional[Callable[[Optional[str], List[Message]], str]] = None,
+        token_counter: Callable[[str], int] = count_tokens
+    ):
+        """
+        Initialize the conversation store
+
+        Args:
+            max_tokens_per_session: History token budget per session
+            max_messages_per_session: Sliding window size in messages (None: tokens only)
+            max_sessions: Sessions kept before evicting the least recently used
+            idle_ttl: Seconds of inactivity before a session expires (None: never)
+            max_total_tokens: Token cap across all sessions
+            compact: Summarize turns that leave the window instead of dropping them
+            summarizer: Callable(previous_summary, messages) -> summary; GroqClient
+                supplies one when compact is set and none is given
+            token_counter: Function used to count message tokens
+        """
+        self.max_tokens_per_session = max_tokens_per_session
+        self.max_messages_per_session = max_messages_per_session
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_total_tokens = max_total_tokens
+        self.compact = compact
+        self.summarizer = summarizer
+        self.token_counter = token_counter
+
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._total_tokens = 0
+        self._lock = threading.RLock()
+        self._compactor: Optional[ThreadPoolExecutor] = None
+
+        self.evicted_sessions = 0
+        self.trimmed_messages = 0
+        self.compactions = 0
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            self._expire(time.time())
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def __getitem__(self, session_id: str) -> List[Message]:
+        if session_id not in self:
+            raise KeyError(session_id)
+        return self.history(session_id)
+
+    def history(self, session_id: str) -> List[Message]:
+        """
+        Get the messages to send for a session
+
+        Args:
+            session_id: Conversation ID
+
+        Returns:
+            Summary message (if any) followed by the current window
+        """
+        with self._lock:
+            self._expire(time.time())
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            session.last_used = time.time()
+            history = list(session.messages)
+            if session.summary:
+                history.insert(0, Message(
+                    role="system",
+                    content=f"Summary of the earlier conversation: {session.summary}"
+                ))
+            return history
+
+    def append(self, session_id: str, messages: List[Message]):
+        """
+        Add messages to a session, then enforce the window and memory caps
+
+        Args:
+            session_id: Conversation ID
+            messages: Messages to append (usually a user/assistant pair)
+        """
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = ConversationSession(messages=[])
+            self._sessions.move_to_end(session_id)
+            session.last_used = now
+
+            for message in messages:
+                tokens = self.token_counter(message.content)
+                session.messages.append(message)
+                session.tokens += tokens
+                self._total_tokens += tokens
+
+            self._trim(session_id, session)
+            while self._sessions and (
+                len(self._sessions) > self.max_sessions
+                or self._total_tokens > self.max_total_tokens
+            ):
+                oldest = next(iter(self._sessions))
+                if oldest == session_id and len(self._sessions) == 1:
+                    break
+                self._drop(oldest)
+                self.evicted_sessions += 1
+
+    def clear(self, session_id: str) -> bool:
+        """
+        Remove a session
+
+        Args:
+            session_id: Conversation ID
+
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._drop(session_id)
+            return True
+
+    def _drop(self, session_id: str):
+        session = self._sessions.pop(session_id)
+        self._total_tokens -= session.tokens
+
+    def _expire(self, now: float):
+        """Remove sessions idle for longer than the TTL (oldest first)"""
+        if self.idle_ttl is None:
+            return
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used <= self.idle_ttl:
+                break
+            self._drop(session_id)
+            self.evicted_sessions += 1
+
+    def _trim(self, session_id: str, session: ConversationSession):
+        """Slide the window forward until the session fits its budget"""
+        evicted: List[Message] = []
+        while len(session.messages) > 2 and (
+            session.tokens > self.max_tokens_per_session
+            or (self.max_messages_per_session is not None
+                and len(session.messages) > self.max_messages_per_session)
+        ):
+            # Drop whole user/assistant turns to keep roles alternating
+            for message in session.messages[:2]:
+                tokens = self.token_counter(message.content)
+                session.tokens -= tokens
+                self._total_tokens -= tokens
+                evicted.append(message)
+            del session.messages[:2]
+
+        if not evicted:
+            return
+        self.trimmed_messages += len(evicted)
+        if self.compact and self.summarizer is not None:
+            if self._compactor is None:
+                self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="groq-compact")
+            self._compactor.submit(self._summarize, session_id, session, evicted)
+
+    def _summarize(self, session_id: str, session: ConversationSession, evicted: List[Message]):
+        """Fold evicted turns into the session summary (runs in the background)"""
+        try:
+            summary = self.summarizer(session.summary, evicted)
+        except Exception as e:
+            logger.warning(f"Conversation compaction failed for {session_id}: {str(e)}")
+            return
+        with self._lock:
+            if self._sessions.get(session_id) is session:
+                session.summary = summary
+                self.compactions += 1
+
+    def sessions(self) -> List[str]:
+        """
+        List live session IDs
+
+        Returns:
+            Session IDs, least recently used first
+        """
+        with self._lock:
+            self._expire(time.time())
+            return list(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get store counters
+
+        Returns:
+            Session/message/token totals and eviction counts
+        """
+        with self._lock:
+            return {
+                "total_conversations": len(self._sessions),
+                "total_messages": sum(len(s.messages) for s in self._sessions.values()),
+                "total_tokens": self._total_tokens,
+                "evicted_sessions": self.evicted_sessions,
+                "trimmed_messages": self.trimmed_messages,
+                "compactions": self.compactions
+            }
+
+
+# ============================================================================
+# STREAMING JSON
+# ============================================================================
+
+class StreamingJSONParser:
+    """
+    Incremental parser for a streamed top-level JSON object or array.
+
+    Feed it content chunks as they arrive; each call returns the members
+    that closed in that chunk: (key, value) for an object, (index, item)
+    for an array. Text before the first '{' or '[' (e.g. a markdown fence)
+    is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.container: Optional[str] = None
+        self.done = False
+        self.start = None
+        self.end = None
+        self.errors = 0
+        self.result: Union[Dict[str, Any], List[Any], None] = None
+
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = 0
+        self._index = 0
+
+    def feed(self, chunk: str) -> List[Tuple[Union[str, int], Any]]:
+        """
+        Add a chunk of streamed content
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Members completed by this chunk
+        """
+        completed: List[Tuple[Union[str, int], Any]] = []
+        if self.done:
+            return completed
+        self.buffer += chunk
+        buffer = self.buffer
+
+        for i in range(self._pos, len(buffer)):
+            c = buffer[i]
+            if self.container is None:
+                if c in "{[":
+                    self.container = c
+                    self.start = i
+                    self.result = {} if c == "{" else []
+                    self._depth = 1
+                    self._member_start = i + 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buffer[self._member_start:i], completed)
+                    self.done = True
+                    self.end = i + 1
+                    break
+            elif c == "," and self._depth == 1:
+                self._emit(buffer[self._member_start:i], completed)
+                self._member_start = i + 1
+
+        self._pos = len(buffer) if not self.done else self.end
+        return completed
+
+    def _emit(self, text: str, completed: List[Tuple[Union[str, int], Any]]):
+        text = text.strip()
+        if not text:
+            return
+        try:
+            if self.container == "{":
+                for key, value in json.loads("{" + text + "}").items():
+                    self.result[key] = value
+                    completed.append((key, value))
+            else:
+                value = json.loads(text)
+                self.result.append(value)
+                completed.append((self._index, value))
+                self._index += 1
+        except json.JSONDecodeError:
+            self.errors += 1
+            logger.warning(f"Skipping malformed streamed JSON member: {text[:80]}")
+
+    @property
+    def text(self) -> str:
+        """The complete top-level JSON text once done, else everything received"""
+        return self.buffer[:self.end] if self.done else self.buffer
+
+
+# ============================================================================
+# STRUCTURED OUTPUT
+# ============================================================================
+
+_STRING_ARRAY = {"type": "array", "items": {"type": "string"}}
+
+CV_SCHEMA = {
+    "type": "object",
+    "required": ["personal_info", "skills", "experience", "education",
+                 "summary", "languages", "certifications"],
+    "properties": {
+        "personal_info": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": ["string", "null"]},
+                "email": {"type": ["string", "null"]},
+                "phone": {"type": ["string", "null"]},
+                "location": {"type": ["string", "null"]}
+            }
+        },
+        "skills": {"type": "array"},
+        "experience": {"type": "array", "items": {"type": "object"}},
+        "education": {"type": "array", "items": {"type": "object"}},
+        "summary": {"type": ["string", "null"]},
+        "languages": {"type": "array"},
+        "certifications": {"type": "array"}
+    }
+}
+
+MATCH_SCHEMA = {
+    "type": "object",
+    "required": ["match_score", "strengths", "gaps", "recommendations", "summary"],
+    "properties": {
+        "match_score": {"type": "number", "minimum": 0, "maximum": 100},
+        "strengths": _STRING_ARRAY,
+        "gaps": _STRING_ARRAY,
+        "recommendations": _STRING_ARRAY,
+        "summary": {"type": "string"}
+    }
+}
+
+INTERVIEW_QUESTIONS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": ["question", "category"],
+        "properties": {
+            "question": {"type": "string"},
+            "category": {"enum": ["technical", "behavioral", "situational"]},
+            "skill_assessed": {"type": "string"}
+        }
+    }
+}
+
+SKILLS_SCHEMA = {
+    "type": "object",
+    "required": ["technical", "soft_skills", "domain_knowledge", "tools_and_technologies"],
+    "properties": {
+        "technical": _STRING_ARRAY,
+        "soft_skills": _STRING_ARRAY,
+        "domain_knowledge": _STRING_ARRAY,
+        "tools_and_technologies": _STRING_ARRAY
+    }
+}
+
+SKILLS_LIST_SCHEMA = _STRING_ARRAY
+
+SENTIMENT_SCHEMA = {
+    "type": "object",
+    "required": ["sentiment", "confidence", "key_themes", "emotional_tone", "summary"],
+    "properties": {
+        "sentiment": {"enum": ["positive", "negative", "neutral", "mixed"]},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "key_themes": _STRING_ARRAY,
+        "emotional_tone": {"type": "string"},
+        "summary": {"type": "string"}
+    }
+}
+
+EMAIL_CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "required": ["category", "confidence"],
+    "properties": {
+        "category": {"enum": ["candidate", "client", "supplier", "staff", "other"]},
+        "subcategory": {"type": "string"},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "priority": {"enum": ["urgent", "high", "normal", "low"]},
+        "sentiment": {"enum": ["positive", "neutral", "negative", "mixed"]},
+        "keywords": _STRING_ARRAY,
+        "requires_action": {"type": "boolean"},
+        "suggested_actions": _STRING_ARRAY,
+        "reasoning": {"type": "string"}
+    }
+}
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], List[Tuple[Tuple, str]]]:
+    """
+    Compile a JSON Schema subset into a validator function
+
+    Supports type, enum, properties, required, items, minimum and maximum,
+    which covers the recruitment schemas above. Compiling once up front
+    keeps per-response validation to plain function calls.
+
+    Args:
+        schema: Schema dictionary
+
+    Returns:
+        validate(value) -> list of (path, message) errors
+    """
+    checks: List[Callable[[Any, Tuple], List[Tuple[Tuple, str]]]] = []
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        allowed = tuple(t for name in names for t in (
+            _JSON_TYPES[name] if isinstance(_JSON_TYPES[name], tuple) else (_JSON_TYPES[name],)
+        ))
+        excludes_bool = "boolean" not in names
+
+        def check_type(value, path):
+            if not isinstance(value, allowed) or (excludes_bool and isinstance(value, bool)):
+                return [(path, f"expected {' or '.join(names)}")]
+            return []
+        checks.append(check_type)
+
+    if "enum" in schema:
+        options = list(schema["enum"])
+
+        def check_enum(value, path):
+            return [] if value in options else [(path, f"must be one of {options}")]
+        checks.append(check_enum)
+
+    if "minimum" in schema or "maximum" in schema:
+        low, high = schema.get("minimum"), schema.get("maximum")
+
+        def check_range(value, path):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return []
+            if (low is not None and value < low) or (high is not None and value > high):
+                return [(path, f"must be between {low} and {high}")]
+            return []
+        checks.append(check_range)
+
+    if "required" in schema or "properties" in schema:
+        required = list(schema.get("required", []))
+        properties = {k: compile_schema(v) for k, v in schema.get("properties", {}).items()}
+
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return []
+            errors = [(path + (key,), "missing") for key in required if key not in value]
+            for key, validate in properties.items():
+                if key in value:
+                    errors.extend(validate(value[key], path + (key,)))
+            return errors
+        checks.append(check_object)
+
+    if "items" in schema:
+        validate_item = compile_schema(schema["items"])
+
+        def check_items(value, path):
+            if not isinstance(value, list):
+                return []
+            errors = []
+            for index, item in enumerate(value):
+                errors.extend(validate_item(item, path + (index,)))
+            return errors
+        checks.append(check_items)
+
+    def validate(value: Any, path: Tuple = ()) -> List[Tuple[Tuple, str]]:
+        errors = []
+        for check in checks:
+            errors.extend(check(value, path))
+            if errors:
+                break
+        return errors
+
+    return validate
+
+
+# Compiled validators keyed on the schema's content, so temporary schema
+# dicts neither grow the cache nor reuse a freed dict's validator
+_compiled_schemas: "OrderedDict[str, Callable]" = OrderedDict()
+_compiled_schemas_lock = threading.Lock()
+MAX_COMPILED_SCHEMAS = 256
+
+
+def get_validator(schema: Dict[str, Any]) -> Callable[[Any], List[Tuple[Tuple, str]]]:
+    """
+    Get the compiled validator for a schema (compiled once per distinct schema)
+
+    Args:
+        schema: Schema dictionary
+
+    Returns:
+        Validator function from compile_schema
+    """
+    key = json.dumps(schema, sort_keys=True, default=str)
+    with _compiled_schemas_lock:
+        validator = _compiled_schemas.get(key)
+        if validator is not None:
+            _compiled_schemas.move_to_end(key)
+            return validator
+    validator = compile_schema(schema)
+    with _compiled_schemas_lock:
+        _compiled_schemas[key] = validator
+        while len(_compiled_schemas) > MAX_COMPILED_SCHEMAS:
+            _compiled_schemas.popitem(last=False)
+    return validator
+
+
+def salvage_json(text: str) -> Any:
+    """
+    Parse a JSON answer, keeping whatever completed if it is malformed
+
+    Args:
+        text: Raw model output (may include markdown fences or be truncated)
+
+    Returns:
+        Parsed value; for broken output, the top-level members that closed
+        cleanly (or None if nothing could be recovered)
+    """
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    if parser.done:
+        try:
+            return json.loads(parser.text[parser.start:])
+        except json.JSONDecodeError:
+            pass
+    return parser.result
+
+
+# ============================================================================
+# MODEL ROUTING
+# ============================================================================
+
+# Models tried per task, cheapest first. Tasks with a single entry have no
+# cheaper model that is adequate for them.
+DEFAULT_ROUTES: Dict[TaskType, Tuple[str, ...]] = {
+    TaskType.SENTIMENT_ANALYSIS: (GroqModel.GEMMA2_9B.value, GroqModel.DEFAULT.value),
+    TaskType.SKILL_EXTRACTION: (GroqModel.GEMMA2_9B.value, GroqModel.DEFAULT.value),
+    TaskType.CANDIDATE_SUMMARY: (GroqModel.GEMMA2_9B.value, GroqModel.DEFAULT.value),
+    TaskType.INTERVIEW_QUESTIONS: (GroqModel.GEMMA2_9B.value, GroqModel.DEFAULT.value),
+    TaskType.CV_PARSING: (GroqModel.GEMMA2_9B.value, GroqModel.DEFAULT.value),
+    TaskType.EMAIL_CLASSIFICATION: (GroqModel.GEMMA2_9B.value, GroqModel.DEFAULT.value),
+    TaskType.JOB_MATCHING: (GroqModel.DEFAULT.value,),
+    TaskType.JOB_DESCRIPTION: (GroqModel.DEFAULT.value,),
+    TaskType.EMAIL_GENERATION: (GroqModel.DEFAULT.value,),
+    TaskType.GENERAL: (GroqModel.DEFAULT.value,),
+}
+
+
+@dataclass
+class RouteDecision:
+    """One tier attempt made by the model router"""
+    task: str
+    model: str
+    tier: int
+    latency: float
+    escalation_reason: Optional[str] = None
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+class ModelRouter:
+    """
+    Cheap-first model cascade keyed on TaskType.
+
+    Each task starts on the cheapest model in its route. The answer moves up
+    to the next tier only if it fails validation or reports a confidence
+    below the threshold. Every tier attempt is recorded so the routes and
+    threshold can be tuned from real escalation rates and latencies.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[TaskType, Tuple[str, ...]]] = None,
+        confidence_threshold: float = 0.6,
+        history: int = 500
+    ):
+        """
+        Initialize the router
+
+        Args:
+            routes: Per-task model lists overriding DEFAULT_ROUTES
+            confidence_threshold: Escalate answers whose "confidence" is lower
+            history: Recent routing decisions kept for inspection
+        """
+        self.routes = dict(DEFAULT_ROUTES)
+        if routes:
+            self.routes.update(routes)
+        self.confidence_threshold = confidence_threshold
+        self.decisions: deque = deque(maxlen=history)
+
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._escalations: Dict[Tuple[str, str], int] = {}
+        self._tier_latency: Dict[Tuple[str, str], List[float]] = {}
+
+    def tiers(self, task: TaskType) -> Tuple[str, ...]:
+        """Models to try for a task, cheapest first"""
+        return self.routes.get(task) or (GroqModel.DEFAULT.value,)
+
+    def escalation_reason(self, data: Any, errors: List[Tuple[Tuple, str]]) -> Optional[str]:
+        """
+        Decide whether an answer should be retried on a stronger model
+
+        Args:
+            data: Parsed answer (or raw text for free-form tasks)
+            errors: Validation errors for the answer
+
+        Returns:
+            "invalid", "low_confidence", or None to accept the answer
+        """
+        if errors:
+            return "invalid"
+        confidence = data.get("confidence") if isinstance(data, dict) else None
+        if (
+            isinstance(confidence, (int, float))
+            and not isinstance(confidence, bool)
+            and confidence < self.confidence_threshold
+        ):
+            return "low_confidence"
+        return None
+
+    def record(
+        self,
+        task: TaskType,
+        model: str,
+        tier: int,
+        latency: float,
+        escalation_reason: Optional[str] = None
+    ):
+        """Record one tier attempt"""
+        with self._lock:
+            self.decisions.append(
+                RouteDecision(task.value, model, tier, latency, escalation_reason)
+            )
+            if tier == 0:
+                self._calls[task.value] = self._calls.get(task.value, 0) + 1
+            if escalation_reason:
+                key = (task.value, escalation_reason)
+                self._escalations[key] = self._escalations.get(key, 0) + 1
+            totals = self._tier_latency.setdefault((task.value, model), [0, 0.0])
+            totals[0] += 1
+            totals[1] += latency
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, escalation rates and per-tier latency for each task"""
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for task, calls in self._calls.items():
+                reasons = {
+                    reason: count
+                    for (name, reason), count in self._escalations.items()
+                    if name == task
+                }
+                escalations = sum(reasons.values())
+                result[task] = {
+                    "calls": calls,
+                    "escalations": escalations,
+                    "escalation_rate": round(escalations / calls, 4) if calls else 0.0,
+                    "reasons": reasons,
+                    "tiers": {
+                        model: {
+                            "calls": count,
+                            "avg_latency": round(total / count, 4) if count else 0.0
+                        }
+                        for (name, model), (count, total) in self._tier_latency.items()
+                        if name == task
+                    }
+                }
+            return result
+
+
+# ============================================================================
+# PROMPT PACKING
+# ============================================================================
 
-try:
-    from groq import Groq, AsyncGroq
-    from groq.types.chat import ChatCompletion, ChatCompletionMessage
-except ImportError:
-    raise ImportError("Please install groq: pip install groq")
+# Upper bound on max_tokens for one packed request
+MAX_PACK_TOKENS = 8000
 
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+def pack_prompt(instruction: str, result_format: str, items: List[str]) -> str:
+    """
+    Combine several small tasks into one prompt with indexed sections
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+    Args:
+        instruction: What to do with each item
+        result_format: Expected shape of one item's result
+        items: Item texts, answered in order
 
+    Returns:
+        Packed user prompt asking for a JSON array of indexed results
+    """
+    sections = "\n\n".join(
+        f"### ITEM {index}\n{item}" for index, item in enumerate(items)
+    )
+    return f"""{instruction}
 
-# ============================================================================
-# ENUMS AND CONSTANTS
-# ============================================================================
+There are {len(items)} independent items below, each under a "### ITEM <index>" heading.
+Handle each item on its own. Return ONLY a JSON array with one element per item:
+[{{"index": <item index>, "result": <result for that item>}}, ...]
 
-class GroqModel(Enum):
-    """Available GROQ models"""
-    # Fast models (good for quick operations)
-    LLAMA_3_8B = "llama-3.3-70b-versatile"
-    LLAMA_3_70B = "llama-3.1-70b-versatile"
+Each result must have this format:
+{result_format}
 
-    # Specialized models
-    MIXTRAL_8X7B = "mixtral-8x7b-32768"
-    GEMMA_7B = "gemma-7b-it"
-    GEMMA2_9B = "gemma2-9b-it"
+{sections}"""
 
-    # Default recommended model
-    DEFAULT = "llama-3.3-70b-versatile"
 
+def unpack_results(
+    text: str,
+    count: int,
+    validate: Callable[[Any], List[Tuple[Tuple, str]]]
+) -> Dict[int, Any]:
+    """
+    Split a packed answer back into per-item results
 
-class Temperature(Enum):
-    """Common temperature settings"""
-    DETERMINISTIC = 0.0
-    CONSERVATIVE = 0.3
-    BALANCED = 0.7
-    CREATIVE = 1.0
-    VERY_CREATIVE = 1.5
+    Elements that are malformed, out of range, duplicated or fail validation
+    are left out, so callers can retry just those items.
 
+    Args:
+        text: Raw model output for the packed prompt
+        count: Number of items in the pack
+        validate: Validator for one item's result
 
-class TaskType(Enum):
-    """Common recruitment task types"""
-    CV_PARSING = "cv_parsing"
-    JOB_MATCHING = "job_matching"
-    JOB_DESCRIPTION = "job_description"
-    EMAIL_GENERATION = "email_generation"
-    INTERVIEW_QUESTIONS = "interview_questions"
-    CANDIDATE_SUMMARY = "candidate_summary"
-    SKILL_EXTRACTION = "skill_extraction"
-    SENTIMENT_ANALYSIS = "sentiment_analysis"
-    GENERAL = "general"
+    Returns:
+        Mapping of item index to its valid result
+    """
+    data = salvage_json(text)
+    if isinstance(data, dict):
+        data = next((value for value in data.values() if isinstance(value, list)), None)
+    if not isinstance(data, list):
+        return {}
+
+    results: Dict[int, Any] = {}
+    for entry in data:
+        if not isinstance(entry, dict) or "result" not in entry:
+            continue
+        index = entry.get("index")
+        if isinstance(index, str) and index.isdigit():
+            index = int(index)
+        if not isinstance(index, int) or not 0 <= index < count or index in results:
+            continue
+        if validate(entry["result"]):
+            continue
+        results[index] = entry["result"]
+    return results
 
 
 # ============================================================================
-# DATA CLASSES
+# BATCH JOBS
 # ============================================================================
 
-@dataclass
-class Message:
-    """Chat message structure"""
-    role: str  # 'system', 'user', 'assistant'
-    content: str
-    name: Optional[str] = None
+def batch_dir() -> str:
+    """
+    Directory for batch input files and local batch state
+
+    GROQ_BATCH_DIR when set, otherwise groq_batches under the system temp
+    directory (never the package source tree)
+    """
+    directory = os.getenv("GROQ_BATCH_DIR")
+    if directory:
+        return directory
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), "groq_batches")
 
-    def to_dict(self) -> Dict[str, str]:
-        """Convert to dictionary for API calls"""
-        result = {"role": self.role, "content": self.content}
-        if self.name:
-            result["name"] = self.name
-        return result
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
 
 
 @dataclass
-class CompletionConfig:
-    """Configuration for completion requests"""
-    model: str = GroqModel.DEFAULT.value
-    temperature: float = Temperature.BALANCED.value
-    max_tokens: Optional[int] = None
-    top_p: float = 1.0
-    stream: bool = False
-    stop: Optional[List[str]] = None
-    presence_penalty: float = 0.0
-    frequency_penalty: float = 0.0
-    n: int = 1
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary, excluding None values"""
-        return {k: v for k, v in asdict(self).items() if v is not None}
+class BatchRequest:
+    """One queued call destined for a batch file"""
+    custom_id: str
+    messages: List[Dict[str, str]]
+    config: CompletionConfig
+
+    def to_line(self) -> str:
+        """Serialize as one line of a batch input file"""
+        body = {"messages": self.messages, **self.config.to_dict()}
+        body.pop("stream", None)
+        return json.dumps({
+            "custom_id": self.custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body
+        }, ensure_ascii=False)
 
 
 @dataclass
-class GroqResponse:
-    """Structured response from GROQ API"""
-    content: str
-    model: str
-    usage: Dict[str, int]
-    finish_reason: str
-    created_at: datetime
-    raw_response: Optional[ChatCompletion] = None
-
-    @classmethod
-    def from_completion(cls, completion: ChatCompletion) -> 'GroqResponse':
-        """Create GroqResponse from API completion"""
-        return cls(
-            content=completion.choices[0].message.content,
-            model=completion.model,
-            usage={
-                "prompt_tokens": completion.usage.prompt_tokens,
-                "completion_tokens": completion.usage.completion_tokens,
-                "total_tokens": completion.usage.total_tokens
-            },
-            finish_reason=completion.choices[0].finish_reason,
-            created_at=datetime.fromtimestamp(completion.created),
-            raw_response=completion
+class BatchJob:
+    """State of a submitted batch"""
+    id: str
+    status: str
+    input_file_id: str
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+    request_counts: Dict[str, int] = field(default_factory=dict)
+    custom_ids: List[str] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        """Whether the batch has reached a terminal status"""
+        return self.status in BATCH_TERMINAL_STATUSES
+
+
+class BatchTransport:
+    """
+    Moves batch files to and from a batch service.
+
+    Subclasses implement the four primitives; GroqBatchTransport talks to the
+    provider and LocalBatchTransport runs everything on the local disk.
+    """
+
+    def upload(self, path: str) -> str:
+        """Upload a JSONL input file and return its file id"""
+        raise NotImplementedError
+
+    def create(self, input_file_id: str, completion_window: str) -> BatchJob:
+        """Start a batch over an uploaded file"""
+        raise NotImplementedError
+
+    def retrieve(self, batch_id: str) -> BatchJob:
+        """Fetch the current state of a batch"""
+        raise NotImplementedError
+
+    def download(self, file_id: str) -> str:
+        """Return the text of an output or error file"""
+        raise NotImplementedError
+
+
+class GroqBatchTransport(BatchTransport):
+    """Batch transport backed by the Groq files and batches endpoints"""
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+
+    @property
+    def client(self) -> 'Groq':
+        return CLIENT_REGISTRY.sdk_clients(self.api_key, self.base_url)[0]
+
+    @staticmethod
+    def _options() -> Dict[str, Any]:
+        """SDK keyword arguments bounding a call by the current deadline"""
+        remaining = remaining_time()
+        if remaining is None:
+            return {}
+        check_deadline("calling the batch API")
+        return {"timeout": remaining}
+
+    def upload(self, path: str) -> str:
+        with open(path, "rb") as handle:
+            return self.client.files.create(file=handle, purpose="batch", **self._options()).id
+
+    def create(self, input_file_id: str, completion_window: str) -> BatchJob:
+        return self._job(self.client.batches.create(
+            input_file_id=input_file_id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=completion_window,
+            **self._options()
+        ))
+
+    def retrieve(self, batch_id: str) -> BatchJob:
+        return self._job(self.client.batches.retrieve(batch_id, **self._options()))
+
+    def download(self, file_id: str) -> str:
+        return self.client.files.content(file_id, **self._options()).text()
+
+    @staticmethod
+    def _job(batch: Any) -> BatchJob:
+        counts = getattr(batch, "request_counts", None)
+        return BatchJob(
+            id=batch.id,
+            status=batch.status,
+            input_file_id=batch.input_file_id,
+            output_file_id=getattr(batch, "output_file_id", None),
+            error_file_id=getattr(batch, "error_file_id", None),
+            request_counts={
+                "total": getattr(counts, "total", 0),
+                "completed": getattr(counts, "completed", 0),
+                "failed": getattr(counts, "failed", 0)
+            } if counts is not None else {}
         )
 
 
-# ============================================================================
-# DECORATORS
-# ============================================================================
+def _echo_responder(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Default LocalBatchTransport responder: echo the last user message"""
+    content = next(
+        (m.get("content", "") for m in reversed(body.get("messages", [])) if m.get("role") == "user"),
+        ""
+    )
+    tokens = max(1, len(content) // 4)
+    return {
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", ""),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": tokens, "completion_tokens": tokens, "total_tokens": 2 * tokens}
+    }
+
+
+class LocalBatchTransport(BatchTransport):
+    """
+    File-based stand-in for the batch service.
 
-def retry_on_error(max_retries: int = 3, delay: float = 1.0):
-    """Retry decorator for API calls"""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
+    Input files are copied under root, and a batch is processed on the first
+    retrieve after processing_delay seconds by calling responder(body) for
+    every line. Output and error files use the provider's line format.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        responder: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        processing_delay: float = 0.0
+    ):
+        """
+        Initialize the local transport
+
+        Args:
+            root: Directory holding uploaded files, batch state and results
+                (defaults to batch_dir())
+            responder: Callable(request_body) returning a chat completion dict;
+                exceptions become error lines (defaults to echoing the prompt)
+            processing_delay: Seconds a batch stays in_progress
+        """
+        self.root = root or batch_dir()
+        self.responder = responder or _echo_responder
+        self.processing_delay = processing_delay
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def upload(self, path: str) -> str:
+        file_id = f"file_{uuid.uuid4().hex[:16]}"
+        with open(path, "r", encoding="utf-8") as source, \
+                open(self._path(f"{file_id}.jsonl"), "w", encoding="utf-8") as target:
+            target.write(source.read())
+        return file_id
+
+    def create(self, input_file_id: str, completion_window: str) -> BatchJob:
+        batch_id = f"batch_{input_file_id[5:]}"
+        state = {
+            "id": batch_id,
+            "status": "in_progress",
+            "input_file_id": input_file_id,
+            "created": time.time(),
+            "completion_window": completion_window
+        }
+        self._write_state(state)
+        return self._job(state)
+
+    def retrieve(self, batch_id: str) -> BatchJob:
+        with open(self._path(f"{batch_id}.json"), "r", encoding="utf-8") as handle:
+            state = json.load(handle)
+        if state["status"] == "in_progress" and time.time() - state["created"] >= self.processing_delay:
+            self._process(state)
+        return self._job(state)
+
+    def download(self, file_id: str) -> str:
+        with open(self._path(f"{file_id}.jsonl"), "r", encoding="utf-8") as handle:
+            return handle.read()
+
+    def _process(self, state: Dict[str, Any]):
+        outputs, errors = [], []
+        with open(self._path(f"{state['input_file_id']}.jsonl"), "r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
                 try:
-                    return func(*args, **kwargs)
+                    body = self.responder(request["body"])
+                    outputs.append({
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 200, "body": body},
+                        "error": None
+                    })
                 except Exception as e:
-                    if attempt == max_retries - 1:
-                        logger.error(f"Failed after {max_retries} attempts: {str(e)}")
-                        raise
-                    logger.warning(f"Attempt {attempt + 1} failed: {str(e)}. Retrying...")
-                    time.sleep(delay * (attempt + 1))
-            return None
-        return wrapper
-    return decorator
+                    errors.append({
+                        "custom_id": request["custom_id"],
+                        "response": None,
+                        "error": {"code": type(e).__name__, "message": str(e)}
+                    })
+
+        for kind, lines in (("output", outputs), ("error", errors)):
+            if not lines:
+                continue
+            file_id = f"file_{kind}_{state['id'][6:]}"
+            with open(self._path(f"{file_id}.jsonl"), "w", encoding="utf-8") as handle:
+                handle.write("".join(json.dumps(item) + "\n" for item in lines))
+            state[f"{kind}_file_id"] = file_id
+        state["status"] = "completed"
+        state["request_counts"] = {
+            "total": len(outputs) + len(errors),
+            "completed": len(outputs),
+            "failed": len(errors)
+        }
+        self._write_state(state)
+
+    def _write_state(self, state: Dict[str, Any]):
+        with open(self._path(f"{state['id']}.json"), "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+
+    @staticmethod
+    def _job(state: Dict[str, Any]) -> BatchJob:
+        return BatchJob(
+            id=state["id"],
+            status=state["status"],
+            input_file_id=state["input_file_id"],
+            output_file_id=state.get("output_file_id"),
+            error_file_id=state.get("error_file_id"),
+            request_counts=state.get("request_counts", {})
+        )
 
 
-def log_completion(func):
-    """Logging decorator for completions"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        logger.info(f"Starting {func.__name__}")
-        result = func(*args, **kwargs)
-        elapsed = time.time() - start_time
-        logger.info(f"Completed {func.__name__} in {elapsed:.2f}s")
-        return result
-    return wrapper
+class BatchError(Exception):
+    """A batch request that the service rejected or could not complete"""
+
+    def __init__(self, custom_id: str, code: Optional[str], message: str):
+        super().__init__(f"{custom_id}: {code or 'error'}: {message}")
+        self.custom_id = custom_id
+        self.code = code
 
 
 # ============================================================================
@@ -189,37 +1814,179 @@ class GroqClient:
     Comprehensive GROQ API client with utilities for recruitment tasks
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        single_flight: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgePolicy] = None,
+        conversation_store: Optional[ConversationStore] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        structured_output: bool = False,
+        router: Optional[ModelRouter] = None,
+        batch_transport: Optional[BatchTransport] = None,
+        key_pool: Optional[KeyPool] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        governor: Optional[CostGovernor] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        base_url: Optional[str] = None,
+        journal: Optional[RequestJournal] = None
+    ):
         """
         Initialize GROQ client
 
         Args:
             api_key: GROQ API key (defaults to GROQ_API_KEY env var)
+            cache: Optional response cache shared by complete/complete_async
+            single_flight: Coalesce concurrent identical requests into one call
+            rate_limiter: Optional RPM/TPM governor pacing every API call
+            retry_policy: Retry behaviour for API calls (defaults to RetryPolicy())
+            hedging: Optional hedge policy used by calls made with hedge=True
+            conversation_store: Conversation history store (defaults to a
+                bounded in-memory ConversationStore)
+            metrics: Telemetry registry (defaults to a new MetricsRegistry)
+            structured_output: Validate recruitment-method JSON against their
+                schemas and repair invalid fields instead of giving up
+            router: Cheap-first model cascade for recruitment methods
+                (disabled when None; every method then uses its configured model)
+            batch_transport: Where offline batch jobs are sent (defaults to
+                the Groq batch API)
+            key_pool: Optional pool of API keys; calls are spread across its
+                keys instead of going through api_key
+            scheduler: Optional priority scheduler deciding which queued call
+                goes next (may be shared between clients)
+            governor: Optional cost governor enforcing budgets per API key,
+                session and task (may be shared between clients)
+            circuit_breaker: Optional breaker that fails calls fast while
+                Groq is erroring; recruitment methods then answer from the
+                local fallbacks in self.fallbacks
+            base_url: API base URL, e.g. a local mock server (defaults to
+                GROQ_BASE_URL, then the Groq API)
+            journal: Optional append-only log of every API request and its
+                response (may be shared between clients)
         """
+        _init_runtime()
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not self.api_key and key_pool is not None:
+            self.api_key = key_pool.keys[0].api_key
         if not self.api_key:
             raise ValueError("GROQ API key not found. Set GROQ_API_KEY environment variable.")
+        self.base_url = base_url or os.getenv("GROQ_BASE_URL")
 
-        self.client = Groq(api_key=self.api_key)
-        self.async_client = AsyncGroq(api_key=self.api_key)
+        # SDK clients come from the process-wide registry (so every GroqClient
+        # for the same key shares warm connection pools) on first request
+        self._client: Optional['Groq'] = None
+        self._async_client: Optional['AsyncGroq'] = None
+        self.key_pool = key_pool
+        if key_pool is not None and key_pool.base_url is None:
+            key_pool.base_url = self.base_url
+
+        # Per-call telemetry
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+
+        # Schema-enforced JSON for recruitment methods
+        self.structured_output = structured_output
+
+        # Task-based model selection
+        self.router = router
+
+        # Offline batch jobs
+        self.batch_transport = batch_transport or GroqBatchTransport(self.api_key, self.base_url)
+        self._batch_queue: List[BatchRequest] = []
+        self._batch_lock = threading.Lock()
+
+        # Token counting (shared, memoized)
+        self.token_counter = TOKEN_COUNTER
+
+        # Running average of tokens models append after a JSON answer,
+        # used to estimate what stop_at_json saves
+        self.json_trailing_tokens: Optional[float] = None
 
         # Conversation history storage
-        self.conversations: Dict[str, List[Message]] = {}
+        self.conversations = (
+            conversation_store if conversation_store is not None else ConversationStore()
+        )
+        if self.conversations.compact and self.conversations.summarizer is None:
+            self.conversations.summarizer = self.summarize_turns
+
+        # Response cache (disabled when None)
+        self.cache = cache
+
+        # In-flight request coalescing (disabled when None)
+        self.flights = SingleFlight() if single_flight else None
+
+        # Requests/tokens per minute pacing (disabled when None)
+        self.rate_limiter = rate_limiter
+
+        # Cost budgets (disabled when None)
+        self.governor = governor
+
+        # Priority classes sharing the quota (disabled when None)
+        self.scheduler = scheduler
+        if scheduler is not None and scheduler.metrics is None:
+            scheduler.metrics = self.metrics
+
+        # Request/response log for replay and cache warm-up (disabled when None)
+        self.journal = journal
+
+        # Fail fast while the API is unhealthy (disabled when None)
+        self.circuit_breaker = circuit_breaker
+        if circuit_breaker is not None and circuit_breaker.metrics is None:
+            circuit_breaker.metrics = self.metrics
+
+        # Local answers per task used while the circuit is open
+        self.fallbacks: Dict[TaskType, Callable[..., Any]] = dict(DEFAULT_FALLBACKS)
+
+        # Transient-error retries for sync and async API calls
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        # Tail-latency hedging (disabled when None)
+        self.hedging = hedging
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+
+        # Adaptive batch concurrency, created on first adaptive batch
+        self.concurrency: Optional[AdaptiveConcurrency] = None
 
         logger.info("GroqClient initialized successfully")
 
+    @property
+    def client(self) -> 'Groq':
+        """Sync SDK client, created on first use"""
+        if self._client is None:
+            self._client = CLIENT_REGISTRY.sdk_clients(self.api_key, self.base_url)[0]
+        return self._client
+
+    @client.setter
+    def client(self, value: 'Groq'):
+        self._client = value
+
+    @property
+    def async_client(self) -> 'AsyncGroq':
+        """Async SDK client for the running event loop, created on first use"""
+        if self._async_client is not None:
+            return self._async_client
+        return CLIENT_REGISTRY.async_client(self.api_key, self.base_url)
+
+    @async_client.setter
+    def async_client(self, value: 'AsyncGroq'):
+        self._async_client = value
+
     # ========================================================================
     # CORE COMPLETION METHODS
     # ========================================================================
 
-    @retry_on_error(max_retries=3)
     @log_completion
     def complete(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         config: Optional[CompletionConfig] = None,
-        conversation_id: Optional[str] = None
+        conversation_id: Optional[str] = None,
+        use_cache: Optional[bool] = None,
+        hedge: bool = False,
+        stop_at_json: bool = False
     ) -> GroqResponse:
         """
         Generate a completion for a given prompt
@@ -229,6 +1996,13 @@ class GroqClient:
             system_prompt: Optional system prompt
             config: Completion configuration
             conversation_id: Optional ID to maintain conversation history
+            use_cache: Force the response cache on/off (default: only for
+                deterministic temperatures)
+            hedge: Fire a duplicate request if this one is slow (needs a
+                client hedge policy); use for interactive calls
+            stop_at_json: Stream internally and close the connection as soon as
+                the top-level JSON value is complete and valid (savings are
+                reported in response.early_stop)
 
         Returns:
             GroqResponse object
@@ -243,121 +2017,1364 @@ class GroqClient:
             messages.append(Message(role="system", content=system_prompt))
 
         # Add conversation history if exists
-        if conversation_id and conversation_id in self.conversations:
-            messages.extend(self.conversations[conversation_id])
+        if conversation_id:
+            messages.extend(self.conversations.history(conversation_id))
 
         # Add current user prompt
         messages.append(Message(role="user", content=prompt))
 
+        request_messages = [msg.to_dict() for msg in messages]
+
+        # Serve from cache when possible
+        cache_key = None
+        if self._should_cache(config, use_cache):
+            start_time = time.time()
+            cache_key = self.cache.make_key(request_messages, config)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._observe(current_operation("complete"), config.model, start_time, cached)
+                self._record_turn(conversation_id, prompt, cached.content)
+                return cached
+
         # Make API call
-        completion = self.client.chat.completions.create(
-            messages=[msg.to_dict() for msg in messages],
-            **config.to_dict()
-        )
+        if stop_at_json:
+            response = self._complete_until_json(request_messages, config, cache_key)
+        else:
+            response = self._request(request_messages, config, cache_key, hedge)
 
         # Store in conversation history
-        if conversation_id:
-            if conversation_id not in self.conversations:
-                self.conversations[conversation_id] = []
-            self.conversations[conversation_id].append(Message(role="user", content=prompt))
-            self.conversations[conversation_id].append(
-                Message(role="assistant", content=completion.choices[0].message.content)
+        self._record_turn(conversation_id, prompt, response.content)
+
+        return response
+
+    @log_completion
+    def complete_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        config: Optional[CompletionConfig] = None,
+        stop_at_json: bool = False
+    ) -> Generator[str, None, None]:
+        """
+        Stream a completion for a given prompt
+
+        Errors before the first chunk are retried through retry_policy.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            config: Completion configuration
+            stop_at_json: Close the stream as soon as the top-level JSON value
+                is complete and valid, dropping any trailing prose
+
+        Yields:
+            Content chunks as they arrive
+        """
+        if config is None:
+            config = CompletionConfig()
+
+        config.stream = True
+
+        messages = []
+        if system_prompt:
+            messages.append(Message(role="system", content=system_prompt))
+        messages.append(Message(role="user", content=prompt))
+        request_messages = [msg.to_dict() for msg in messages]
+
+        yield from self._stream(
+            request_messages, config, current_operation("complete_stream"), stop_at_json
+        )
+
+    @log_completion
+    async def complete_stream_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        config: Optional[CompletionConfig] = None
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously stream a completion for a given prompt
+
+        Cancelling the consuming task, closing the generator early or hitting
+        the deadline closes the HTTP response straight away, so the connection
+        goes back to the pool instead of draining an unread stream.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            config: Completion configuration
+
+        Yields:
+            Content chunks as they arrive
+        """
+        if config is None:
+            config = CompletionConfig()
+
+        config.stream = True
+
+        messages = []
+        if system_prompt:
+            messages.append(Message(role="system", content=system_prompt))
+        messages.append(Message(role="user", content=prompt))
+        request_messages = [msg.to_dict() for msg in messages]
+
+        # async for does not close the inner generator on early exit
+        chunks = self._stream_async(request_messages, config, current_operation("complete_stream_async"))
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    @log_completion
+    def complete_structured(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        config: Optional[CompletionConfig] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        max_repairs: int = 1
+    ) -> Any:
+        """
+        Generate JSON that conforms to a schema
+
+        Object schemas use the provider's JSON response format. The answer is
+        checked with a precompiled validator; if some fields are invalid or
+        missing, a short follow-up turn asks for just those fields and the
+        corrections are merged in, rather than regenerating everything.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            config: Completion configuration
+            schema: JSON schema (subset supported by compile_schema)
+            max_repairs: Follow-up repair turns allowed
+
+        Returns:
+            Parsed (and, where possible, repaired) JSON value
+        """
+        if config is None:
+            config = CompletionConfig()
+        schema = schema or {"type": "object"}
+        validate = get_validator(schema)
+        is_object = schema.get("type") == "object"
+        if is_object and config.response_format is None:
+            config = replace(config, response_format={"type": "json_object"})
+
+        response = self.complete(prompt, system_prompt, config)
+        data = salvage_json(response.content)
+        if data is None:
+            data = {} if is_object else []
+        errors = validate(data)
+
+        operation = current_operation("complete_structured")
+        repairs = 0
+        while errors and repairs < max_repairs:
+            repairs += 1
+            self.metrics.inc("groq_structured_repairs_total", operation=operation, model=config.model)
+            data = self._repair_structured(
+                prompt, system_prompt, config, schema, response.content, data, errors
+            )
+            errors = validate(data)
+
+        if errors:
+            self.metrics.inc("groq_structured_failures_total", operation=operation, model=config.model)
+            logger.error(f"Structured output still invalid after {repairs} repair(s): {errors[:5]}")
+        return data
+
+    def _repair_structured(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        config: CompletionConfig,
+        schema: Dict[str, Any],
+        previous_answer: str,
+        data: Any,
+        errors: List[Tuple[Tuple, str]]
+    ) -> Any:
+        """Ask the model to correct only the invalid parts of a JSON answer"""
+        problems = "\n".join(
+            f"- {'.'.join(str(p) for p in path) or '(root)'}: {message}"
+            for path, message in errors[:20]
+        )
+        root_broken = any(not path for path, _ in errors)
+
+        if isinstance(data, dict) and not root_broken:
+            keys = sorted({str(path[0]) for path, _ in errors})
+            properties = schema.get("properties", {})
+            target = {
+                "type": "object",
+                "required": keys,
+                "properties": {key: properties.get(key, {}) for key in keys}
+            }
+            current = {key: data[key] for key in keys if key in data}
+        elif isinstance(data, list) and not root_broken:
+            keys = [str(index) for index in sorted({path[0] for path, _ in errors})]
+            target = {
+                "type": "object",
+                "required": keys,
+                "properties": {key: schema.get("items", {}) for key in keys}
+            }
+            current = {key: data[int(key)] for key in keys}
+        else:
+            keys, target, current = [], schema, None
+
+        if keys:
+            instruction = (
+                f"Return ONLY a JSON object with corrected values for these keys: "
+                f"{', '.join(keys)}."
+            )
+        else:
+            instruction = "Return ONLY the corrected JSON value."
+        repair_prompt = f"""Your JSON answer has problems:
+{problems}
+
+{instruction}
+{"Current values: " + json.dumps(current) if current else ""}
+Schema: {json.dumps(target)}"""
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        messages.append({"role": "assistant", "content": previous_answer})
+        messages.append({"role": "user", "content": repair_prompt})
+
+        repair_config = replace(
+            config,
+            stream=False,
+            response_format={"type": "json_object"} if keys or target.get("type") == "object" else None
+        )
+        patch = salvage_json(self._request(messages, repair_config).content)
+
+        if not keys:
+            return patch if patch is not None else data
+        if not isinstance(patch, dict):
+            return data
+        if isinstance(data, dict):
+            data.update({key: value for key, value in patch.items() if key in keys})
+        else:
+            for key, value in patch.items():
+                if key in keys:
+                    data[int(key)] = value
+        return data
+
+    @log_completion
+    def complete_routed(
+        self,
+        task: TaskType,
+        prompt: str,
+        system_prompt: Optional[str],
+        config: CompletionConfig,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Run a task through the router's cheap-first cascade
+
+        Without a router the task runs once on the configured model.
+
+        Args:
+            task: Task type selecting the route
+            prompt: User prompt
+            system_prompt: System prompt
+            config: Base configuration (its model is replaced per tier)
+            schema: JSON schema of the answer; None for free-form text
+
+        Returns:
+            Parsed JSON for schema tasks, otherwise the response text. An
+            answer that is not JSON at all becomes [] for array schemas and
+            {"raw_response": text} for object schemas
+        """
+        tiers = self.router.tiers(task) if self.router is not None else (config.model,)
+        validate = get_validator(schema) if schema is not None else None
+        data: Any = None
+        content = ""
+
+        with cost_scope(task=task):
+            for tier, model in enumerate(tiers):
+                tier_config = replace(config, model=model)
+                last = tier == len(tiers) - 1
+                start_time = time.time()
+
+                if last and validate is not None and self.structured_output:
+                    data = self.complete_structured(prompt, system_prompt, tier_config, schema)
+                    reason = None
+                else:
+                    content = self.complete(prompt, system_prompt, tier_config).content
+                    if validate is None:
+                        data = content
+                        errors = [] if content.strip() else [((), "empty response")]
+                    else:
+                        data = salvage_json(content)
+                        errors = validate(data) if data is not None else [((), "not JSON")]
+                    reason = None if last else self.router.escalation_reason(data, errors)
+
+                latency = time.time() - start_time
+                if self.router is not None:
+                    self.router.record(task, model, tier, latency, reason)
+                self.metrics.inc("groq_route_requests_total", task=task.value, model=model)
+                self.metrics.observe(
+                    "groq_route_duration_seconds", latency, task=task.value, model=model
+                )
+                if reason is None:
+                    break
+                self.metrics.inc(
+                    "groq_route_escalations_total", task=task.value, model=model, reason=reason
+                )
+                logger.info(f"Escalating {task.value} from {model} ({reason})")
+
+        if validate is not None and data is None:
+            logger.error(f"Failed to parse {task.value} response as JSON")
+            # Keep the shape callers expect: lists stay lists
+            return [] if schema.get("type") == "array" else {"raw_response": content}
+        return data
+
+    def register_fallback(self, task: TaskType, fallback: Callable[..., Any]):
+        """
+        Set the local answer used for a task while the circuit is open
+
+        Args:
+            task: Task the fallback serves
+            fallback: Callable taking the same arguments as the method
+                handling task (e.g. extract_skills for SKILL_EXTRACTION)
+        """
+        self.fallbacks[task] = fallback
+
+    def with_fallback(
+        self,
+        task: TaskType,
+        call: Callable[..., Any],
+        *args,
+        fallback: Optional[Callable[..., Any]] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run call, or the task's registered fallback when the circuit is open
+
+        While open, the fallback is used straight away without attempting
+        the call; a call refused mid-way (CircuitOpen) also falls back.
+        Other errors propagate unchanged.
+
+        Args:
+            task: Task whose fallback to use
+            call: Function calling the API
+            *args, **kwargs: Arguments for call (and the fallback)
+            fallback: Fallback for this call only, instead of the one
+                registered for task (for callers sharing this client)
+            timeout: Seconds the call may take (see deadline); the fallback
+                is not bounded
+
+        Returns:
+            Result of call or of the fallback
+        """
+        fallback = fallback or self.fallbacks.get(task)
+        if fallback is None or self.circuit_breaker is None:
+            with deadline(timeout):
+                return call(*args, **kwargs)
+        if not self.circuit_breaker.is_open():
+            try:
+                with deadline(timeout):
+                    return call(*args, **kwargs)
+            except CircuitOpen:
+                pass
+        self.metrics.inc("groq_fallbacks_total", task=task.value)
+        return fallback(*args, **kwargs)
+
+    @log_completion
+    def complete_json_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        config: Optional[CompletionConfig] = None,
+        operation: Optional[str] = None,
+        stop_at_json: bool = True
+    ) -> Generator[Tuple[Union[str, int], Any], None, None]:
+        """
+        Stream a JSON completion, yielding top-level members as they close
+
+        Args:
+            prompt: User prompt (should ask for a JSON object or array)
+            system_prompt: Optional system prompt
+            config: Completion configuration
+            operation: Name used for telemetry (defaults to complete_json_stream)
+            stop_at_json: Close the stream once the JSON value is complete
+
+        Yields:
+            (key, value) for an object response, (index, item) for an array
+        """
+        if config is None:
+            config = CompletionConfig()
+        config.stream = True
+
+        messages = []
+        if system_prompt:
+            messages.append(Message(role="system", content=system_prompt))
+        messages.append(Message(role="user", content=prompt))
+        request_messages = [msg.to_dict() for msg in messages]
+
+        parser = StreamingJSONParser()
+        for chunk in self._stream(
+            request_messages, config,
+            operation or current_operation("complete_json_stream"), stop_at_json
+        ):
+            yield from parser.feed(chunk)
+
+        if not parser.done:
+            logger.error("Streamed JSON response ended before the top-level value closed")
+
+    def _stream(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        operation: str,
+        stop_at_json: bool = False,
+        early_stop: Optional[Dict[str, Any]] = None,
+        retry: bool = True
+    ) -> Generator[str, None, None]:
+        """
+        Perform a streaming API call, recording rate usage and telemetry
+
+        With stop_at_json, the stream is scanned and the connection closed as
+        soon as the top-level JSON value is complete and valid; details of
+        the early stop are written into the early_stop dict if given.
+
+        Failures before the first content chunk (a 429 or 5xx when opening
+        the stream, a connection dropped before any output) are retried
+        through retry_policy unless retry is False; once content has been
+        yielded, errors propagate to the caller.
+        """
+        config, spend = self._preflight(request_messages, config)
+
+        def open_stream():
+            """One attempt: open the stream and read up to its first content chunk"""
+            probe = self._circuit_enter()
+            try:
+                ticket, reservation = self._admit(request_messages, config)
+            except BaseException:
+                self._circuit_exit(probe, counted=False)
+                raise
+
+            lease = None
+            if self.key_pool is not None:
+                try:
+                    lease = self.key_pool.acquire(self._reservation_size(request_messages, config))
+                except BaseException:
+                    self._leave(ticket, reservation)
+                    self._circuit_exit(probe, counted=False)
+                    raise
+            client = lease.key.client if lease is not None else self.client
+
+            try:
+                stream = client.chat.completions.create(
+                    messages=request_messages,
+                    **self._request_options(config)
+                )
+                received = iter(stream)
+                first = next(
+                    (chunk for chunk in received if chunk.choices and chunk.choices[0].delta.content), None
+                )
+            except BaseException as e:
+                self._leave(ticket, reservation)
+                self._circuit_exit(probe, e)
+                if lease is not None:
+                    self.key_pool.release(lease, error=e if isinstance(e, Exception) else None)
+                raise
+            return probe, ticket, reservation, lease, stream, received, first
+
+        start_time = time.time()
+        first_token_at = None
+        chunks: List[str] = []
+        error = None
+        opened = False
+        ticket = reservation = lease = None
+        scanner = StreamingJSONParser() if stop_at_json else None
+        calibrating = False
+        try:
+            probe, ticket, reservation, lease, stream, received, first = (
+                self.retry_policy.call(open_stream) if retry else open_stream()
+            )
+            opened = True
+            if lease is not None:
+                self._attribute_key(spend, lease.key.api_key)
+
+            for chunk in chain([first] if first is not None else [], received):
+                if remaining_time() == 0.0:
+                    # The read timeout only bounds each chunk; stop a slow
+                    # trickle at the deadline (the finally frees the connection)
+                    raise DeadlineExceeded("Deadline exceeded while streaming")
+                if not (chunk.choices and chunk.choices[0].delta.content):
+                    continue
+                content = chunk.choices[0].delta.content
+                if first_token_at is None:
+                    first_token_at = time.time()
+                chunks.append(content)
+
+                if calibrating:
+                    # Read the rest of the answer without passing it on
+                    scanner.buffer += content
+                    continue
+                if scanner is None or scanner.done:
+                    yield content
+                    continue
+
+                received_before = len(scanner.buffer)
+                scanner.feed(content)
+                if not scanner.done:
+                    yield content
+                    continue
+
+                # Top-level value just closed: stop only if it is valid JSON
+                cut = scanner.end - received_before
+                yield content[:cut]
+                try:
+                    json.loads(scanner.text[scanner.start:])
+                except json.JSONDecodeError:
+                    yield content[cut:]
+                    continue
+                if self.json_trailing_tokens is None:
+                    # Nothing is known yet about what follows a JSON answer:
+                    # read this one to its end so early stops can estimate
+                    # what they save
+                    calibrating = True
+                    continue
+                self._record_early_stop(
+                    operation, config, content[cut:], chunks, first_token_at, early_stop
+                )
+                break
+            else:
+                if scanner is not None and scanner.done:
+                    # Ran to the natural end: learn how much trails the JSON
+                    trailing = self.token_counter.count(scanner.buffer[scanner.end:], config.model)
+                    self._learn_json_trailing(trailing)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            duration = time.time() - start_time
+            usage = {
+                "prompt_tokens": self.token_counter.count_messages(request_messages, config.model),
+                "completion_tokens": self.token_counter.count("".join(chunks), config.model)
+            }
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            if early_stop is not None:
+                early_stop["usage"] = usage
+            if opened:
+                # Close the response whether the stream ended, stopped early,
+                # failed or was abandoned by the consumer (GeneratorExit)
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+                # A failed open already gave back its slot, reservation and lease
+                if reservation is not None:
+                    self.rate_limiter.reconcile(reservation, usage["total_tokens"] if chunks else 0)
+                self._leave(ticket)
+                self._circuit_exit(probe, error if not isinstance(error, GeneratorExit) else None)
+            if chunks:
+                self._charge(spend, usage, config.model)
+            self._release_spend(spend)
+            if lease is not None:
+                self.key_pool.release(
+                    lease,
+                    error=error if isinstance(error, Exception) else None,
+                    used_tokens=usage["total_tokens"] if chunks else None
+                )
+            self.metrics.record_completion(
+                operation, config.model, duration, usage=usage,
+                cost=self.calculate_cost(usage["prompt_tokens"], usage["completion_tokens"], config.model),
+                error=error if isinstance(error, Exception) else None
             )
+            self.metrics.record_stream(
+                operation, config.model,
+                first_token_at - start_time if first_token_at is not None else None,
+                usage["completion_tokens"], duration
+            )
+            self._journal_stream(operation, request_messages, config, start_time, chunks, usage, error)
+
+    async def _stream_async(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        operation: str
+    ) -> AsyncIterator[str]:
+        """Async counterpart of _stream (without early stopping)"""
+        config, spend = await self._preflight_async(request_messages, config)
+
+        async def next_chunk(chunk_iter):
+            """Next chunk within the deadline, or None at the end of the stream"""
+            remaining = remaining_time()
+            try:
+                if remaining is None:
+                    return await chunk_iter.__anext__()
+                return await asyncio.wait_for(chunk_iter.__anext__(), remaining)
+            except StopAsyncIteration:
+                return None
+            except asyncio.TimeoutError as e:
+                raise DeadlineExceeded("Deadline exceeded while streaming") from e
+
+        async def close_stream(stream):
+            close = getattr(stream, "close", None)
+            if close is not None:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+
+        async def open_stream():
+            """One attempt: open the stream and read up to its first content chunk"""
+            probe = self._circuit_enter()
+            try:
+                ticket, reservation = await self._admit_async(request_messages, config)
+            except BaseException:
+                self._circuit_exit(probe, counted=False)
+                raise
+
+            lease = None
+            if self.key_pool is not None:
+                try:
+                    lease = await self.key_pool.acquire_async(self._reservation_size(request_messages, config))
+                except BaseException:
+                    self._leave(ticket, reservation)
+                    self._circuit_exit(probe, counted=False)
+                    raise
+            client = lease.key.async_client if lease is not None else self.async_client
+
+            stream = None
+            try:
+                stream = await client.chat.completions.create(
+                    messages=request_messages,
+                    **self._request_options(config)
+                )
+                chunk_iter = stream.__aiter__()
+                first = await next_chunk(chunk_iter)
+                while first is not None and not (first.choices and first.choices[0].delta.content):
+                    first = await next_chunk(chunk_iter)
+            except BaseException as e:
+                if stream is not None:
+                    await close_stream(stream)
+                self._leave(ticket, reservation)
+                self._circuit_exit(probe, e)
+                if lease is not None:
+                    self.key_pool.release(lease, error=e if isinstance(e, Exception) else None)
+                raise
+            return probe, ticket, reservation, lease, stream, chunk_iter, first
+
+        start_time = time.time()
+        first_token_at = None
+        chunks: List[str] = []
+        error = None
+        stream = None
+        ticket = reservation = lease = None
+        try:
+            attempt = await self.retry_policy.call_async(open_stream)
+            probe, ticket, reservation, lease, stream, chunk_iter, chunk = attempt
+            if lease is not None:
+                self._attribute_key(spend, lease.key.api_key)
+            while chunk is not None:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    content = chunk.choices[0].delta.content
+                    if first_token_at is None:
+                        first_token_at = time.time()
+                    chunks.append(content)
+                    yield content
+                chunk = await next_chunk(chunk_iter)
+        except BaseException as e:
+            # Includes CancelledError and GeneratorExit from an early aclose()
+            error = e
+            raise
+        finally:
+            if stream is not None:
+                await close_stream(stream)
+            duration = time.time() - start_time
+            usage = {
+                "prompt_tokens": self.token_counter.count_messages(request_messages, config.model),
+                "completion_tokens": self.token_counter.count("".join(chunks), config.model)
+            }
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            if stream is not None:
+                # A failed open already gave back its slot, reservation and lease
+                if reservation is not None:
+                    self.rate_limiter.reconcile(reservation, usage["total_tokens"] if chunks else 0)
+                self._leave(ticket)
+                self._circuit_exit(probe, error if not isinstance(error, GeneratorExit) else None)
+            if chunks:
+                self._charge(spend, usage, config.model)
+            self._release_spend(spend)
+            failure = error if isinstance(error, Exception) else None
+            if lease is not None:
+                self.key_pool.release(
+                    lease, error=failure, used_tokens=usage["total_tokens"] if chunks else None
+                )
+            self.metrics.record_completion(
+                operation, config.model, duration, usage=usage,
+                cost=self.calculate_cost(usage["prompt_tokens"], usage["completion_tokens"], config.model),
+                error=failure
+            )
+            self.metrics.record_stream(
+                operation, config.model,
+                first_token_at - start_time if first_token_at is not None else None,
+                usage["completion_tokens"], duration
+            )
+            self._journal_stream(operation, request_messages, config, start_time, chunks, usage, error)
+
+    def _complete_until_json(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        cache_key: Optional[str] = None
+    ) -> GroqResponse:
+        """Non-streaming completion that closes the connection once the JSON answer is complete"""
+        stream_config = replace(config, stream=True)
+        operation = current_operation("complete")
+
+        def collect() -> GroqResponse:
+            early_stop: Dict[str, Any] = {"stopped": False}
+            content = "".join(
+                # Retried as a whole below, so a failure mid-answer restarts it too
+                self._stream(request_messages, stream_config, operation, True, early_stop, retry=False)
+            )
+            return GroqResponse(
+                content=content,
+                model=config.model,
+                usage=early_stop.pop("usage"),
+                finish_reason="json_complete" if early_stop["stopped"] else "stop",
+                created_at=datetime.now(),
+                early_stop=early_stop
+            )
+
+        response = self.retry_policy.call(collect)
+        if cache_key is not None:
+            self.cache.put(cache_key, response)
+        return response
+
+    def _learn_json_trailing(self, trailing_tokens: int):
+        """Update the running average of tokens generated after a JSON value"""
+        if self.json_trailing_tokens is None:
+            self.json_trailing_tokens = float(trailing_tokens)
+        else:
+            self.json_trailing_tokens = 0.8 * self.json_trailing_tokens + 0.2 * trailing_tokens
 
-        return GroqResponse.from_completion(completion)
+    def _record_early_stop(
+        self,
+        operation: str,
+        config: CompletionConfig,
+        discarded_text: str,
+        chunks: List[str],
+        first_token_at: float,
+        early_stop: Optional[Dict[str, Any]]
+    ):
+        """Estimate and record what closing the stream early saved"""
+        discarded = self.token_counter.count(discarded_text, config.model)
+        generated = self.token_counter.count("".join(chunks), config.model)
+        expected_trailing = self.json_trailing_tokens or 0.0
+        saved_tokens = max(0, int(round(expected_trailing)) - discarded)
+        if config.max_tokens is not None:
+            saved_tokens = min(saved_tokens, max(0, config.max_tokens - generated))
+
+        elapsed = time.time() - first_token_at
+        tokens_per_second = generated / elapsed if elapsed > 0 else 0.0
+        saved_ms = saved_tokens / tokens_per_second * 1000 if tokens_per_second else 0.0
+
+        report = {
+            "stopped": True,
+            "discarded_tokens": discarded,
+            "saved_tokens": saved_tokens,
+            "saved_ms": round(saved_ms, 1)
+        }
+        if early_stop is not None:
+            early_stop.update(report)
+        self.metrics.inc("groq_early_stops_total", operation=operation, model=config.model)
+        self.metrics.inc("groq_early_stop_saved_tokens_total", saved_tokens, operation=operation, model=config.model)
+        self.metrics.inc("groq_early_stop_saved_seconds_total", saved_ms / 1000, operation=operation, model=config.model)
+        logger.info(
+            f"Closed stream after JSON completed: ~{saved_tokens} tokens / {saved_ms:.0f}ms saved"
+        )
 
-    @retry_on_error(max_retries=3)
-    def complete_stream(
+    @log_completion
+    async def complete_async(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        config: Optional[CompletionConfig] = None
-    ) -> Generator[str, None, None]:
+        config: Optional[CompletionConfig] = None,
+        use_cache: Optional[bool] = None,
+        hedge: bool = False
+    ) -> GroqResponse:
         """
-        Stream a completion for a given prompt
+        Asynchronous completion
 
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
             config: Completion configuration
+            use_cache: Force the response cache on/off (default: only for
+                deterministic temperatures)
+            hedge: Fire a duplicate request if this one is slow (needs a
+                client hedge policy)
 
-        Yields:
-            Content chunks as they arrive
+        Returns:
+            GroqResponse object
         """
         if config is None:
             config = CompletionConfig()
 
-        config.stream = True
-
         messages = []
         if system_prompt:
             messages.append(Message(role="system", content=system_prompt))
         messages.append(Message(role="user", content=prompt))
+        request_messages = [msg.to_dict() for msg in messages]
 
-        stream = self.client.chat.completions.create(
-            messages=[msg.to_dict() for msg in messages],
-            **config.to_dict()
-        )
+        cache_key = None
+        if self._should_cache(config, use_cache):
+            start_time = time.time()
+            cache_key = self.cache.make_key(request_messages, config)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._observe(current_operation("complete_async"), config.model, start_time, cached)
+                return cached
 
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        return await self._request_async(request_messages, config, cache_key, hedge)
 
-    async def complete_async(
+    def _request(
         self,
-        prompt: str,
-        system_prompt: Optional[str] = None,
-        config: Optional[CompletionConfig] = None
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        cache_key: Optional[str] = None,
+        hedge: bool = False
     ) -> GroqResponse:
-        """
-        Asynchronous completion
+        """Perform a non-streaming API call, coalescing identical in-flight requests"""
+        config, spend = self._preflight(request_messages, config)
+        if spend is not None and spend.downgraded_from is not None:
+            # A cheaper model's answer must not fill the requested model's cache slot
+            cache_key = None
+
+        def call(reservation: Optional[RateReservation] = None, backup: bool = False) -> GroqResponse:
+            # Hedges arrive with their own reservation (None without a rate
+            # limiter) and skip the scheduler queue either way
+            probe = self._circuit_enter(reservation)
+            ticket = None
+            if not backup:
+                try:
+                    ticket, reservation = self._admit(request_messages, config)
+                except BaseException:
+                    self._circuit_exit(probe, counted=False)
+                    raise
+            start_time = time.time()
+            try:
+                completion = self._create(request_messages, config, spend)
+            except BaseException as e:
+                self._circuit_exit(probe, e)
+                if reservation is not None:
+                    self.rate_limiter.release(reservation)
+                raise
+            finally:
+                self._leave(ticket)
+            self._circuit_exit(probe)
+            response = GroqResponse.from_completion(completion)
+            latency = time.time() - start_time
+            self._charge(spend, response.usage, config.model)
+            if reservation is not None:
+                self.rate_limiter.reconcile(reservation, response.usage["total_tokens"])
+            if self.hedging is not None:
+                self.hedging.observe(config.model, latency)
+            if cache_key is not None:
+                self.cache.put(cache_key, response, latency=latency)
+            return response
+
+        def hedged_call() -> GroqResponse:
+            delay = self.hedging.hedge_delay(config.model)
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(thread_name_prefix="groq-hedge")
+            # Pool threads run in a copy of the caller's context so the
+            # deadline and operation name follow the request
+            primary = self._hedge_pool.submit(contextvars.copy_context().run, call)
+            if delay is None:
+                return primary.result()
+            done, _ = wait_futures([primary], timeout=delay)
+            if done:
+                return primary.result()
+
+            reservation = self._try_hedge_reservation(request_messages, config, spend)
+            if reservation is False:
+                return primary.result()
+            backup = self._hedge_pool.submit(contextvars.copy_context().run, call, reservation, True)
+
+            # First success wins; the sync SDK cannot abort the loser, so it
+            # finishes in the background and its result is discarded
+            pending = {primary, backup}
+            first_error = None
+            while pending:
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        loser = primary if future is backup else backup
+                        loser.cancel()
+                        loser.add_done_callback(self.hedging.record_loser)
+                        self.hedging.record_outcome(future is backup)
+                        return future.result()
+                    first_error = first_error or future.exception()
+            raise first_error
+
+        attempt = hedged_call if hedge and self.hedging is not None else call
+        operation = current_operation("complete")
+        attempts = 0
+
+        def counted_attempt() -> GroqResponse:
+            nonlocal attempts
+            attempts += 1
+            return attempt()
+
+        def call_with_retry() -> GroqResponse:
+            start_time = time.time()
+            try:
+                response = self.retry_policy.call(counted_attempt)
+            except Exception as e:
+                self._observe(operation, config.model, start_time, error=e, retries=attempts - 1)
+                self._journal(operation, request_messages, config, start_time, error=e)
+                raise
+            self._observe(operation, config.model, start_time, response, retries=attempts - 1)
+            self._journal(operation, request_messages, config, start_time, response)
+            return response
 
-        Args:
-            prompt: User prompt
-            system_prompt: Optional system prompt
-            config: Completion configuration
+        try:
+            if self.flights is None:
+                return call_with_retry()
+            key = cache_key or request_fingerprint(request_messages, config)
+            response = self.flights.do(key, call_with_retry)
+        finally:
+            self._release_spend(spend)
+        if attempts == 0:
+            self.metrics.inc("groq_coalesced_total", operation=operation, model=config.model)
+        return response
+
+    async def _request_async(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        cache_key: Optional[str] = None,
+        hedge: bool = False
+    ) -> GroqResponse:
+        """Async counterpart of _request"""
+        config, spend = await self._preflight_async(request_messages, config)
+        if spend is not None and spend.downgraded_from is not None:
+            cache_key = None
+
+        async def call(reservation: Optional[RateReservation] = None, backup: bool = False) -> GroqResponse:
+            probe = self._circuit_enter(reservation)
+            ticket = None
+            if not backup:
+                try:
+                    ticket, reservation = await self._admit_async(request_messages, config)
+                except BaseException:
+                    self._circuit_exit(probe, counted=False)
+                    raise
+            start_time = time.time()
+            try:
+                completion = await self._create_async(request_messages, config, spend)
+            except BaseException as e:
+                self._circuit_exit(probe, e)
+                if reservation is not None:
+                    self.rate_limiter.release(reservation)
+                raise
+            finally:
+                self._leave(ticket)
+            self._circuit_exit(probe)
+            response = GroqResponse.from_completion(completion)
+            latency = time.time() - start_time
+            self._charge(spend, response.usage, config.model)
+            if reservation is not None:
+                self.rate_limiter.reconcile(reservation, response.usage["total_tokens"])
+            if self.hedging is not None:
+                self.hedging.observe(config.model, latency)
+            if cache_key is not None:
+                self.cache.put(cache_key, response, latency=latency)
+            return response
+
+        async def hedged_call() -> GroqResponse:
+            delay = self.hedging.hedge_delay(config.model)
+            primary = asyncio.ensure_future(call())
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            reservation = self._try_hedge_reservation(request_messages, config, spend)
+            if reservation is False:
+                return await primary
+            backup = asyncio.ensure_future(call(reservation, backup=True))
+
+            # First success wins and the loser is cancelled
+            pending = {primary, backup}
+            first_error = None
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            loser = primary if task is backup else backup
+                            loser.add_done_callback(self.hedging.record_loser)
+                            self.hedging.record_outcome(task is backup)
+                            return task.result()
+                        first_error = first_error or task.exception()
+                raise first_error
+            finally:
+                for task in pending:
+                    task.cancel()
+
+        attempt = hedged_call if hedge and self.hedging is not None else call
+        operation = current_operation("complete_async")
+        attempts = 0
+
+        async def counted_attempt() -> GroqResponse:
+            nonlocal attempts
+            attempts += 1
+            return await attempt()
+
+        async def call_with_retry() -> GroqResponse:
+            start_time = time.time()
+            try:
+                response = await self.retry_policy.call_async(counted_attempt)
+            except Exception as e:
+                self._observe(operation, config.model, start_time, error=e, retries=attempts - 1)
+                self._journal(operation, request_messages, config, start_time, error=e)
+                raise
+            self._observe(operation, config.model, start_time, response, retries=attempts - 1)
+            self._journal(operation, request_messages, config, start_time, response)
+            return response
+
+        try:
+            if self.flights is None:
+                return await call_with_retry()
+            key = cache_key or request_fingerprint(request_messages, config)
+            response = await self.flights.do_async(key, call_with_retry)
+        finally:
+            self._release_spend(spend)
+        if attempts == 0:
+            self.metrics.inc("groq_coalesced_total", operation=operation, model=config.model)
+        return response
+
+    def _request_options(self, config: CompletionConfig) -> Dict[str, Any]:
+        """SDK keyword arguments for a request, bounded by the current deadline"""
+        options = config.to_dict()
+        remaining = remaining_time()
+        if remaining is not None:
+            check_deadline("sending the request")
+            options["timeout"] = remaining
+        return options
+
+    def _create(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        spend: Optional[CostReservation] = None
+    ) -> Any:
+        """Send one chat completion through the key pool or the default client"""
+        if self.key_pool is None:
+            return self.client.chat.completions.create(
+                messages=request_messages,
+                **self._request_options(config)
+            )
+        return self.key_pool.call(
+            lambda client: client.chat.completions.create(
+                messages=request_messages,
+                **self._request_options(config)
+            ),
+            self._reservation_size(request_messages, config),
+            served=lambda key: self._attribute_key(spend, key.api_key)
+        )
+
+    async def _create_async(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        spend: Optional[CostReservation] = None
+    ) -> Any:
+        """Async counterpart of _create"""
+        if self.key_pool is None:
+            return await self.async_client.chat.completions.create(
+                messages=request_messages,
+                **self._request_options(config)
+            )
+        return await self.key_pool.call_async(
+            lambda client: client.chat.completions.create(
+                messages=request_messages,
+                **self._request_options(config)
+            ),
+            self._reservation_size(request_messages, config),
+            served=lambda key: self._attribute_key(spend, key.api_key)
+        )
+
+    def _observe(
+        self,
+        operation: str,
+        model: str,
+        start_time: float,
+        response: Optional[GroqResponse] = None,
+        error: Optional[BaseException] = None,
+        retries: int = 0
+    ):
+        """Record a finished call in the metrics registry"""
+        usage = response.usage if response is not None else None
+        cached = response is not None and response.cached
+        cost = 0.0
+        if usage and not cached:
+            cost = self.calculate_cost(usage["prompt_tokens"], usage["completion_tokens"], model)
+        self.metrics.record_completion(
+            operation, model, time.time() - start_time,
+            usage=usage, cost=cost, retries=retries, cached=cached, error=error
+        )
+
+    def _journal(
+        self,
+        operation: str,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        start_time: float,
+        response: Optional[GroqResponse] = None,
+        error: Optional[BaseException] = None
+    ):
+        """Queue a finished API call for the journal"""
+        if self.journal is not None:
+            self.journal.record(
+                operation, request_messages, config, response, time.time() - start_time, error
+            )
+
+    def _journal_stream(
+        self,
+        operation: str,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        start_time: float,
+        chunks: List[str],
+        usage: Dict[str, int],
+        error: Optional[BaseException]
+    ):
+        """Queue a finished stream for the journal (closed early = "interrupted")"""
+        if self.journal is None:
+            return
+        failure = error if isinstance(error, Exception) else None
+        response = None
+        if chunks and failure is None:
+            response = GroqResponse(
+                content="".join(chunks), model=config.model, usage=usage,
+                finish_reason="stop" if error is None else "interrupted", created_at=datetime.now()
+            )
+        self._journal(operation, request_messages, config, start_time, response, failure)
+
+    def _admit(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig
+    ) -> Tuple[Optional[SchedulerTicket], Optional[RateReservation]]:
+        """
+        Wait for the scheduler (if any) and the rate limiter
 
         Returns:
-            GroqResponse object
+            (scheduler ticket or None, rate reservation or None)
         """
-        if config is None:
-            config = CompletionConfig()
+        size = self._reservation_size(request_messages, config)
+        if self.scheduler is None:
+            return None, self.rate_limiter.acquire(size) if self.rate_limiter is not None else None
+        ticket = self.scheduler.acquire(size, limiter=self.rate_limiter)
+        return ticket, ticket.reservation
 
-        messages = []
-        if system_prompt:
-            messages.append(Message(role="system", content=system_prompt))
-        messages.append(Message(role="user", content=prompt))
+    async def _admit_async(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig
+    ) -> Tuple[Optional[SchedulerTicket], Optional[RateReservation]]:
+        """Async counterpart of _admit"""
+        size = self._reservation_size(request_messages, config)
+        if self.scheduler is None:
+            return None, await self.rate_limiter.acquire_async(size) if self.rate_limiter is not None else None
+        ticket = await self.scheduler.acquire_async(size, limiter=self.rate_limiter)
+        return ticket, ticket.reservation
+
+    def _leave(self, ticket: Optional[SchedulerTicket], reservation: Optional[RateReservation] = None):
+        """Give back a scheduler slot, and an unused rate reservation if given"""
+        if reservation is not None:
+            self.rate_limiter.release(reservation)
+        if ticket is not None:
+            self.scheduler.release(ticket)
+
+    def _circuit_enter(self, reservation: Optional[RateReservation] = None) -> bool:
+        """Ask the circuit breaker to let a call through; True for a half-open probe"""
+        if self.circuit_breaker is None:
+            return False
+        try:
+            return self.circuit_breaker.before_call()
+        except CircuitOpen:
+            self.metrics.inc("groq_circuit_rejections_total")
+            if reservation is not None:
+                self.rate_limiter.release(reservation)
+            raise
+
+    def _circuit_exit(self, probe: bool, error: Optional[BaseException] = None, counted: bool = True):
+        """Report a call's outcome to the circuit breaker"""
+        if self.circuit_breaker is None:
+            return
+        # Our own deadline, budget or cancellation says nothing about Groq's health
+        if error is not None and (
+            not isinstance(error, Exception)
+            or isinstance(error, (DeadlineExceeded, BudgetExceeded))
+            or remaining_time() == 0.0
+        ):
+            counted = False
+        self.circuit_breaker.record(probe, error, counted)
+
+    def _cost_labels(self) -> Dict[str, Optional[str]]:
+        """
+        Scope values the current call is budgeted under
+
+        With a key pool the key is not known until the pool picks one, so
+        the api_key scope is filled in by _attribute_key.
+        """
+        return {
+            "api_key": api_key_label(self.api_key) if self.key_pool is None else None,
+            "session": _current_session.get(),
+            "task": _current_task.get() or current_operation("complete"),
+        }
+
+    def _preflight(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig
+    ) -> Tuple[CompletionConfig, Optional[CostReservation]]:
+        """
+        Check a call against the cost budgets before it is queued
+
+        Returns:
+            The config to send (its model may have been downgraded) and the
+            cost reservation, or (config, None) without a governor
+        """
+        if self.governor is None:
+            return config, None
+        try:
+            spend = self.governor.admit(
+                config.model,
+                self.token_counter.count_messages(request_messages, config.model),
+                config.max_tokens or DEFAULT_COMPLETION_RESERVATION,
+                self._cost_labels()
+            )
+        except BudgetExceeded as e:
+            self.metrics.inc("groq_budget_rejections_total", scope=e.scope)
+            raise
+        return self._apply_spend(config, spend), spend
 
-        completion = await self.async_client.chat.completions.create(
-            messages=[msg.to_dict() for msg in messages],
-            **config.to_dict()
+    async def _preflight_async(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig
+    ) -> Tuple[CompletionConfig, Optional[CostReservation]]:
+        """Async counterpart of _preflight"""
+        if self.governor is None:
+            return config, None
+        try:
+            spend = await self.governor.admit_async(
+                config.model,
+                self.token_counter.count_messages(request_messages, config.model),
+                config.max_tokens or DEFAULT_COMPLETION_RESERVATION,
+                self._cost_labels()
+            )
+        except BudgetExceeded as e:
+            self.metrics.inc("groq_budget_rejections_total", scope=e.scope)
+            raise
+        return self._apply_spend(config, spend), spend
+
+    def _apply_spend(self, config: CompletionConfig, spend: CostReservation) -> CompletionConfig:
+        if spend.downgraded_from is None:
+            return config
+        logger.warning(f"Budget nearly spent, downgrading {spend.downgraded_from} to {spend.model}")
+        self.metrics.inc(
+            "groq_budget_downgrades_total", requested=spend.downgraded_from, model=spend.model
         )
+        return replace(config, model=spend.model)
+
+    def _attribute_key(self, spend: Optional[CostReservation], api_key: str):
+        """Book a call's spend to the API key that actually served it"""
+        if spend is not None and self.key_pool is not None:
+            self.governor.attribute(spend, "api_key", api_key_label(api_key))
+
+    def _charge(self, spend: Optional[CostReservation], usage: Dict[str, int], model: str):
+        """Count one API call's actual cost against the reservation's budgets"""
+        if spend is not None:
+            self.governor.charge(
+                spend, self.calculate_cost(usage["prompt_tokens"], usage["completion_tokens"], model)
+            )
+
+    def _release_spend(self, spend: Optional[CostReservation]):
+        if spend is not None:
+            self.governor.release(spend)
+
+    def _try_hedge_reservation(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig,
+        spend: Optional[CostReservation] = None
+    ) -> Union[RateReservation, None, bool]:
+        """
+        Check whether a hedge may be fired right now
 
-        return GroqResponse.from_completion(completion)
+        Returns False if the spend cap, a cost budget or the rate limiter
+        says no, otherwise the rate reservation for the hedge (None when no
+        limiter is configured).
+        """
+        if spend is not None and not self.governor.has_headroom(spend):
+            self.hedging.skip()
+            return False
+        reservation = None
+        if self.rate_limiter is not None:
+            reservation = self.rate_limiter.try_acquire(
+                self._reservation_size(request_messages, config)
+            )
+            if reservation is None:
+                self.hedging.skip()
+                return False
+        if not self.hedging.allow_hedge():
+            if reservation is not None:
+                self.rate_limiter.release(reservation)
+            return False
+        return reservation
+
+    def _reservation_size(
+        self,
+        request_messages: List[Dict[str, str]],
+        config: CompletionConfig
+    ) -> int:
+        """Token reservation for the rate limiter: prompt estimate + max_tokens"""
+        prompt_tokens = self.token_counter.count_messages(request_messages, config.model)
+        if self.rate_limiter is None:
+            return prompt_tokens + (config.max_tokens or DEFAULT_COMPLETION_RESERVATION)
+        return self.rate_limiter.reservation_size(prompt_tokens, config.max_tokens)
+
+    def _should_cache(self, config: CompletionConfig, use_cache: Optional[bool]) -> bool:
+        """Decide whether a request may be served from / stored in the cache"""
+        if self.cache is None or config.stream:
+            return False
+        if use_cache is not None:
+            return use_cache
+        return config.temperature in CACHEABLE_TEMPERATURES
+
+    def _record_turn(self, conversation_id: Optional[str], prompt: str, reply: str):
+        """Append a user/assistant exchange to a conversation"""
+        if not conversation_id:
+            return
+        self.conversations.append(conversation_id, [
+            Message(role="user", content=prompt),
+            Message(role="assistant", content=reply)
+        ])
 
     # ========================================================================
     # RECRUITMENT-SPECIFIC METHODS
     # ========================================================================
 
-    def parse_cv(
+    def _parse_cv_request(
         self,
         cv_text: str,
         extract_skills: bool = True,
         extract_experience: bool = True,
         extract_education: bool = True
-    ) -> Dict[str, Any]:
-        """
-        Parse a CV and extract structured information
-
-        Args:
-            cv_text: Raw CV text
-            extract_skills: Whether to extract skills
-            extract_experience: Whether to extract work experience
-            extract_education: Whether to extract education
-
-        Returns:
-            Structured CV data
-        """
+    ) -> Tuple[str, str, CompletionConfig]:
+        """Build the system prompt, user prompt and config for parse_cv"""
         system_prompt = """You are an expert CV parser for a recruitment agency.
 Extract structured information from CVs in JSON format.
 Be thorough and accurate. Extract all relevant information."""
@@ -390,6 +3407,38 @@ Return ONLY valid JSON with the structure:
             max_tokens=2000
         )
 
+        return system_prompt, user_prompt, config
+
+    @log_completion
+    @degrades_to(TaskType.CV_PARSING)
+    def parse_cv(
+        self,
+        cv_text: str,
+        extract_skills: bool = True,
+        extract_experience: bool = True,
+        extract_education: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Parse a CV and extract structured information
+
+        Args:
+            cv_text: Raw CV text
+            extract_skills: Whether to extract skills
+            extract_experience: Whether to extract work experience
+            extract_education: Whether to extract education
+
+        Returns:
+            Structured CV data
+        """
+        system_prompt, user_prompt, config = self._parse_cv_request(
+            cv_text, extract_skills, extract_experience, extract_education
+        )
+
+        if self.router is not None:
+            return self.complete_routed(TaskType.CV_PARSING, user_prompt, system_prompt, config, CV_SCHEMA)
+        if self.structured_output:
+            return self.complete_structured(user_prompt, system_prompt, config, CV_SCHEMA)
+
         response = self.complete(user_prompt, system_prompt, config)
 
         try:
@@ -398,6 +3447,35 @@ Return ONLY valid JSON with the structure:
             logger.error("Failed to parse CV response as JSON")
             return {"raw_response": response.content}
 
+    @log_completion
+    def parse_cv_stream(
+        self,
+        cv_text: str,
+        extract_skills: bool = True,
+        extract_experience: bool = True,
+        extract_education: bool = True
+    ) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Stream CV parsing, yielding each top-level field as soon as it closes
+
+        Args:
+            cv_text: Raw CV text
+            extract_skills: Whether to extract skills
+            extract_experience: Whether to extract work experience
+            extract_education: Whether to extract education
+
+        Yields:
+            (field, value) pairs, e.g. ("personal_info", {...}) before ("experience", [...])
+        """
+        system_prompt, user_prompt, config = self._parse_cv_request(
+            cv_text, extract_skills, extract_experience, extract_education
+        )
+        yield from self.complete_json_stream(
+            user_prompt, system_prompt, config, operation="parse_cv_stream"
+        )
+
+    @log_completion
+    @degrades_to(TaskType.JOB_MATCHING)
     def match_candidate_to_job(
         self,
         candidate_profile: Dict[str, Any],
@@ -440,6 +3518,11 @@ Provide analysis in JSON format:
             max_tokens=1500
         )
 
+        if self.router is not None:
+            return self.complete_routed(TaskType.JOB_MATCHING, user_prompt, system_prompt, config, MATCH_SCHEMA)
+        if self.structured_output:
+            return self.complete_structured(user_prompt, system_prompt, config, MATCH_SCHEMA)
+
         response = self.complete(user_prompt, system_prompt, config)
 
         try:
@@ -448,6 +3531,8 @@ Provide analysis in JSON format:
             logger.error("Failed to parse matching response as JSON")
             return {"raw_response": response.content}
 
+    @log_completion
+    @degrades_to(TaskType.JOB_DESCRIPTION)
     def generate_job_description(
         self,
         job_title: str,
@@ -510,6 +3595,8 @@ Make it compelling and professional."""
         response = self.complete(user_prompt, system_prompt, config)
         return response.content
 
+    @log_completion
+    @degrades_to(TaskType.EMAIL_GENERATION)
     def generate_email(
         self,
         email_type: str,
@@ -553,7 +3640,7 @@ Tone: {tone}"""
         response = self.complete(user_prompt, system_prompt, config)
         return response.content
 
-    def generate_interview_questions(
+    def _generate_interview_questions_request(
         self,
         job_title: str,
         required_skills: List[str],
@@ -561,21 +3648,8 @@ Tone: {tone}"""
         num_questions: int = 10,
         include_behavioral: bool = True,
         include_technical: bool = True
-    ) -> List[Dict[str, str]]:
-        """
-        Generate interview questions for a position
-
-        Args:
-            job_title: Job title
-            required_skills: List of required skills
-            experience_level: junior, mid, senior, or executive
-            num_questions: Number of questions to generate
-            include_behavioral: Include behavioral questions
-            include_technical: Include technical questions
-
-        Returns:
-            List of questions with categories
-        """
+    ) -> Tuple[str, str, CompletionConfig]:
+        """Build the system prompt, user prompt and config for generate_interview_questions"""
         system_prompt = """You are an expert interviewer and talent assessor.
 Generate insightful interview questions tailored to specific roles."""
 
@@ -598,6 +3672,47 @@ Return as JSON array:
             max_tokens=2000
         )
 
+        return system_prompt, user_prompt, config
+
+    @log_completion
+    @degrades_to(TaskType.INTERVIEW_QUESTIONS)
+    def generate_interview_questions(
+        self,
+        job_title: str,
+        required_skills: List[str],
+        experience_level: str = "mid",
+        num_questions: int = 10,
+        include_behavioral: bool = True,
+        include_technical: bool = True
+    ) -> List[Dict[str, str]]:
+        """
+        Generate interview questions for a position
+
+        Args:
+            job_title: Job title
+            required_skills: List of required skills
+            experience_level: junior, mid, senior, or executive
+            num_questions: Number of questions to generate
+            include_behavioral: Include behavioral questions
+            include_technical: Include technical questions
+
+        Returns:
+            List of questions with categories
+        """
+        system_prompt, user_prompt, config = self._generate_interview_questions_request(
+            job_title, required_skills, experience_level, num_questions, include_behavioral, include_technical
+        )
+
+        if self.router is not None:
+            return self.complete_routed(
+                TaskType.INTERVIEW_QUESTIONS, user_prompt, system_prompt, config,
+                INTERVIEW_QUESTIONS_SCHEMA
+            )
+        if self.structured_output:
+            return self.complete_structured(
+                user_prompt, system_prompt, config, INTERVIEW_QUESTIONS_SCHEMA
+            )
+
         response = self.complete(user_prompt, system_prompt, config)
 
         try:
@@ -606,21 +3721,43 @@ Return as JSON array:
             logger.error("Failed to parse interview questions as JSON")
             return []
 
-    def extract_skills(
+    @log_completion
+    def generate_interview_questions_stream(
         self,
-        text: str,
-        categorize: bool = True
-    ) -> Union[List[str], Dict[str, List[str]]]:
+        job_title: str,
+        required_skills: List[str],
+        experience_level: str = "mid",
+        num_questions: int = 10,
+        include_behavioral: bool = True,
+        include_technical: bool = True
+    ) -> Generator[Tuple[int, Dict[str, str]], None, None]:
         """
-        Extract skills from text (CV, job description, etc.)
+        Stream interview questions, yielding each one as soon as it is complete
 
         Args:
-            text: Text to analyze
-            categorize: Whether to categorize skills (technical, soft, domain)
+            job_title: Job title
+            required_skills: List of required skills
+            experience_level: junior, mid, senior, or executive
+            num_questions: Number of questions to generate
+            include_behavioral: Include behavioral questions
+            include_technical: Include technical questions
 
-        Returns:
-            List of skills or categorized dictionary
+        Yields:
+            (index, question) pairs
         """
+        system_prompt, user_prompt, config = self._generate_interview_questions_request(
+            job_title, required_skills, experience_level, num_questions, include_behavioral, include_technical
+        )
+        yield from self.complete_json_stream(
+            user_prompt, system_prompt, config, operation="generate_interview_questions_stream"
+        )
+
+    def _extract_skills_request(
+        self,
+        text: str,
+        categorize: bool = True
+    ) -> Tuple[str, str, CompletionConfig]:
+        """Build the system prompt, user prompt and config for extract_skills"""
         system_prompt = """You are an expert at identifying professional skills and competencies."""
 
         if categorize:
@@ -647,6 +3784,35 @@ Return: ["skill1", "skill2", ...]"""
             max_tokens=1000
         )
 
+        return system_prompt, user_prompt, config
+
+    @log_completion
+    @degrades_to(TaskType.SKILL_EXTRACTION)
+    def extract_skills(
+        self,
+        text: str,
+        categorize: bool = True
+    ) -> Union[List[str], Dict[str, List[str]]]:
+        """
+        Extract skills from text (CV, job description, etc.)
+
+        Args:
+            text: Text to analyze
+            categorize: Whether to categorize skills (technical, soft, domain)
+
+        Returns:
+            List of skills or categorized dictionary
+        """
+        system_prompt, user_prompt, config = self._extract_skills_request(
+            text, categorize
+        )
+
+        schema = SKILLS_SCHEMA if categorize else SKILLS_LIST_SCHEMA
+        if self.router is not None:
+            return self.complete_routed(TaskType.SKILL_EXTRACTION, user_prompt, system_prompt, config, schema)
+        if self.structured_output:
+            return self.complete_structured(user_prompt, system_prompt, config, schema)
+
         response = self.complete(user_prompt, system_prompt, config)
 
         try:
@@ -655,6 +3821,31 @@ Return: ["skill1", "skill2", ...]"""
             logger.error("Failed to parse skills as JSON")
             return [] if not categorize else {}
 
+    @log_completion
+    def extract_skills_stream(
+        self,
+        text: str,
+        categorize: bool = True
+    ) -> Generator[Tuple[Union[str, int], Any], None, None]:
+        """
+        Stream skill extraction, yielding results as soon as they close
+
+        Args:
+            text: Text to analyze
+            categorize: Whether to categorize skills (technical, soft, domain)
+
+        Yields:
+            (category, skills) pairs when categorize is True, otherwise (index, skill)
+        """
+        system_prompt, user_prompt, config = self._extract_skills_request(
+            text, categorize
+        )
+        yield from self.complete_json_stream(
+            user_prompt, system_prompt, config, operation="extract_skills_stream"
+        )
+
+    @log_completion
+    @degrades_to(TaskType.CANDIDATE_SUMMARY)
     def summarize_candidate(
         self,
         candidate_data: Dict[str, Any],
@@ -687,24 +3878,18 @@ Highlight:
             max_tokens=500
         )
 
+        if self.router is not None:
+            return self.complete_routed(TaskType.CANDIDATE_SUMMARY, user_prompt, system_prompt, config)
+
         response = self.complete(user_prompt, system_prompt, config)
         return response.content
 
-    def analyze_sentiment(
+    def _analyze_sentiment_request(
         self,
         text: str,
         context: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """
-        Analyze sentiment of text (feedback, reviews, etc.)
-
-        Args:
-            text: Text to analyze
-            context: Optional context
-
-        Returns:
-            Sentiment analysis
-        """
+    ) -> Tuple[str, str, CompletionConfig]:
+        """Build the system prompt, user prompt and config for analyze_sentiment"""
         system_prompt = """You are an expert in sentiment analysis and text interpretation."""
 
         user_prompt = f"""Analyze the sentiment of this text:
@@ -727,6 +3912,36 @@ Return JSON:
             max_tokens=800
         )
 
+        return system_prompt, user_prompt, config
+
+    @log_completion
+    @degrades_to(TaskType.SENTIMENT_ANALYSIS)
+    def analyze_sentiment(
+        self,
+        text: str,
+        context: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze sentiment of text (feedback, reviews, etc.)
+
+        Args:
+            text: Text to analyze
+            context: Optional context
+
+        Returns:
+            Sentiment analysis
+        """
+        system_prompt, user_prompt, config = self._analyze_sentiment_request(
+            text, context
+        )
+
+        if self.router is not None:
+            return self.complete_routed(
+                TaskType.SENTIMENT_ANALYSIS, user_prompt, system_prompt, config, SENTIMENT_SCHEMA
+            )
+        if self.structured_output:
+            return self.complete_structured(user_prompt, system_prompt, config, SENTIMENT_SCHEMA)
+
         response = self.complete(user_prompt, system_prompt, config)
 
         try:
@@ -735,63 +3950,668 @@ Return JSON:
             logger.error("Failed to parse sentiment analysis as JSON")
             return {"raw_response": response.content}
 
+    @log_completion
+    def analyze_sentiment_stream(
+        self,
+        text: str,
+        context: Optional[str] = None
+    ) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Stream sentiment analysis, yielding each field as soon as it closes
+
+        Args:
+            text: Text to analyze
+            context: Optional context
+
+        Yields:
+            (field, value) pairs, e.g. ("sentiment", "positive") first
+        """
+        system_prompt, user_prompt, config = self._analyze_sentiment_request(
+            text, context
+        )
+        yield from self.complete_json_stream(
+            user_prompt, system_prompt, config, operation="analyze_sentiment_stream"
+        )
+
+    # ========================================================================
+    # PACKED BULK METHODS
+    # ========================================================================
+
+    def _complete_packed(
+        self,
+        task: TaskType,
+        items: List[str],
+        system_prompt: str,
+        instruction: str,
+        result_format: str,
+        schema: Dict[str, Any],
+        config: CompletionConfig,
+        fallback: Callable[[int], Any],
+        pack_size: int = 8,
+        max_concurrent: int = 5
+    ) -> List[Any]:
+        """
+        Answer many small tasks with a few packed requests
+
+        Items are grouped pack_size at a time, sent concurrently, and the JSON
+        array answers are split back per item. Any item whose result is
+        missing or invalid is retried on its own through fallback.
+
+        Args:
+            task: Task type (used for metric labels)
+            items: Item texts
+            system_prompt: Shared system prompt, sent once per pack
+            instruction: Per-item instruction
+            result_format: Example shape of one result
+            schema: Schema every result must satisfy
+            config: Single-item configuration; max_tokens is scaled per pack
+            fallback: Callable(index) answering one item individually
+            pack_size: Items per request
+            max_concurrent: Packed requests in flight at once
+
+        Returns:
+            Results in item order
+        """
+        if not items:
+            return []
+        pack_size = max(1, pack_size)
+        validate = get_validator(schema)
+        packs = [
+            list(range(start, min(start + pack_size, len(items))))
+            for start in range(0, len(items), pack_size)
+        ]
+        prompts = [
+            pack_prompt(instruction, result_format, [items[i] for i in pack])
+            for pack in packs
+        ]
+        per_item_tokens = config.max_tokens or 1000
+        pack_config = replace(
+            config,
+            max_tokens=min(per_item_tokens * len(packs[0]), MAX_PACK_TOKENS)
+        )
+
+        results: List[Any] = [None] * len(items)
+        answered = [False] * len(items)
+        with cost_scope(task=task):
+            responses = self.batch_complete(
+                prompts, system_prompt, pack_config, max_concurrent, return_exceptions=True
+            )
+        for pack, response in zip(packs, responses):
+            if isinstance(response, Exception):
+                logger.warning(f"Packed {task.value} request failed: {response}")
+                continue
+            for local_index, value in unpack_results(response.content, len(pack), validate).items():
+                results[pack[local_index]] = value
+                answered[pack[local_index]] = True
+
+        missing = [index for index, done in enumerate(answered) if not done]
+        self.metrics.inc(
+            "groq_packed_items_total", len(items) - len(missing), task=task.value, outcome="packed"
+        )
+        if missing:
+            self.metrics.inc(
+                "groq_packed_items_total", len(missing), task=task.value, outcome="fallback"
+            )
+            logger.info(f"Packed {task.value}: {len(missing)}/{len(items)} items fell back to single calls")
+            with cost_scope(task=task), ThreadPoolExecutor(max_workers=max(1, max_concurrent)) as pool:
+                futures = [pool.submit(contextvars.copy_context().run, fallback, index) for index in missing]
+                for index, future in zip(missing, futures):
+                    results[index] = future.result()
+        return results
+
+    @log_completion
+    def extract_skills_packed(
+        self,
+        texts: List[str],
+        categorize: bool = True,
+        pack_size: int = 8,
+        max_concurrent: int = 5
+    ) -> List[Union[Dict[str, List[str]], List[str]]]:
+        """
+        Extract skills from many texts, several texts per request
+
+        Args:
+            texts: Texts to analyze
+            categorize: Whether to categorize skills
+            pack_size: Texts per request
+            max_concurrent: Packed requests in flight at once
+
+        Returns:
+            One extract_skills result per text, in order
+        """
+        system_prompt, _, config = self._extract_skills_request("", categorize)
+        if categorize:
+            instruction = "Extract and categorize all skills from each text."
+            result_format = """{"technical": [], "soft_skills": [], "domain_knowledge": [], "tools_and_technologies": []}"""
+        else:
+            instruction = "Extract all skills mentioned in each text."
+            result_format = """["skill1", "skill2", ...]"""
+
+        return self._complete_packed(
+            TaskType.SKILL_EXTRACTION, texts, system_prompt, instruction, result_format,
+            SKILLS_SCHEMA if categorize else SKILLS_LIST_SCHEMA, config,
+            lambda index: self.extract_skills(texts[index], categorize),
+            pack_size, max_concurrent
+        )
+
+    @log_completion
+    def analyze_sentiment_packed(
+        self,
+        texts: List[str],
+        context: Optional[str] = None,
+        pack_size: int = 8,
+        max_concurrent: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze the sentiment of many texts, several texts per request
+
+        Args:
+            texts: Texts to analyze
+            context: Optional context shared by all texts
+            pack_size: Texts per request
+            max_concurrent: Packed requests in flight at once
+
+        Returns:
+            One analyze_sentiment result per text, in order
+        """
+        system_prompt, _, config = self._analyze_sentiment_request("", context)
+        instruction = "Analyze the sentiment of each text."
+        if context:
+            instruction += f"\nContext: {context}"
+        result_format = """{
+  "sentiment": "positive|negative|neutral|mixed",
+  "confidence": 0.0-1.0,
+  "key_themes": [],
+  "emotional_tone": "",
+  "summary": ""
+}"""
+
+        return self._complete_packed(
+            TaskType.SENTIMENT_ANALYSIS, texts, system_prompt, instruction, result_format,
+            SENTIMENT_SCHEMA, config,
+            lambda index: self.analyze_sentiment(texts[index], context),
+            pack_size, max_concurrent
+        )
+
+    @log_completion
+    def summarize_candidates_packed(
+        self,
+        candidates: List[Dict[str, Any]],
+        max_length: int = 200,
+        pack_size: int = 8,
+        max_concurrent: int = 5
+    ) -> List[str]:
+        """
+        Summarize many candidates, several candidates per request
+
+        Args:
+            candidates: Candidate records
+            max_length: Maximum words per summary
+            pack_size: Candidates per request
+            max_concurrent: Packed requests in flight at once
+
+        Returns:
+            One summary per candidate, in order
+        """
+        system_prompt = """You are an expert at creating concise, impactful candidate summaries."""
+        instruction = f"""Create a {max_length}-word professional summary for each candidate.
+
+Highlight:
+- Key strengths
+- Relevant experience
+- Notable achievements
+- Career trajectory"""
+        config = CompletionConfig(
+            temperature=Temperature.BALANCED.value,
+            max_tokens=500
+        )
+
+        return self._complete_packed(
+            TaskType.CANDIDATE_SUMMARY,
+            [json.dumps(candidate, indent=2) for candidate in candidates],
+            system_prompt, instruction, '"summary text"', {"type": "string"}, config,
+            lambda index: self.summarize_candidate(candidates[index], max_length),
+            pack_size, max_concurrent
+        )
+
+    # ========================================================================
+    # OFFLINE BATCH JOBS
+    # ========================================================================
+
+    def queue_batch(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        config: Optional[CompletionConfig] = None,
+        custom_id: Optional[str] = None
+    ) -> str:
+        """
+        Queue a call for the next offline batch job
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            config: Completion configuration
+            custom_id: Id used to match the result (generated if omitted)
+
+        Returns:
+            The request's custom id
+        """
+        if config is None:
+            config = CompletionConfig()
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        custom_id = custom_id or f"req_{uuid.uuid4().hex[:16]}"
+        with self._batch_lock:
+            self._batch_queue.append(BatchRequest(custom_id, messages, config))
+        return custom_id
+
+    def write_batch_file(self, path: Optional[str] = None) -> Tuple[str, List[str]]:
+        """
+        Write queued calls to a JSONL batch input file and empty the queue
+
+        Args:
+            path: Output path (defaults to a new file under batch_dir())
+
+        Returns:
+            Tuple of (file path, custom ids in file order)
+        """
+        with self._batch_lock:
+            requests, self._batch_queue = self._batch_queue, []
+        if not requests:
+            raise ValueError("No queued batch requests")
+
+        if path is None:
+            directory = batch_dir()
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"input_{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}.jsonl")
+        with open(path, "w", encoding="utf-8") as handle:
+            for request in requests:
+                handle.write(request.to_line() + "\n")
+        return path, [request.custom_id for request in requests]
+
+    def submit_batch(self, completion_window: str = "24h", timeout: Optional[float] = None) -> BatchJob:
+        """
+        Submit all queued calls as one batch job
+
+        Args:
+            completion_window: Time the service has to finish the batch
+            timeout: Seconds the upload and submission may take (see deadline)
+
+        Returns:
+            The submitted job
+        """
+        path, custom_ids = self.write_batch_file()
+        with deadline(timeout):
+            file_id = self.batch_transport.upload(path)
+            job = self.batch_transport.create(file_id, completion_window)
+        job.custom_ids = custom_ids
+        logger.info(f"Submitted batch {job.id} with {len(custom_ids)} requests")
+        return job
+
+    def wait_for_batch(
+        self,
+        job: BatchJob,
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None
+    ) -> BatchJob:
+        """
+        Poll a batch until it reaches a terminal status
+
+        Args:
+            job: Job returned by submit_batch
+            poll_interval: Seconds between polls
+            timeout: Give up after this many seconds (None waits until any
+                enclosing deadline)
+
+        Returns:
+            The job in its final state
+
+        Raises:
+            DeadlineExceeded: If the batch is still running at the deadline
+        """
+        with deadline(timeout):
+            while True:
+                latest = self.batch_transport.retrieve(job.id)
+                latest.custom_ids = job.custom_ids
+                if latest.done:
+                    logger.info(f"Batch {latest.id} finished with status {latest.status}")
+                    return latest
+                remaining = remaining_time()
+                if remaining is not None and poll_interval > remaining:
+                    raise DeadlineExceeded(f"Batch {job.id} still {latest.status} at the deadline")
+                time.sleep(poll_interval)
+
+    def batch_results(
+        self,
+        job: BatchJob,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Union[GroqResponse, BatchError]]:
+        """
+        Map a finished batch's output back to request ids
+
+        Args:
+            job: Finished job
+            timeout: Seconds the downloads may take (see deadline)
+
+        Returns:
+            Response (or BatchError) per custom id; ids the service never
+            answered get a BatchError as well
+        """
+        with deadline(timeout):
+            outputs = [
+                self.batch_transport.download(file_id)
+                for file_id in (job.output_file_id, job.error_file_id) if file_id
+            ]
+        results: Dict[str, Union[GroqResponse, BatchError]] = {}
+        for output in outputs:
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                custom_id = item.get("custom_id")
+                response = item.get("response") or {}
+                error = item.get("error")
+                if not error and response.get("status_code") == 200:
+                    results[custom_id] = GroqResponse.from_completion_dict(response["body"])
+                else:
+                    error = error or (response.get("body") or {}).get("error") or {}
+                    results[custom_id] = BatchError(
+                        custom_id, error.get("code"),
+                        error.get("message") or f"status {response.get('status_code')}"
+                    )
+
+        for custom_id in job.custom_ids:
+            if custom_id not in results:
+                results[custom_id] = BatchError(custom_id, None, f"no result (batch {job.status})")
+
+        for result in results.values():
+            if isinstance(result, GroqResponse):
+                self.metrics.inc("groq_batch_requests_total", model=result.model, status="ok")
+                self.metrics.inc("groq_prompt_tokens_total", result.usage["prompt_tokens"], operation="batch", model=result.model)
+                self.metrics.inc("groq_completion_tokens_total", result.usage["completion_tokens"], operation="batch", model=result.model)
+            else:
+                self.metrics.inc("groq_batch_requests_total", model="", status="error")
+        return results
+
+    def run_batch(
+        self,
+        completion_window: str = "24h",
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Union[GroqResponse, BatchError]]:
+        """
+        Submit queued calls, wait for the batch and return results by id
+
+        Args:
+            completion_window: Time the service has to finish the batch
+            poll_interval: Seconds between polls
+            timeout: Seconds the whole run may take, submission and
+                downloads included
+
+        Returns:
+            Response (or BatchError) per custom id
+        """
+        with deadline(timeout):
+            job = self.submit_batch(completion_window)
+            return self.batch_results(self.wait_for_batch(job, poll_interval))
+
     # ========================================================================
     # UTILITY METHODS
     # ========================================================================
 
+    @log_completion
     def batch_complete(
         self,
         prompts: List[str],
         system_prompt: Optional[str] = None,
         config: Optional[CompletionConfig] = None,
-        max_concurrent: int = 5
-    ) -> List[GroqResponse]:
+        max_concurrent: int = 5,
+        adaptive: bool = True,
+        on_result: Optional[Callable[[int, Union[GroqResponse, Exception]], None]] = None,
+        return_exceptions: bool = False
+    ) -> List[Union[GroqResponse, Exception]]:
         """
         Process multiple prompts in batch
 
+        Safe to call with or without a running event loop. A failed prompt
+        does not discard the rest of the batch.
+
         Args:
             prompts: List of prompts
             system_prompt: Optional system prompt
             config: Completion configuration
-            max_concurrent: Maximum concurrent requests
+            max_concurrent: Maximum concurrent requests (initial limit when adaptive)
+            adaptive: Tune concurrency with the client's AIMD controller
+            on_result: Optional callback(index, response_or_error) invoked as
+                each prompt finishes
+            return_exceptions: Return errors in place of responses instead of
+                raising the first one once the batch has finished
 
         Returns:
-            List of responses
+            List of responses in prompt order
+        """
+        results: List[Union[GroqResponse, Exception, None]] = [None] * len(prompts)
+        for index, result in self.batch_complete_stream(
+            prompts, system_prompt, config, max_concurrent, adaptive, on_result
+        ):
+            results[index] = result
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    @log_completion
+    def batch_complete_stream(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        config: Optional[CompletionConfig] = None,
+        max_concurrent: int = 5,
+        adaptive: bool = True,
+        on_result: Optional[Callable[[int, Union[GroqResponse, Exception]], None]] = None
+    ) -> Generator[Tuple[int, Union[GroqResponse, Exception]], None, None]:
+        """
+        Process multiple prompts, yielding each result as soon as it completes
+
+        The batch runs on its own event loop in a worker thread, so this works
+        from plain scripts and from code already inside a loop. Async callers
+        should prefer batch_complete_iter to avoid blocking their loop.
+
+        Args:
+            prompts: List of prompts
+            system_prompt: Optional system prompt
+            config: Completion configuration
+            max_concurrent: Maximum concurrent requests (initial limit when adaptive)
+            adaptive: Tune concurrency with the client's AIMD controller
+            on_result: Optional callback(index, response_or_error) invoked as
+                each prompt finishes
+
+        Yields:
+            (index, GroqResponse or Exception) tuples in completion order
+        """
+        results: queue.Queue = queue.Queue()
+        finished = object()
+        stop = threading.Event()
+
+        async def pump():
+            async for item in self.batch_complete_iter(
+                prompts, system_prompt, config, max_concurrent, adaptive
+            ):
+                results.put(item)
+                if stop.is_set():
+                    break
+
+        def worker():
+            try:
+                asyncio.run(pump())
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(finished)
+
+        thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(worker,), name="groq-batch", daemon=True
+        )
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is finished:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                if on_result is not None:
+                    on_result(*item)
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    @log_completion
+    async def batch_complete_iter(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        config: Optional[CompletionConfig] = None,
+        max_concurrent: int = 5,
+        adaptive: bool = True
+    ) -> AsyncIterator[Tuple[int, Union[GroqResponse, Exception]]]:
+        """
+        Async iterator over batch results in completion order
+
+        Calls are scheduled as RequestPriority.BACKGROUND unless the caller
+        set a priority.
+
+        Args:
+            prompts: List of prompts
+            system_prompt: Optional system prompt
+            config: Completion configuration
+            max_concurrent: Maximum concurrent requests (initial limit when adaptive)
+            adaptive: Tune concurrency with the client's AIMD controller
+
+        Yields:
+            (index, GroqResponse or Exception) tuples
+        """
+        if adaptive and self.concurrency is None:
+            self.concurrency = AdaptiveConcurrency(initial_limit=max_concurrent)
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def process_one(index: int, prompt: str):
+            # Bulk work yields to interactive calls unless told otherwise
+            _current_priority.set(current_priority(RequestPriority.BACKGROUND))
+            try:
+                if not adaptive:
+                    async with semaphore:
+                        return index, await self.complete_async(prompt, system_prompt, config)
+
+                await self.concurrency.acquire()
+                start_time = time.time()
+                try:
+                    response = await self.complete_async(prompt, system_prompt, config)
+                except Exception as e:
+                    self.concurrency.on_error(e)
+                    raise
+                finally:
+                    self.concurrency.release()
+                self.concurrency.on_success(time.time() - start_time)
+                return index, response
+            except Exception as e:
+                return index, e
+
+        tasks = [
+            asyncio.ensure_future(process_one(index, prompt))
+            for index, prompt in enumerate(prompts)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def warm_cache(self, path: str, cacheable_only: bool = True) -> int:
         """
-        async def process_batch():
-            semaphore = asyncio.Semaphore(max_concurrent)
+        Load responses recorded in a journal into the response cache
 
-            async def process_one(prompt):
-                async with semaphore:
-                    return await self.complete_async(prompt, system_prompt, config)
+        Only local files are read (no API calls), so there is no deadline.
+
+        Args:
+            path: Journal file or directory
+            cacheable_only: Skip requests not cached by default
 
-            tasks = [process_one(prompt) for prompt in prompts]
-            return await asyncio.gather(*tasks)
+        Returns:
+            Number of entries loaded
 
-        return asyncio.run(process_batch())
+        Raises:
+            ValueError: If the client has no cache
+        """
+        if self.cache is None:
+            raise ValueError("warm_cache needs a client created with a ResponseCache")
+        loaded = warm_cache_from_journal(self.cache, path, cacheable_only)
+        logger.info(f"Warmed response cache with {loaded} journaled responses")
+        return loaded
 
     def clear_conversation(self, conversation_id: str):
         """Clear conversation history"""
-        if conversation_id in self.conversations:
-            del self.conversations[conversation_id]
+        if self.conversations.clear(conversation_id):
             logger.info(f"Cleared conversation: {conversation_id}")
 
     def get_conversation_history(self, conversation_id: str) -> List[Message]:
         """Get conversation history"""
-        return self.conversations.get(conversation_id, [])
+        return self.conversations.history(conversation_id)
+
+    @log_completion
+    def summarize_turns(self, previous_summary: Optional[str], messages: List[Message]) -> str:
+        """
+        Summarize conversation turns (used for history compaction)
+
+        Args:
+            previous_summary: Existing summary to extend, if any
+            messages: Turns being removed from the history window
+
+        Returns:
+            Updated summary
+        """
+        transcript = "\n".join(f"{msg.role.upper()}: {msg.content}" for msg in messages)
+        user_prompt = f"""{"Existing summary: " + previous_summary if previous_summary else ""}
+
+Update the summary with these conversation turns. Keep facts, decisions,
+names and open questions; drop pleasantries. Reply with the summary only.
+
+{transcript}"""
 
-    def estimate_tokens(self, text: str) -> int:
+        config = CompletionConfig(
+            model=GroqModel.GEMMA2_9B.value,
+            temperature=Temperature.DETERMINISTIC.value,
+            max_tokens=300
+        )
+
+        response = self.complete(
+            user_prompt,
+            "You maintain concise running summaries of recruitment assistant chats.",
+            config,
+            use_cache=False
+        )
+        return response.content.strip()
+
+    def estimate_tokens(self, text: str, model: str = GroqModel.DEFAULT.value) -> int:
         """
-        Estimate token count (rough approximation)
+        Estimate token count
 
         Args:
             text: Text to estimate
+            model: Model whose tokenizer applies
 
         Returns:
             Estimated token count
         """
-        # Rough estimate: ~4 characters per token
-        return len(text) // 4
+        return self.token_counter.count(text, model)
 
     def calculate_cost(
         self,
@@ -801,7 +4621,7 @@ Return JSON:
     ) -> float:
         """
         Calculate approximate cost for API usage
-        Note: GROQ pricing may vary, update these rates
+        Note: GROQ pricing may vary, update the rates in MODEL_PRICING
 
         Args:
             prompt_tokens: Number of prompt tokens
@@ -811,16 +4631,7 @@ Return JSON:
         Returns:
             Estimated cost in USD
         """
-        # Example pricing (update with actual GROQ pricing)
-        pricing = {
-            GroqModel.LLAMA_3_8B.value: {"prompt": 0.05 / 1_000_000, "completion": 0.08 / 1_000_000},
-            GroqModel.LLAMA_3_70B.value: {"prompt": 0.59 / 1_000_000, "completion": 0.79 / 1_000_000},
-            GroqModel.MIXTRAL_8X7B.value: {"prompt": 0.27 / 1_000_000, "completion": 0.27 / 1_000_000},
-        }
-
-        rates = pricing.get(model, pricing[GroqModel.DEFAULT.value])
-        cost = (prompt_tokens * rates["prompt"]) + (completion_tokens * rates["completion"])
-        return cost
+        return estimate_cost(prompt_tokens, completion_tokens, model)
 
     def validate_json_response(self, response: str) -> Optional[Dict[str, Any]]:
         """
@@ -844,36 +4655,84 @@ Return JSON:
             logger.error(f"JSON validation failed: {str(e)}")
             return None
 
-    def get_usage_stats(self) -> Dict[str, int]:
+    def export_metrics(self, format: str = "prometheus") -> str:
+        """
+        Export telemetry
+
+        Args:
+            format: 'prometheus' (text exposition format) or 'json'
+
+        Returns:
+            Serialized metrics
+        """
+        if format == "json":
+            return self.metrics.to_json()
+        return self.metrics.to_prometheus()
+
+    def get_usage_stats(self) -> Dict[str, Any]:
         """
         Get usage statistics for the current session
 
         Returns:
             Usage statistics
         """
-        # This would need to be implemented with proper tracking
-        # Placeholder implementation
-        return {
-            "total_conversations": len(self.conversations),
-            "total_messages": sum(len(msgs) for msgs in self.conversations.values())
-        }
+        stats = self.conversations.stats()
+
+        totals = self.metrics.totals()
+        stats["requests"] = int(totals.get("groq_requests_total", 0))
+        stats["prompt_tokens"] = int(totals.get("groq_prompt_tokens_total", 0))
+        stats["completion_tokens"] = int(totals.get("groq_completion_tokens_total", 0))
+        stats["estimated_cost_usd"] = round(totals.get("groq_cost_usd_total", 0.0), 6)
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.flights is not None:
+            stats["single_flight"] = self.flights.stats()
+        if self.rate_limiter is not None:
+            stats["rate_limiter"] = self.rate_limiter.stats()
+        stats["retries"] = self.retry_policy.stats()
+        if self.hedging is not None:
+            stats["hedging"] = self.hedging.stats()
+        if self.concurrency is not None:
+            stats["concurrency"] = self.concurrency.stats()
+        if self.router is not None:
+            stats["routing"] = self.router.stats()
+        if self.key_pool is not None:
+            stats["key_pool"] = self.key_pool.stats()
+        if self.scheduler is not None:
+            stats["scheduler"] = self.scheduler.stats()
+        if self.governor is not None:
+            stats["budgets"] = self.governor.stats()
+        if self.circuit_breaker is not None:
+            stats["circuit"] = self.circuit_breaker.stats()
+        if self.journal is not None:
+            stats["journal"] = self.journal.stats()
+        return stats
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def create_groq_client(api_key: Optional[str] = None) -> GroqClient:
+def create_groq_client(
+    api_key: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    key_pool: Optional[KeyPool] = None
+) -> GroqClient:
     """
     Factory function to create a GroqClient instance
 
     Args:
         api_key: Optional API key
+        cache: Optional response cache
+        key_pool: Optional API key pool (built from GROQ_API_KEYS when
+            neither api_key nor key_pool is given)
 
     Returns:
         GroqClient instance
     """
-    return GroqClient(api_key)
+    if api_key is None and key_pool is None:
+        key_pool = KeyPool.from_env()
+    return GroqClient(api_key, cache=cache, key_pool=key_pool)
 
 
 def quick_complete(
@@ -896,7 +4755,7 @@ def quick_complete(
     Returns:
         Completion text
     """
-    client = GroqClient(api_key)
+    client = get_shared_client(api_key)
     config = CompletionConfig(model=model, temperature=temperature)
     response = client.complete(prompt, system_prompt, config)
     return response.content
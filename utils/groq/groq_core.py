@@ -0,0 +1,249 @@
+"""
+Shared foundations of the GROQ client
+
+Deferred loading of the groq SDK, the model/task enums and the request and
+response data classes that every other groq_* module builds on.
+"""
+
+import sys
+import json
+import time
+import hashlib
+from typing import List, Dict, Optional, Any, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, asdict
+from enum import Enum
+from datetime import datetime
+import logging
+
+if TYPE_CHECKING:
+    from groq.types.chat import ChatCompletion
+
+
+# ============================================================================
+# DEFERRED INITIALIZATION
+# ============================================================================
+# The groq SDK, httpx, dotenv and logging setup are only needed once a client
+# is built, so short-lived CLIs that import groq_client pay for them lazily.
+
+_runtime_initialized = False
+
+
+def _init_runtime():
+    """Load environment variables and default logging, once per process"""
+    global _runtime_initialized
+    if _runtime_initialized:
+        return
+    _runtime_initialized = True
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+def _groq_sdk():
+    """Import the groq SDK on first use"""
+    try:
+        import groq
+    except ImportError:
+        raise ImportError("Please install groq: pip install groq")
+    return groq
+
+
+def _groq_errors(*names: str) -> Tuple[type, ...]:
+    """
+    groq exception classes by name, if the SDK has been imported
+
+    No groq exception can exist before the SDK is loaded, so error
+    classification never forces the import.
+    """
+    groq = sys.modules.get("groq")
+    if groq is None:
+        return ()
+    return tuple(getattr(groq, name) for name in names)
+
+
+# ============================================================================
+# ENUMS AND CONSTANTS
+# ============================================================================
+
+class GroqModel(Enum):
+    """Available GROQ models"""
+    # Fast models (good for quick operations)
+    LLAMA_3_8B = "llama-3.3-70b-versatile"
+    LLAMA_3_1_8B = "llama-3.1-8b-instant"
+    LLAMA_3_70B = "llama-3.1-70b-versatile"
+
+    # Specialized models
+    MIXTRAL_8X7B = "mixtral-8x7b-32768"
+    GEMMA_7B = "gemma-7b-it"
+    GEMMA2_9B = "gemma2-9b-it"
+
+    # Default recommended model
+    DEFAULT = "llama-3.3-70b-versatile"
+
+
+class Temperature(Enum):
+    """Common temperature settings"""
+    DETERMINISTIC = 0.0
+    CONSERVATIVE = 0.3
+    BALANCED = 0.7
+    CREATIVE = 1.0
+    VERY_CREATIVE = 1.5
+
+
+class TaskType(Enum):
+    """Common recruitment task types"""
+    CV_PARSING = "cv_parsing"
+    JOB_MATCHING = "job_matching"
+    JOB_DESCRIPTION = "job_description"
+    EMAIL_GENERATION = "email_generation"
+    INTERVIEW_QUESTIONS = "interview_questions"
+    CANDIDATE_SUMMARY = "candidate_summary"
+    SKILL_EXTRACTION = "skill_extraction"
+    SENTIMENT_ANALYSIS = "sentiment_analysis"
+    EMAIL_CLASSIFICATION = "email_classification"
+    GENERAL = "general"
+
+
+class RequestPriority(Enum):
+    """Scheduling classes sharing one Groq quota"""
+    INTERACTIVE = "interactive"  # A user is waiting (chat, UI actions)
+    EMAIL = "email"              # Near-real-time inbox processing
+    BACKGROUND = "background"    # Bulk enrichment, backfills, batch jobs
+
+
+# Temperatures at which identical requests are expected to produce the same
+# output, so responses are cached by default
+CACHEABLE_TEMPERATURES = (
+    Temperature.DETERMINISTIC.value,
+    Temperature.CONSERVATIVE.value,
+)
+
+
+# ============================================================================
+# DATA CLASSES
+# ============================================================================
+
+@dataclass
+class Message:
+    """Chat message structure"""
+    role: str  # 'system', 'user', 'assistant'
+    content: str
+    name: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convert to dictionary for API calls"""
+        result = {"role": self.role, "content": self.content}
+        if self.name:
+            result["name"] = self.name
+        return result
+
+
+@dataclass
+class CompletionConfig:
+    """Configuration for completion requests"""
+    model: str = GroqModel.DEFAULT.value
+    temperature: float = Temperature.BALANCED.value
+    max_tokens: Optional[int] = None
+    top_p: float = 1.0
+    stream: bool = False
+    stop: Optional[List[str]] = None
+    presence_penalty: float = 0.0
+    frequency_penalty: float = 0.0
+    n: int = 1
+    response_format: Optional[Dict[str, str]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary, excluding None values"""
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+@dataclass
+class GroqResponse:
+    """Structured response from GROQ API"""
+    content: str
+    model: str
+    usage: Dict[str, int]
+    finish_reason: str
+    created_at: datetime
+    raw_response: Optional['ChatCompletion'] = None
+    cached: bool = False
+    early_stop: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_completion(cls, completion: 'ChatCompletion') -> 'GroqResponse':
+        """Create GroqResponse from API completion"""
+        return cls(
+            content=completion.choices[0].message.content,
+            model=completion.model,
+            usage={
+                "prompt_tokens": completion.usage.prompt_tokens,
+                "completion_tokens": completion.usage.completion_tokens,
+                "total_tokens": completion.usage.total_tokens
+            },
+            finish_reason=completion.choices[0].finish_reason,
+            created_at=datetime.fromtimestamp(completion.created),
+            raw_response=completion
+        )
+
+    @classmethod
+    def from_completion_dict(cls, body: Dict[str, Any]) -> 'GroqResponse':
+        """Create GroqResponse from a chat completion in JSON form (e.g. batch output)"""
+        choice = body["choices"][0]
+        usage = body.get("usage") or {}
+        return cls(
+            content=choice["message"].get("content") or "",
+            model=body.get("model", ""),
+            usage={
+                "prompt_tokens": usage.get("prompt_tokens", 0),
+                "completion_tokens": usage.get("completion_tokens", 0),
+                "total_tokens": usage.get("total_tokens", 0)
+            },
+            finish_reason=choice.get("finish_reason") or "",
+            created_at=datetime.fromtimestamp(body.get("created") or time.time())
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary (without the raw response)"""
+        return {
+            "content": self.content,
+            "model": self.model,
+            "usage": dict(self.usage),
+            "finish_reason": self.finish_reason,
+            "created_at": self.created_at.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], cached: bool = False) -> 'GroqResponse':
+        """Create GroqResponse from a dictionary produced by to_dict"""
+        return cls(
+            content=data["content"],
+            model=data["model"],
+            usage=dict(data["usage"]),
+            finish_reason=data["finish_reason"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            cached=cached
+        )
+
+
+def request_fingerprint(messages: List[Dict[str, str]], config: 'CompletionConfig') -> str:
+    """
+    Hash a request so byte-identical requests map to the same key
+
+    Args:
+        messages: Message dictionaries sent to the API
+        config: Completion configuration (includes the model)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps(
+        {"messages": messages, "config": asdict(config)},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,534 @@
+"""
+Cost governance for the GROQ client
+
+Prices per model, spend estimates held before a call and settled after it,
+and budgets per session, task and API key.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from typing import List, Dict, Optional, Union, Any, Tuple
+from dataclasses import dataclass
+from enum import Enum
+from contextlib import contextmanager
+import asyncio
+import contextvars
+import logging
+
+from groq_core import GroqModel, TaskType, _init_runtime
+from groq_deadlines import bounded_wait
+
+logger = logging.getLogger("groq_client.cost")
+
+
+# ============================================================================
+# COST GOVERNANCE
+# ============================================================================
+
+# Example pricing in USD per token (update with actual GROQ pricing); models
+# not listed are priced like GroqModel.DEFAULT
+MODEL_PRICING = {
+    GroqModel.DEFAULT.value: {"prompt": 0.59 / 1_000_000, "completion": 0.79 / 1_000_000},
+    GroqModel.LLAMA_3_1_8B.value: {"prompt": 0.05 / 1_000_000, "completion": 0.08 / 1_000_000},
+    GroqModel.LLAMA_3_70B.value: {"prompt": 0.59 / 1_000_000, "completion": 0.79 / 1_000_000},
+    GroqModel.MIXTRAL_8X7B.value: {"prompt": 0.27 / 1_000_000, "completion": 0.27 / 1_000_000},
+    GroqModel.GEMMA2_9B.value: {"prompt": 0.20 / 1_000_000, "completion": 0.20 / 1_000_000},
+}
+
+_current_session: contextvars.ContextVar = contextvars.ContextVar("groq_session", default=None)
+_current_task: contextvars.ContextVar = contextvars.ContextVar("groq_task", default=None)
+
+
+def api_key_label(api_key: str) -> str:
+    """
+    Stable label for an API key in budgets and cost stats
+
+    A hash prefix rather than the key's last characters, which can collide
+    between keys and leak part of the secret
+    """
+    return "key_" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int, model: str = GroqModel.DEFAULT.value) -> float:
+    """
+    Approximate cost of a call from MODEL_PRICING
+
+    Args:
+        prompt_tokens: Number of prompt tokens
+        completion_tokens: Number of completion tokens
+        model: Model used
+
+    Returns:
+        Estimated cost in USD
+    """
+    rates = MODEL_PRICING.get(model, MODEL_PRICING[GroqModel.DEFAULT.value])
+    return prompt_tokens * rates["prompt"] + completion_tokens * rates["completion"]
+
+
+@contextmanager
+def cost_scope(session_id: Optional[str] = None, task: Optional[Union[TaskType, str]] = None):
+    """
+    Attribute every Groq call made inside the block to a session and/or task
+
+    Args:
+        session_id: Session (or tenant) whose budget the calls count against
+        task: TaskType (or label) whose budget the calls count against
+    """
+    tokens = []
+    if session_id is not None:
+        tokens.append((_current_session, _current_session.set(str(session_id))))
+    if task is not None:
+        tokens.append((_current_task, _current_task.set(task.value if isinstance(task, TaskType) else str(task))))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class BudgetPolicy(Enum):
+    """What to do with a call that would take a budget past its threshold"""
+    REJECT = "reject"        # Raise BudgetExceeded
+    QUEUE = "queue"          # Wait until spend leaves the window
+    DOWNGRADE = "downgrade"  # Switch to a cheaper model while one fits
+
+
+class BudgetExceeded(Exception):
+    """A call was refused because it would exceed a cost budget"""
+
+    def __init__(self, scope: str, key: str, spent: float, limit: float):
+        super().__init__(f"{scope} budget for {key} exhausted: ${spent:.4f} of ${limit:.4f}")
+        self.scope = scope
+        self.key = key
+        self.spent = spent
+        self.limit = limit
+
+
+@dataclass
+class Budget:
+    """
+    Spending limit for one scope
+
+    scope is "api_key", "session", "task" or "global". With key=None the
+    limit applies to every value of the scope separately (each session gets
+    its own budget); with a key it applies to that value only. API keys are
+    identified by api_key_label(key).
+    """
+    scope: str
+    limit: float
+    window: float = 86400.0
+    policy: BudgetPolicy = BudgetPolicy.REJECT
+    threshold: float = 0.9
+    key: Optional[str] = None
+
+
+@dataclass
+class CostReservation:
+    """Pre-flight estimate held against the budgets a call counts towards"""
+    model: str
+    estimate: float
+    accounts: List[Tuple[Budget, Tuple[str, str, float]]]
+    downgraded_from: Optional[str] = None
+
+
+class CostLedger:
+    """
+    Rolling spend per account, kept in memory.
+
+    An account is (scope, key, window). Spend is grouped into time buckets
+    and expired buckets are dropped from the front as they age out, so
+    reading an account's total is O(1) amortized. With a path, the ledger
+    is loaded at start-up and snapshotted to that JSON file at most every
+    flush_interval seconds (and at exit), so totals survive restarts
+    without a database round-trip per call.
+    """
+
+    def __init__(self, path: Optional[str] = None, bucket_seconds: float = 60.0, flush_interval: float = 5.0):
+        """
+        Initialize the ledger
+
+        Args:
+            path: JSON file to persist totals in (memory only when None)
+            bucket_seconds: Granularity of the rolling windows
+            flush_interval: Minimum seconds between snapshots
+        """
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self.flush_interval = flush_interval
+        self._buckets: Dict[Tuple[str, str, float], deque] = {}
+        self._totals: Dict[Tuple[str, str, float], float] = {}
+        self._pending: Dict[Tuple[str, str, float], float] = {}
+        self._requests: Dict[Tuple[str, str, float], int] = {}
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+            import atexit
+            atexit.register(self.flush)
+
+    def _expire(self, account: Tuple[str, str, float], now: float):
+        buckets = self._buckets.get(account)
+        oldest = (now - account[2]) // self.bucket_seconds
+        while buckets and buckets[0][0] <= oldest:
+            self._totals[account] -= buckets.popleft()[1]
+
+    def spent(self, account: Tuple[str, str, float]) -> float:
+        """Settled spend plus outstanding estimates within the account's window"""
+        with self._lock:
+            self._expire(account, time.time())
+            return self._totals.get(account, 0.0) + self._pending.get(account, 0.0)
+
+    def reserve(self, account: Tuple[str, str, float], amount: float):
+        """Hold an estimate against an account until release"""
+        with self._lock:
+            self._pending[account] = self._pending.get(account, 0.0) + amount
+
+    def release(self, account: Tuple[str, str, float], amount: float):
+        """Drop a held estimate"""
+        with self._lock:
+            self._pending[account] = max(0.0, self._pending.get(account, 0.0) - amount)
+
+    def record(self, account: Tuple[str, str, float], cost: float):
+        """Add settled spend to an account"""
+        now = time.time()
+        bucket = now // self.bucket_seconds
+        with self._lock:
+            buckets = self._buckets.setdefault(account, deque())
+            if buckets and buckets[-1][0] == bucket:
+                buckets[-1][1] += cost
+            else:
+                buckets.append([bucket, cost])
+            self._totals[account] = self._totals.get(account, 0.0) + cost
+            self._requests[account] = self._requests.get(account, 0) + 1
+            flush = self.path and now - self._last_flush >= self.flush_interval
+        if flush:
+            self.flush()
+
+    def accounts(self) -> List[Dict[str, Any]]:
+        """Current totals for every account"""
+        with self._lock:
+            now = time.time()
+            rows = []
+            for account in sorted(set(self._totals) | set(self._pending)):
+                self._expire(account, now)
+                scope, key, window = account
+                rows.append({
+                    "scope": scope,
+                    "key": key,
+                    "window": window,
+                    "spent": self._totals.get(account, 0.0),
+                    "pending": self._pending.get(account, 0.0),
+                    "requests": self._requests.get(account, 0),
+                })
+            return rows
+
+    def flush(self):
+        """Snapshot the ledger to its file (no-op without a path)"""
+        if not self.path:
+            return
+        with self._lock:
+            self._last_flush = time.time()
+            data = [
+                {"account": list(account), "buckets": list(map(list, buckets)),
+                 "requests": self._requests.get(account, 0)}
+                for account, buckets in self._buckets.items()
+            ]
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to write cost ledger {self.path}: {str(e)}")
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cost ledger {self.path}: {str(e)}")
+            return
+        now = time.time()
+        for row in data:
+            account = tuple(row["account"])
+            self._buckets[account] = deque(row["buckets"])
+            self._totals[account] = sum(amount for _, amount in row["buckets"])
+            self._requests[account] = row.get("requests", 0)
+            self._expire(account, now)
+
+
+class CostGovernor:
+    """
+    Enforces cost budgets before calls are sent.
+
+    Every call is estimated up front (prompt tokens plus max_tokens at the
+    model's price) and counted against the budgets for its API key, session,
+    task and the global scope. When an estimate would take a budget past
+    its threshold, the budget's policy decides: reject the call, hold it
+    until earlier spend leaves the window, or switch it to the cheapest
+    model in downgrade_models that still fits under the limit. Estimates
+    are replaced by the actual cost once the call returns.
+    """
+
+    def __init__(
+        self,
+        budgets: List[Budget],
+        ledger: Optional[CostLedger] = None,
+        downgrade_models: Optional[Tuple[str, ...]] = None,
+        max_queue_wait: float = 60.0,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize the governor
+
+        Args:
+            budgets: Budgets to enforce
+            ledger: Where spend is tracked (defaults to an in-memory CostLedger)
+            downgrade_models: Models DOWNGRADE may switch to (defaults to
+                every model in MODEL_PRICING)
+            max_queue_wait: Longest a QUEUE budget holds a call before
+                rejecting it
+            poll_interval: Seconds between budget re-checks while queued
+        """
+        self.budgets = budgets
+        self.ledger = ledger or CostLedger()
+        self.downgrade_models = tuple(downgrade_models or MODEL_PRICING)
+        self.max_queue_wait = max_queue_wait
+        self.poll_interval = poll_interval
+        self.decisions: Dict[str, int] = {"admitted": 0, "downgraded": 0, "queued": 0, "rejected": 0}
+        self._lock = threading.Lock()
+        # Serializes check-then-reserve so concurrent calls cannot overshoot
+        self._admit_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> Optional['CostGovernor']:
+        """
+        Build daily budgets from environment variables
+
+        GROQ_BUDGET_DAILY_USD caps total spend (downgrading, then rejecting,
+        near the cap), GROQ_BUDGET_SESSION_USD caps each session and
+        GROQ_BUDGET_KEY_USD each API key (both rejecting). GROQ_COST_LEDGER
+        names a file to keep the totals in across restarts.
+
+        Returns:
+            CostGovernor, or None if no budget variable is set
+        """
+        _init_runtime()
+        budgets = []
+        for variable, scope, policy in (
+            ("GROQ_BUDGET_DAILY_USD", "global", BudgetPolicy.DOWNGRADE),
+            ("GROQ_BUDGET_SESSION_USD", "session", BudgetPolicy.REJECT),
+            ("GROQ_BUDGET_KEY_USD", "api_key", BudgetPolicy.REJECT),
+        ):
+            value = os.getenv(variable)
+            if value:
+                budgets.append(Budget(scope, float(value), policy=policy))
+        if not budgets:
+            return None
+        kwargs.setdefault("ledger", CostLedger(os.getenv("GROQ_COST_LEDGER")))
+        return cls(budgets, **kwargs)
+
+    def _accounts(self, labels: Dict[str, Optional[str]]) -> List[Tuple[Budget, Tuple[str, str, float]]]:
+        accounts = []
+        for budget in self.budgets:
+            value = "*" if budget.scope == "global" else labels.get(budget.scope)
+            if value is None or (budget.key is not None and budget.key != value):
+                continue
+            accounts.append((budget, (budget.scope, value, budget.window)))
+        return accounts
+
+    def _violations(self, accounts, estimate: float, hard: Tuple[BudgetPolicy, ...] = ()):
+        violations = []
+        for budget, account in accounts:
+            limit = budget.limit * (1.0 if budget.policy in hard else budget.threshold)
+            spent = self.ledger.spent(account)
+            if spent + estimate > limit:
+                violations.append((budget, account, spent))
+        return violations
+
+    def cheaper_model(self, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[str]:
+        """Cheapest model in downgrade_models that costs less than model, if any"""
+        current = estimate_cost(prompt_tokens, completion_tokens, model)
+        cheapest = min(
+            self.downgrade_models,
+            key=lambda candidate: estimate_cost(prompt_tokens, completion_tokens, candidate),
+            default=None
+        )
+        if cheapest is None or estimate_cost(prompt_tokens, completion_tokens, cheapest) >= current:
+            return None
+        return cheapest
+
+    def _decide(self, model: str, prompt_tokens: int, completion_tokens: int, accounts) -> Tuple[Optional[CostReservation], float]:
+        """Returns (reservation, 0) to proceed or (None, seconds) to wait; raises to reject"""
+        estimate = estimate_cost(prompt_tokens, completion_tokens, model)
+        violations = self._violations(accounts, estimate)
+        policies = {budget.policy for budget, _, _ in violations}
+        downgraded_from = None
+
+        if BudgetPolicy.REJECT in policies:
+            budget, account, spent = next(v for v in violations if v[0].policy == BudgetPolicy.REJECT)
+            self._count("rejected")
+            raise BudgetExceeded(budget.scope, account[1], spent, budget.limit)
+
+        if BudgetPolicy.DOWNGRADE in policies:
+            cheaper = self.cheaper_model(model, prompt_tokens, completion_tokens)
+            if cheaper is not None:
+                downgraded_from, model = model, cheaper
+                estimate = estimate_cost(prompt_tokens, completion_tokens, model)
+            # The cheaper model may use the budget up to its full limit
+            violations = self._violations(accounts, estimate, hard=(BudgetPolicy.DOWNGRADE,))
+            downgrading = [v for v in violations if v[0].policy == BudgetPolicy.DOWNGRADE]
+            if downgrading:
+                budget, account, spent = downgrading[0]
+                self._count("rejected")
+                raise BudgetExceeded(budget.scope, account[1], spent, budget.limit)
+
+        queued = [v for v in violations if v[0].policy == BudgetPolicy.QUEUE]
+        if queued:
+            budget, account, spent = queued[0]
+            if estimate > budget.limit * budget.threshold:
+                self._count("rejected")
+                raise BudgetExceeded(budget.scope, account[1], spent, budget.limit)
+            return None, self.poll_interval
+
+        for _, account in accounts:
+            self.ledger.reserve(account, estimate)
+        self._count("downgraded" if downgraded_from else "admitted")
+        return CostReservation(model, estimate, accounts, downgraded_from), 0.0
+
+    def _count(self, decision: str):
+        with self._lock:
+            self.decisions[decision] += 1
+
+    def admit(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        labels: Dict[str, Optional[str]]
+    ) -> CostReservation:
+        """
+        Check a call against the budgets, waiting if a QUEUE budget says so
+
+        Args:
+            model: Requested model
+            prompt_tokens: Estimated prompt tokens
+            completion_tokens: Completion tokens to budget for (max_tokens)
+            labels: Scope values for the call ({"api_key": ..., "session": ..., "task": ...})
+
+        Returns:
+            CostReservation (its model may differ from the requested one)
+
+        Raises:
+            BudgetExceeded: If a budget refuses the call
+        """
+        accounts = self._accounts(labels)
+        if not accounts:
+            return CostReservation(model, 0.0, accounts)
+        give_up_at = time.monotonic() + self.max_queue_wait
+        queued = False
+        while True:
+            with self._admit_lock:
+                reservation, wait = self._decide(model, prompt_tokens, completion_tokens, accounts)
+            if reservation is not None:
+                return reservation
+            if not queued:
+                queued = True
+                self._count("queued")
+            if time.monotonic() + wait > give_up_at:
+                raise self._queue_timeout(accounts)
+            time.sleep(bounded_wait(wait, "waiting for budget"))
+
+    async def admit_async(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        labels: Dict[str, Optional[str]]
+    ) -> CostReservation:
+        """Async counterpart of admit"""
+        accounts = self._accounts(labels)
+        if not accounts:
+            return CostReservation(model, 0.0, accounts)
+        give_up_at = time.monotonic() + self.max_queue_wait
+        queued = False
+        while True:
+            with self._admit_lock:
+                reservation, wait = self._decide(model, prompt_tokens, completion_tokens, accounts)
+            if reservation is not None:
+                return reservation
+            if not queued:
+                queued = True
+                self._count("queued")
+            if time.monotonic() + wait > give_up_at:
+                raise self._queue_timeout(accounts)
+            await asyncio.sleep(bounded_wait(wait, "waiting for budget"))
+
+    def _queue_timeout(self, accounts) -> BudgetExceeded:
+        self._count("rejected")
+        budget, account = next((b, a) for b, a in accounts if b.policy == BudgetPolicy.QUEUE)
+        return BudgetExceeded(budget.scope, account[1], self.ledger.spent(account), budget.limit)
+
+    def has_headroom(self, reservation: CostReservation) -> bool:
+        """Whether another call like this one fits under every threshold (used for hedges)"""
+        return not self._violations(reservation.accounts, reservation.estimate)
+
+    def attribute(self, reservation: CostReservation, scope: str, value: str):
+        """
+        Move a reservation's accounts for scope to another value
+
+        For values only known once the call is under way, such as the API
+        key a KeyPool picked. The held estimate moves with the accounts, so
+        later charges and the release land on the new value.
+
+        Args:
+            reservation: Reservation from admit
+            scope: Scope to re-label (e.g. "api_key")
+            value: The scope's actual value for this call
+        """
+        kept = [(budget, account) for budget, account in reservation.accounts if budget.scope != scope]
+        moved = [account for budget, account in reservation.accounts if budget.scope == scope]
+        added = [(budget, account) for budget, account in self._accounts({scope: value}) if budget.scope == scope]
+        if moved == [account for _, account in added]:
+            return
+        for account in moved:
+            self.ledger.release(account, reservation.estimate)
+        for _, account in added:
+            self.ledger.reserve(account, reservation.estimate)
+        reservation.accounts = kept + added
+
+    def charge(self, reservation: CostReservation, cost: float):
+        """Record the actual cost of one API call made under a reservation"""
+        for _, account in reservation.accounts:
+            self.ledger.record(account, cost)
+
+    def release(self, reservation: CostReservation):
+        """Drop the reservation's estimate once its call has finished"""
+        for _, account in reservation.accounts:
+            self.ledger.release(account, reservation.estimate)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get budget usage and decision counters
+
+        Returns:
+            Decisions so far and spend per account
+        """
+        accounts = self.ledger.accounts()
+        for row in accounts:
+            budget = next((
+                b for b in self.budgets
+                if b.scope == row["scope"] and b.window == row["window"] and b.key in (None, row["key"])
+            ), None)
+            if budget is not None:
+                row["limit"] = budget.limit
+                row["policy"] = budget.policy.value
+        with self._lock:
+            decisions = dict(self.decisions)
+        return {"decisions": decisions, "accounts": accounts}
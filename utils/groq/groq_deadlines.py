@@ -0,0 +1,83 @@
+"""
+Per-call deadlines for the GROQ client
+
+A deadline set with `deadline()` bounds every wait, retry and HTTP request
+made under it, including nested calls.
+"""
+
+import time
+from typing import Optional
+from contextlib import contextmanager
+import contextvars
+
+
+# ============================================================================
+# DEADLINES
+# ============================================================================
+
+# Absolute time.monotonic() by which the current call must finish
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "groq_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The caller's deadline passed before the call could finish"""
+
+
+@contextmanager
+def deadline(timeout: Optional[float]):
+    """
+    Bound every Groq call made inside the block to timeout seconds
+
+    Nested deadlines keep the earliest expiry. The deadline covers rate-limit
+    waits, retries and backoff sleeps, and is passed to the HTTP request as
+    its timeout. None leaves any outer deadline in place.
+
+    Args:
+        timeout: Seconds from now, or None
+    """
+    if timeout is None:
+        yield
+        return
+    expires_at = time.monotonic() + max(0.0, timeout)
+    outer = _current_deadline.get()
+    token = _current_deadline.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline (None when there is none)"""
+    expires_at = _current_deadline.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
+
+
+def check_deadline(what: str = "call"):
+    """Raise DeadlineExceeded if the current deadline has passed"""
+    if remaining_time() == 0.0:
+        raise DeadlineExceeded(f"Deadline exceeded before {what}")
+
+
+def bounded_wait(wait: float, what: str = "waiting") -> float:
+    """
+    Clip a planned sleep to the current deadline
+
+    Args:
+        wait: Seconds the caller intends to sleep
+        what: Description used in the error
+
+    Returns:
+        The sleep to perform
+
+    Raises:
+        DeadlineExceeded: If the sleep would outlast the deadline
+    """
+    remaining = remaining_time()
+    if remaining is not None and wait >= remaining:
+        raise DeadlineExceeded(f"Deadline exceeded while {what}")
+    return wait
@@ -0,0 +1,353 @@
+"""
+Request journal for the GROQ client
+
+Records requests and responses to rotating JSON-lines files off the request
+path, for warming the cache and for replay (see replay_journal.py).
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+from typing import List, Dict, Optional, Any, Tuple, TYPE_CHECKING, Iterator
+from dataclasses import fields as dataclass_fields, asdict
+from datetime import datetime
+import logging
+
+if TYPE_CHECKING:
+    from groq_cache import ResponseCache
+    from groq_client import GroqClient
+
+from groq_core import CACHEABLE_TEMPERATURES, CompletionConfig, GroqModel, GroqResponse, _init_runtime
+from groq_metrics import _current_operation
+
+logger = logging.getLogger("groq_client.journal")
+
+
+# ============================================================================
+# REQUEST JOURNAL
+# ============================================================================
+
+class RequestJournal:
+    """
+    Append-only, gzip-compressed log of requests and their responses.
+
+    record() only puts the entry on a bounded queue; a background thread
+    serializes, compresses and writes it, so the request path never waits
+    on disk. Files are rotated once about max_file_bytes of compressed data
+    has reached disk and the oldest are deleted once the directory exceeds
+    max_total_bytes. If the queue is full the entry is dropped and counted
+    instead of blocking.
+
+    Journals contain full prompts (CV text, emails), so keep the directory
+    as private as the data it holds.
+    """
+
+    FILE_PREFIX = "journal-"
+    FILE_SUFFIX = ".jsonl.gz"
+
+    def __init__(
+        self,
+        directory: str,
+        max_file_bytes: int = 64 * 1024 * 1024,
+        max_total_bytes: int = 1024 * 1024 * 1024,
+        max_queue: int = 10_000,
+        flush_interval: float = 1.0,
+        compresslevel: int = 6
+    ):
+        """
+        Initialize the journal and start its writer thread
+
+        Args:
+            directory: Directory for journal files (created if missing)
+            max_file_bytes: Compressed size at which a new file is started
+            max_total_bytes: Compressed size kept across all files
+            max_queue: Entries buffered before new ones are dropped
+            flush_interval: Seconds between flushes, bounding what a crash loses
+            compresslevel: gzip level (1 fastest, 9 smallest)
+        """
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.flush_interval = flush_interval
+        self.compresslevel = compresslevel
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._raw = None
+        self._gzip = None
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="groq-journal", daemon=True)
+        self._thread.start()
+        import atexit
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls) -> Optional['RequestJournal']:
+        """
+        Build a journal from GROQ_JOURNAL_DIR (and GROQ_JOURNAL_MAX_MB)
+
+        Returns:
+            RequestJournal, or None when GROQ_JOURNAL_DIR is not set
+        """
+        _init_runtime()
+        directory = os.getenv("GROQ_JOURNAL_DIR")
+        if not directory:
+            return None
+        max_mb = os.getenv("GROQ_JOURNAL_MAX_MB")
+        if max_mb:
+            return cls(directory, max_total_bytes=int(float(max_mb) * 1024 * 1024))
+        return cls(directory)
+
+    def record(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        config: 'CompletionConfig',
+        response: Optional['GroqResponse'] = None,
+        latency: float = 0.0,
+        error: Optional[BaseException] = None
+    ):
+        """
+        Queue one request and its outcome for writing
+
+        Args:
+            operation: Operation name (e.g. "extract_skills")
+            messages: Message dictionaries sent to the API
+            config: Completion configuration used
+            response: Response received, if any
+            latency: Seconds the call took
+            error: Exception the call ended with, if any
+        """
+        if self._closed:
+            return
+        # Snapshot now: callers may reuse and mutate the config and messages
+        # before the writer thread gets to this entry
+        request = {
+            "model": config.model,
+            "messages": [dict(message) for message in messages],
+            "config": asdict(config)
+        }
+        try:
+            self._queue.put_nowait((time.time(), operation, request, response, latency, error))
+        except queue.Full:
+            self.dropped += 1
+
+    def _entry(self, item: tuple) -> Dict[str, Any]:
+        timestamp, operation, request, response, latency, error = item
+        return {
+            "ts": timestamp,
+            "operation": operation,
+            "request": request,
+            "response": response.to_dict() if response is not None else None,
+            "latency": round(latency, 4),
+            "error": f"{type(error).__name__}: {error}" if error is not None else None
+        }
+
+    def _open(self):
+        import gzip
+        name = f"{self.FILE_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{self.FILE_SUFFIX}"
+        self._raw = open(os.path.join(self.directory, name), "ab")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="ab", compresslevel=self.compresslevel)
+
+    def _close_file(self):
+        if self._gzip is not None:
+            self._gzip.close()
+            self._raw.close()
+            self._gzip = self._raw = None
+
+    def _rotate(self):
+        self._close_file()
+        self.rotations += 1
+        files = self.files()
+        total = sum(os.path.getsize(path) for path in files)
+        while files and total > self.max_total_bytes:
+            oldest = files.pop(0)
+            total -= os.path.getsize(oldest)
+            os.remove(oldest)
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._gzip is not None:
+                    self._gzip.flush()
+                continue
+            if item is None:
+                self._close_file()
+                return
+            try:
+                if self._gzip is None:
+                    self._open()
+                line = json.dumps(self._entry(item), ensure_ascii=False, default=str) + "\n"
+                self._gzip.write(line.encode("utf-8"))
+                self.written += 1
+                if self._raw.tell() >= self.max_file_bytes:
+                    self._rotate()
+            except Exception as e:
+                self.dropped += 1
+                logger.warning(f"Journal write failed: {e}")
+
+    def files(self) -> List[str]:
+        """Journal files in this directory, oldest first"""
+        return sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith(self.FILE_PREFIX) and name.endswith(self.FILE_SUFFIX)
+        )
+
+    def close(self, timeout: float = 5.0):
+        """Write out queued entries and close the current file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get journal counters
+
+        Returns:
+            Entries written, dropped and queued, rotations and bytes on disk
+        """
+        files = self.files()
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "rotations": self.rotations,
+            "files": len(files),
+            "bytes": sum(os.path.getsize(path) for path in files)
+        }
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read journal entries from a file or a directory of files
+
+    A file still being written ends without a gzip trailer; everything
+    flushed before that point is returned.
+
+    Args:
+        path: Journal file (.jsonl or .jsonl.gz) or directory
+
+    Yields:
+        Entry dictionaries, oldest first
+    """
+    if os.path.isdir(path):
+        paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.endswith((".jsonl", ".jsonl.gz"))
+        )
+    else:
+        paths = [path]
+    import gzip
+    for file_path in paths:
+        opener = gzip.open if file_path.endswith(".gz") else open
+        try:
+            with opener(file_path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line of a file cut off mid-write
+                        break
+        except EOFError:
+            continue
+
+
+def journal_config(entry: Dict[str, Any], **overrides) -> 'CompletionConfig':
+    """
+    Rebuild the CompletionConfig of a journal entry
+
+    Args:
+        entry: Entry from read_journal
+        **overrides: Fields to replace (e.g. model="llama-3.3-70b-versatile")
+
+    Returns:
+        CompletionConfig (fields unknown to this version are ignored)
+    """
+    request = entry["request"]
+    known = {f.name for f in dataclass_fields(CompletionConfig)}
+    values = {k: v for k, v in (request.get("config") or {}).items() if k in known}
+    values.setdefault("model", request.get("model", GroqModel.DEFAULT.value))
+    values.update({k: v for k, v in overrides.items() if v is not None})
+    return CompletionConfig(**values)
+
+
+def warm_cache_from_journal(
+    cache: 'ResponseCache',
+    path: str,
+    cacheable_only: bool = True
+) -> int:
+    """
+    Bulk-load successful journal responses into a response cache
+
+    Entries keep their original age, so the cache's TTL still applies.
+    Later entries for the same request replace earlier ones.
+
+    Args:
+        cache: Cache to fill
+        path: Journal file or directory
+        cacheable_only: Skip requests the client would not serve from the
+            cache by default (streams, non-deterministic temperatures)
+
+    Returns:
+        Number of entries loaded
+    """
+    entries: Dict[str, Tuple['GroqResponse', float, float]] = {}
+    for entry in read_journal(path):
+        if entry.get("error") or not entry.get("response"):
+            continue
+        try:
+            config = journal_config(entry)
+        except (KeyError, TypeError):
+            continue
+        if cacheable_only and (config.stream or config.temperature not in CACHEABLE_TEMPERATURES):
+            continue
+        key = cache.make_key(entry["request"]["messages"], config)
+        entries[key] = (GroqResponse.from_dict(entry["response"]), entry.get("latency") or 0.0, entry["ts"])
+    return cache.put_many(
+        (key, response, latency, created) for key, (response, latency, created) in entries.items()
+    )
+
+
+def replay_entry(
+    client: 'GroqClient',
+    entry: Dict[str, Any],
+    model: Optional[str] = None,
+    system_prompt: Optional[str] = None
+) -> 'GroqResponse':
+    """
+    Send a journaled request again, optionally to another model or with a
+    new system prompt
+
+    Args:
+        client: Client to send it with (the cache is bypassed)
+        entry: Entry from read_journal
+        model: Model to use instead of the recorded one
+        system_prompt: System prompt to use instead of the recorded one
+
+    Returns:
+        The new response
+    """
+    messages = [dict(message) for message in entry["request"]["messages"]]
+    if system_prompt is not None:
+        if messages and messages[0].get("role") == "system":
+            messages[0]["content"] = system_prompt
+        else:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+    config = journal_config(entry, model=model, stream=False)
+    token = _current_operation.set(f"replay:{entry.get('operation') or 'complete'}")
+    try:
+        return client._request(messages, config)
+    finally:
+        _current_operation.reset(token)
@@ -0,0 +1,353 @@
+"""
+API key pool for the GROQ client
+
+Spreads requests over several API keys, each with its own rate limits, and
+cools a key down after it is throttled or fails.
+"""
+
+import os
+import time
+import threading
+from typing import List, Dict, Optional, Any, Callable, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field
+import asyncio
+import logging
+
+if TYPE_CHECKING:
+    from groq import Groq, AsyncGroq
+
+from groq_core import _init_runtime
+from groq_deadlines import bounded_wait
+from groq_retry import get_retry_after, is_retryable_error
+from groq_rate_limit import RateLimiter, RateReservation
+from groq_cost import api_key_label
+from groq_registry import CLIENT_REGISTRY
+
+logger = logging.getLogger("groq_client.key_pool")
+
+
+# ============================================================================
+# API KEY POOL
+# ============================================================================
+
+@dataclass
+class PooledKey:
+    """One API key in a KeyPool with its own clients, limiter and health"""
+    api_key: str
+    limiter: Optional[RateLimiter] = None
+    base_url: Optional[str] = None
+    in_flight: int = 0
+    cooldown_until: float = 0.0
+    consecutive_errors: int = 0
+    disabled: bool = False
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    # (sync, async) clients overriding the registry's, e.g. in tests
+    _clients: Optional[Tuple[Any, Any]] = field(default=None, repr=False)
+
+    @property
+    def client(self) -> 'Groq':
+        """Sync SDK client for this key (created on first use)"""
+        if self._clients is not None:
+            return self._clients[0]
+        return CLIENT_REGISTRY.sdk_clients(self.api_key, self.base_url)[0]
+
+    @property
+    def async_client(self) -> 'AsyncGroq':
+        """Async SDK client for this key and the running event loop"""
+        if self._clients is not None:
+            return self._clients[1]
+        return CLIENT_REGISTRY.async_client(self.api_key, self.base_url)
+
+    @property
+    def name(self) -> str:
+        """Key label for logs and stats (see api_key_label)"""
+        return api_key_label(self.api_key)
+
+    def available(self, now: float) -> bool:
+        """Whether the key may take traffic right now"""
+        return not self.disabled and self.cooldown_until <= now
+
+    def load(self) -> float:
+        """In-flight calls plus how full the key's token bucket is"""
+        if self.limiter is None:
+            return float(self.in_flight)
+        return self.in_flight + self.limiter.utilization()
+
+
+@dataclass
+class KeyLease:
+    """A key checked out for one call, with its rate reservation"""
+    key: PooledKey
+    reservation: Optional[RateReservation] = None
+
+
+class KeyPool:
+    """
+    Spreads calls across several API keys.
+
+    Every key has its own sync/async SDK clients, rate limiter and health.
+    Calls go to the least-loaded available key; a 429 puts that key in
+    cooldown for its Retry-After (or cooldown seconds), repeated transient
+    errors mark it unhealthy for a while, and auth errors disable it. call
+    and call_async fail over to another key when one is throttled.
+    """
+
+    def __init__(
+        self,
+        api_keys: List[str],
+        limiter_factory: Optional[Callable[[], RateLimiter]] = RateLimiter,
+        cooldown: float = 30.0,
+        unhealthy_after: int = 5,
+        unhealthy_cooldown: float = 60.0,
+        base_url: Optional[str] = None
+    ):
+        """
+        Initialize the key pool
+
+        Args:
+            api_keys: Groq API keys
+            limiter_factory: Builds one RateLimiter per key (None disables
+                per-key pacing)
+            cooldown: Seconds a key rests after a 429 without Retry-After
+            unhealthy_after: Consecutive transient errors before a key rests
+            unhealthy_cooldown: Seconds an unhealthy key rests
+            base_url: API base URL for every key (GroqClient fills in its
+                own when left empty)
+        """
+        keys = [key for key in dict.fromkeys(api_keys) if key]
+        if not keys:
+            raise ValueError("KeyPool needs at least one API key")
+        self.keys = [
+            PooledKey(
+                key,
+                limiter=limiter_factory() if limiter_factory is not None else None,
+                base_url=base_url
+            )
+            for key in keys
+        ]
+        self.cooldown = cooldown
+        self.unhealthy_after = unhealthy_after
+        self.unhealthy_cooldown = unhealthy_cooldown
+        self._lock = threading.Lock()
+        self.failovers = 0
+
+    @property
+    def base_url(self) -> Optional[str]:
+        """API base URL the pool's keys send to (None for the Groq API)"""
+        return self.keys[0].base_url
+
+    @base_url.setter
+    def base_url(self, value: Optional[str]):
+        for key in self.keys:
+            key.base_url = value
+
+    @classmethod
+    def from_env(cls, variable: str = "GROQ_API_KEYS", **kwargs) -> Optional['KeyPool']:
+        """
+        Build a pool from a comma-separated environment variable
+
+        Returns:
+            KeyPool, or None if the variable is unset or empty
+        """
+        _init_runtime()
+        keys = [key.strip() for key in os.getenv(variable, "").split(",") if key.strip()]
+        return cls(keys, **kwargs) if keys else None
+
+    def _pick(self, exclude: Tuple[str, ...] = ()) -> Tuple[Optional[PooledKey], float]:
+        """Check out the least-loaded available key, or say how long to wait"""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [key for key in self.keys if not key.disabled and key.api_key not in exclude]
+            if not candidates:
+                raise RuntimeError("No usable API keys left in the pool")
+            ready = [key for key in candidates if key.available(now)]
+            if not ready:
+                return None, max(0.001, min(key.cooldown_until for key in candidates) - now)
+            key = min(ready, key=lambda k: k.load())
+            key.in_flight += 1
+            key.requests += 1
+            return key, 0.0
+
+    def has_alternative(self, exclude: Tuple[str, ...]) -> bool:
+        """Whether an available key outside exclude exists"""
+        now = time.monotonic()
+        with self._lock:
+            return any(key.available(now) and key.api_key not in exclude for key in self.keys)
+
+    def acquire(self, tokens: int = 0, exclude: Tuple[str, ...] = ()) -> KeyLease:
+        """
+        Check out a key, waiting out cooldowns and the key's rate limit
+
+        Args:
+            tokens: Reservation size for the key's limiter
+            exclude: API keys not to use (already tried)
+
+        Returns:
+            KeyLease to pass to release
+        """
+        while True:
+            key, wait = self._pick(exclude)
+            if key is not None:
+                break
+            time.sleep(bounded_wait(wait, "waiting for an API key"))
+        reservation = None
+        if key.limiter is not None:
+            try:
+                reservation = key.limiter.acquire(key.limiter.reservation_size(tokens, 0))
+            except BaseException:
+                self.release(KeyLease(key))
+                raise
+        return KeyLease(key, reservation)
+
+    async def acquire_async(self, tokens: int = 0, exclude: Tuple[str, ...] = ()) -> KeyLease:
+        """Async counterpart of acquire"""
+        while True:
+            key, wait = self._pick(exclude)
+            if key is not None:
+                break
+            await asyncio.sleep(bounded_wait(wait, "waiting for an API key"))
+        reservation = None
+        if key.limiter is not None:
+            try:
+                reservation = await key.limiter.acquire_async(key.limiter.reservation_size(tokens, 0))
+            except BaseException:
+                self.release(KeyLease(key))
+                raise
+        return KeyLease(key, reservation)
+
+    def release(
+        self,
+        lease: KeyLease,
+        error: Optional[BaseException] = None,
+        used_tokens: Optional[int] = None
+    ):
+        """
+        Return a key and update its health
+
+        Args:
+            lease: Lease from acquire
+            error: Exception raised by the call, if it failed
+            used_tokens: Tokens the call actually used
+        """
+        key = lease.key
+        if lease.reservation is not None:
+            if used_tokens is None:
+                key.limiter.release(lease.reservation)
+            else:
+                key.limiter.reconcile(lease.reservation, used_tokens)
+
+        status_code = getattr(error, "status_code", None) if error is not None else None
+        with self._lock:
+            key.in_flight -= 1
+            if error is None:
+                key.consecutive_errors = 0
+            elif status_code == 429:
+                key.throttled += 1
+                rest = get_retry_after(error) or self.cooldown
+                key.cooldown_until = max(key.cooldown_until, time.monotonic() + rest)
+                logger.warning(f"API key {key.name} throttled; resting {rest:.1f}s")
+            elif status_code in (401, 403):
+                key.errors += 1
+                key.disabled = True
+                logger.error(f"API key {key.name} rejected ({status_code}); removed from pool")
+            elif is_retryable_error(error):
+                key.errors += 1
+                key.consecutive_errors += 1
+                if key.consecutive_errors >= self.unhealthy_after:
+                    key.consecutive_errors = 0
+                    key.cooldown_until = time.monotonic() + self.unhealthy_cooldown
+                    logger.warning(f"API key {key.name} unhealthy; resting {self.unhealthy_cooldown:.0f}s")
+
+    def _should_fail_over(self, error: BaseException, tried: Tuple[str, ...]) -> bool:
+        status_code = getattr(error, "status_code", None)
+        if status_code not in (429, 401, 403) and not is_retryable_error(error):
+            return False
+        if self.has_alternative(tried):
+            with self._lock:
+                self.failovers += 1
+            return True
+        return False
+
+    def call(
+        self,
+        fn: Callable[[Any], Any],
+        tokens: int = 0,
+        served: Optional[Callable[[PooledKey], None]] = None
+    ) -> Any:
+        """
+        Run fn(sdk_client) on a pooled key, failing over on throttling
+
+        Args:
+            fn: Callable taking a sync Groq client
+            tokens: Reservation size for the key's limiter
+            served: Optional callback given the key that produced the result
+
+        Returns:
+            fn's result
+        """
+        tried: Tuple[str, ...] = ()
+        while True:
+            lease = self.acquire(tokens, tried)
+            try:
+                result = fn(lease.key.client)
+            except Exception as e:
+                self.release(lease, error=e)
+                tried += (lease.key.api_key,)
+                if self._should_fail_over(e, tried):
+                    continue
+                raise
+            if served is not None:
+                served(lease.key)
+            self.release(lease, used_tokens=_usage_tokens(result))
+            return result
+
+    async def call_async(
+        self,
+        fn: Callable[[Any], Any],
+        tokens: int = 0,
+        served: Optional[Callable[[PooledKey], None]] = None
+    ) -> Any:
+        """Async counterpart of call; fn takes an AsyncGroq client and returns an awaitable"""
+        tried: Tuple[str, ...] = ()
+        while True:
+            lease = await self.acquire_async(tokens, tried)
+            try:
+                result = await fn(lease.key.async_client)
+            except BaseException as e:
+                self.release(lease, error=e)
+                tried += (lease.key.api_key,)
+                if isinstance(e, Exception) and self._should_fail_over(e, tried):
+                    continue
+                raise
+            if served is not None:
+                served(lease.key)
+            self.release(lease, used_tokens=_usage_tokens(result))
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-key load, health and counters"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "failovers": self.failovers,
+                "keys": {
+                    key.name: {
+                        "in_flight": key.in_flight,
+                        "available": key.available(now),
+                        "disabled": key.disabled,
+                        "cooldown_remaining": round(max(0.0, key.cooldown_until - now), 2),
+                        "requests": key.requests,
+                        "throttled": key.throttled,
+                        "errors": key.errors
+                    }
+                    for key in self.keys
+                }
+            }
+
+
+def _usage_tokens(completion: Any) -> Optional[int]:
+    """total_tokens of an SDK completion, if it reports usage"""
+    usage = getattr(completion, "usage", None)
+    return getattr(usage, "total_tokens", None)
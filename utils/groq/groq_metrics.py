@@ -0,0 +1,274 @@
+"""
+Usage telemetry for the GROQ client
+
+Counters, gauges and histograms keyed by operation, model and outcome, with
+Prometheus text export and the operation-name context used to label them.
+"""
+
+import json
+import threading
+from typing import Dict, Optional, Any, Tuple
+import contextvars
+
+
+# ============================================================================
+# TELEMETRY
+# ============================================================================
+
+# Recruitment method currently being served (set by log_completion)
+_current_operation: contextvars.ContextVar = contextvars.ContextVar(
+    "groq_operation", default=None
+)
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+TTFT_BUCKETS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4)
+TOKENS_PER_SECOND_BUCKETS = (25, 50, 100, 200, 400, 800, 1600)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return {
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.counts)},
+            "sum": round(self.sum, 6),
+            "count": self.count
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process registry of GroqClient telemetry.
+
+    Counters and histograms are labelled by operation (the recruitment
+    method that issued the call, e.g. parse_cv) and model, and can be
+    exported as Prometheus text or a JSON snapshot.
+    """
+
+    HELP = {
+        "groq_requests_total": ("counter", "Completed Groq calls"),
+        "groq_prompt_tokens_total": ("counter", "Prompt tokens consumed"),
+        "groq_completion_tokens_total": ("counter", "Completion tokens generated"),
+        "groq_cost_usd_total": ("counter", "Estimated spend in USD"),
+        "groq_retries_total": ("counter", "Retried attempts"),
+        "groq_cache_hits_total": ("counter", "Calls served from the response cache"),
+        "groq_coalesced_total": ("counter", "Calls that shared an identical in-flight request"),
+        "groq_structured_repairs_total": ("counter", "Follow-up prompts sent to repair invalid JSON fields"),
+        "groq_structured_failures_total": ("counter", "Structured answers still invalid after repairs"),
+        "groq_route_requests_total": ("counter", "Router tier attempts per task and model"),
+        "groq_route_escalations_total": ("counter", "Answers escalated to a stronger model"),
+        "groq_route_duration_seconds": ("histogram", "Latency per task and router tier"),
+        "groq_packed_items_total": ("counter", "Items answered inside packed requests, by outcome"),
+        "groq_batch_requests_total": ("counter", "Requests answered by offline batch jobs, by status"),
+        "groq_budget_rejections_total": ("counter", "Calls refused by a cost budget, per scope"),
+        "groq_budget_downgrades_total": ("counter", "Calls switched to a cheaper model by a cost budget"),
+        "groq_circuit_transitions_total": ("counter", "Circuit breaker state changes, by new state"),
+        "groq_circuit_rejections_total": ("counter", "Calls failed fast by the open circuit"),
+        "groq_circuit_state": ("gauge", "Circuit breaker state (0 closed, 1 half-open, 2 open)"),
+        "groq_fallbacks_total": ("counter", "Calls answered by a local fallback, per task"),
+        "groq_scheduler_preemptions_total": ("counter", "Queued background requests passed over for higher priorities"),
+        "groq_scheduler_queue_depth": ("gauge", "Requests waiting in the priority scheduler, per class"),
+        "groq_scheduler_wait_seconds": ("histogram", "Time spent queued in the priority scheduler, per class"),
+        "groq_early_stops_total": ("counter", "Streams closed once their JSON value completed"),
+        "groq_early_stop_saved_tokens_total": ("counter", "Estimated tokens saved by early stops"),
+        "groq_early_stop_saved_seconds_total": ("counter", "Estimated seconds saved by early stops"),
+        "groq_request_duration_seconds": ("histogram", "Call latency"),
+        "groq_operation_duration_seconds": ("histogram", "End-to-end latency per method"),
+        "groq_stream_ttft_seconds": ("histogram", "Streaming time to first token"),
+        "groq_stream_tokens_per_second": ("histogram", "Streaming generation speed"),
+    }
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self._gauges: Dict[Tuple[str, Tuple], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """Increment a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to its current value"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels):
+        """Add an observation to a histogram"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def record_completion(
+        self,
+        operation: str,
+        model: str,
+        latency: float,
+        usage: Optional[Dict[str, int]] = None,
+        cost: float = 0.0,
+        retries: int = 0,
+        cached: bool = False,
+        error: Optional[BaseException] = None
+    ):
+        """
+        Record one completion call
+
+        Args:
+            operation: Method that issued the call
+            model: Model used
+            latency: Seconds the call took
+            usage: Token usage from the response
+            cost: Estimated cost in USD
+            retries: Retried attempts
+            cached: Whether the response came from the cache
+            error: Exception if the call failed
+        """
+        status = "error" if error is not None else "ok"
+        self.inc("groq_requests_total", operation=operation, model=model, status=status)
+        self.observe("groq_request_duration_seconds", latency, operation=operation, model=model)
+        if retries:
+            self.inc("groq_retries_total", retries, operation=operation, model=model)
+        if cached:
+            self.inc("groq_cache_hits_total", operation=operation, model=model)
+        elif usage:
+            self.inc("groq_prompt_tokens_total", usage.get("prompt_tokens", 0), operation=operation, model=model)
+            self.inc("groq_completion_tokens_total", usage.get("completion_tokens", 0), operation=operation, model=model)
+            self.inc("groq_cost_usd_total", cost, operation=operation, model=model)
+
+    def record_stream(self, operation: str, model: str, ttft: Optional[float], tokens: int, duration: float):
+        """
+        Record a finished streaming completion
+
+        Args:
+            operation: Method that issued the call
+            model: Model used
+            ttft: Seconds until the first content chunk (None if none arrived)
+            tokens: Completion tokens streamed
+            duration: Seconds from request to end of stream
+        """
+        if ttft is not None:
+            self.observe("groq_stream_ttft_seconds", ttft, TTFT_BUCKETS, operation=operation, model=model)
+            generation_time = duration - ttft
+            if tokens and generation_time > 0:
+                self.observe(
+                    "groq_stream_tokens_per_second", tokens / generation_time,
+                    TOKENS_PER_SECOND_BUCKETS, operation=operation, model=model
+                )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a JSON-serializable view of every metric
+
+        Returns:
+            {"counters": [...], "gauges": [...], "histograms": [...]}
+        """
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._gauges.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.to_dict()}
+                    for (name, labels), histogram in sorted(self._histograms.items())
+                ]
+            }
+
+    def to_json(self) -> str:
+        """Export the snapshot as JSON"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Export in the Prometheus text exposition format
+
+        Returns:
+            Metrics text suitable for a /metrics endpoint
+        """
+        def fmt(labels: Tuple, extra: Optional[Tuple] = None) -> str:
+            pairs = list(labels) + list(extra or ())
+            if not pairs:
+                return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+        lines = []
+        with self._lock:
+            for metric, (kind, help_text) in self.HELP.items():
+                if kind in ("counter", "gauge"):
+                    values = self._counters if kind == "counter" else self._gauges
+                    series = [(l, v) for (n, l), v in sorted(values.items()) if n == metric]
+                    if not series:
+                        continue
+                    lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+                    lines += [f"{metric}{fmt(l)} {v:g}" for l, v in series]
+                else:
+                    series = [(l, h) for (n, l), h in sorted(self._histograms.items()) if n == metric]
+                    if not series:
+                        continue
+                    lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                    for l, h in series:
+                        for bound, count in zip(h.buckets, h.counts):
+                            lines.append(f"{metric}_bucket{fmt(l, (('le', f'{bound:g}'),))} {count}")
+                        lines.append(f"{metric}_bucket{fmt(l, (('le', '+Inf'),))} {h.count}")
+                        lines.append(f"{metric}_sum{fmt(l)} {h.sum:g}")
+                        lines.append(f"{metric}_count{fmt(l)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def totals(self) -> Dict[str, float]:
+        """
+        Sum every counter across labels
+
+        Returns:
+            Metric name -> total
+        """
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for (name, _), value in self._counters.items():
+                totals[name] = totals.get(name, 0.0) + value
+        return totals
+
+    def reset(self):
+        """Drop all recorded metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._gauges.clear()
+
+
+def current_operation(default: str) -> str:
+    """
+    Name of the recruitment method currently calling the API
+
+    Args:
+        default: Name to use outside any tracked method
+
+    Returns:
+        Operation name
+    """
+    return _current_operation.get() or default
@@ -0,0 +1,394 @@
+"""
+Rate limiting and adaptive concurrency for the GROQ client
+
+Token buckets for requests and tokens per minute, reconciled with actual
+usage, and an AIMD limit on requests in flight.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional, Any
+from dataclasses import dataclass
+import asyncio
+
+from groq_core import _groq_errors
+from groq_deadlines import DeadlineExceeded, bounded_wait, remaining_time
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+@dataclass
+class RateReservation:
+    """Capacity taken from a RateLimiter for one request"""
+    tokens: int
+    waited: float = 0.0
+
+
+# Completion tokens reserved for a request that does not set max_tokens
+DEFAULT_COMPLETION_RESERVATION = 1024
+
+
+class RateLimiter:
+    """
+    Token-bucket governor for Groq's requests-per-minute and
+    tokens-per-minute limits.
+
+    Each request reserves one request slot plus its estimated token cost
+    (prompt estimate + max_tokens) before it is sent, waiting until both
+    buckets have room. Once the response arrives the reservation is
+    reconciled against the real usage so over-estimates are refunded.
+    A single limiter is thread-safe and can pace sync and async calls at once.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 30,
+        tokens_per_minute: int = 6000,
+        headroom: float = 0.9,
+        default_max_tokens: int = DEFAULT_COMPLETION_RESERVATION
+    ):
+        """
+        Initialize the rate limiter
+
+        Args:
+            requests_per_minute: Provider RPM limit
+            tokens_per_minute: Provider TPM limit
+            headroom: Fraction of each limit to actually use (stay just under)
+            default_max_tokens: Completion reservation when max_tokens is unset
+        """
+        self.request_capacity = max(1.0, requests_per_minute * headroom)
+        self.token_capacity = max(1.0, tokens_per_minute * headroom)
+        self.default_max_tokens = default_max_tokens
+
+        self._request_rate = self.request_capacity / 60.0
+        self._token_rate = self.token_capacity / 60.0
+        self._requests = self.request_capacity
+        self._tokens = self.token_capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.total_requests = 0
+        self.total_waits = 0
+        self.total_wait_seconds = 0.0
+        self.refunded_tokens = 0
+
+    def reservation_size(self, prompt_tokens: int, max_tokens: Optional[int]) -> int:
+        """
+        Tokens to reserve for a request
+
+        Args:
+            prompt_tokens: Estimated prompt tokens
+            max_tokens: Completion limit from CompletionConfig
+
+        Returns:
+            Reservation size, capped at the bucket capacity
+        """
+        completion = max_tokens if max_tokens is not None else self.default_max_tokens
+        return int(min(prompt_tokens + completion, self.token_capacity))
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.request_capacity, self._requests + elapsed * self._request_rate)
+        self._tokens = min(self.token_capacity, self._tokens + elapsed * self._token_rate)
+
+    def _try_take(self, tokens: int) -> float:
+        """Take capacity if available; otherwise return seconds to wait"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                self.total_requests += 1
+                return 0.0
+            request_wait = max(0.0, (1 - self._requests) / self._request_rate)
+            token_wait = max(0.0, (tokens - self._tokens) / self._token_rate)
+            return max(request_wait, token_wait, 0.001)
+
+    def acquire(self, tokens: int) -> RateReservation:
+        """
+        Block until a request of the given token cost may be sent
+
+        Args:
+            tokens: Reservation size from reservation_size
+
+        Returns:
+            RateReservation to pass to reconcile/release
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_take(tokens)
+            if wait == 0.0:
+                break
+            time.sleep(bounded_wait(wait, "waiting for rate limit"))
+            waited += wait
+        self._note_wait(waited)
+        return RateReservation(tokens=tokens, waited=waited)
+
+    def try_acquire(self, tokens: int) -> Optional[RateReservation]:
+        """
+        Take capacity only if it is available right now
+
+        Args:
+            tokens: Reservation size from reservation_size
+
+        Returns:
+            RateReservation, or None if the call would have to wait
+        """
+        if self._try_take(tokens) == 0.0:
+            return RateReservation(tokens=tokens)
+        return None
+
+    async def acquire_async(self, tokens: int) -> RateReservation:
+        """Async counterpart of acquire"""
+        waited = 0.0
+        while True:
+            wait = self._try_take(tokens)
+            if wait == 0.0:
+                break
+            await asyncio.sleep(bounded_wait(wait, "waiting for rate limit"))
+            waited += wait
+        self._note_wait(waited)
+        return RateReservation(tokens=tokens, waited=waited)
+
+    def _note_wait(self, waited: float):
+        if waited:
+            with self._lock:
+                self.total_waits += 1
+                self.total_wait_seconds += waited
+
+    def reconcile(self, reservation: RateReservation, used_tokens: int):
+        """
+        Adjust the token bucket to the usage the API actually reported
+
+        Args:
+            reservation: Reservation returned by acquire
+            used_tokens: total_tokens from the response usage
+        """
+        delta = reservation.tokens - used_tokens
+        with self._lock:
+            self._refill(time.monotonic())
+            # Over-estimates are refunded; under-estimates go into debt
+            self._tokens = min(self.token_capacity, self._tokens + delta)
+            if delta > 0:
+                self.refunded_tokens += delta
+
+    def release(self, reservation: RateReservation):
+        """
+        Return the reserved tokens of a request that failed before any usage
+
+        Args:
+            reservation: Reservation returned by acquire
+        """
+        self.reconcile(reservation, 0)
+
+    def utilization(self) -> float:
+        """Fraction of the token bucket currently in use (0.0 - 1.0)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, 1.0 - self._tokens / self.token_capacity)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get limiter state
+
+        Returns:
+            Remaining capacity and wait counters
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "available_requests": round(self._requests, 2),
+                "available_tokens": int(self._tokens),
+                "total_requests": self.total_requests,
+                "total_waits": self.total_waits,
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+                "refunded_tokens": self.refunded_tokens
+            }
+
+
+# ============================================================================
+# ADAPTIVE CONCURRENCY
+# ============================================================================
+
+def is_overload_error(error: BaseException) -> bool:
+    """
+    Check whether an error signals that the API is overloaded
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        True for 429s and timeouts
+    """
+    if getattr(error, "status_code", None) == 429:
+        return True
+    if isinstance(error, DeadlineExceeded):
+        return False
+    return isinstance(
+        error, (*_groq_errors("APITimeoutError"), asyncio.TimeoutError, TimeoutError)
+    )
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limit
+    for async batches.
+
+    The limit grows by roughly one slot per window of healthy completions
+    (latency close to the best recently observed and a low error rate) and
+    is halved on 429s, timeouts or a high error rate. Decreases are spaced
+    out so a burst of failures from the same window only halves once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        max_error_rate: float = 0.1,
+        window: int = 50
+    ):
+        """
+        Initialize the controller
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lowest limit allowed
+            max_limit: Highest limit allowed
+            decrease_factor: Multiplier applied on overload
+            latency_tolerance: Latency (as a multiple of the recent best) still
+                considered healthy
+            max_error_rate: Error fraction over the window that triggers a decrease
+            window: Number of recent outcomes used for latency/error stats
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.history: deque = deque(maxlen=200)
+
+        self._latencies: deque = deque(maxlen=window)
+        self._outcomes: deque = deque(maxlen=window)
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+        self._record("init")
+
+    def _record(self, reason: str):
+        self.history.append({
+            "time": time.time(),
+            "limit": int(self.limit),
+            "reason": reason
+        })
+
+    async def acquire(self):
+        """Wait for a free concurrency slot"""
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            try:
+                remaining = remaining_time()
+                if remaining is None:
+                    await waiter
+                else:
+                    await asyncio.wait_for(waiter, remaining)
+            except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                if isinstance(e, asyncio.TimeoutError):
+                    raise DeadlineExceeded("Deadline exceeded waiting for a concurrency slot") from e
+                raise
+
+    def release(self):
+        """Free a slot and wake waiters the current limit allows"""
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(self._resolve, waiter)
+                free -= 1
+
+    @staticmethod
+    def _resolve(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def on_success(self, latency: float):
+        """
+        Report a completed request
+
+        Args:
+            latency: Seconds the request took
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._outcomes.append(True)
+            best = min(self._latencies)
+            if latency <= best * self.latency_tolerance and self.limit < self.max_limit:
+                previous = int(self.limit)
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                if int(self.limit) > previous:
+                    self._record("increase")
+                    self._wake()
+
+    def on_error(self, error: BaseException):
+        """
+        Report a failed request
+
+        Args:
+            error: Exception raised by the request
+        """
+        with self._lock:
+            self._outcomes.append(False)
+            errors = self._outcomes.count(False)
+            if is_overload_error(error):
+                self._decrease("overload")
+            elif len(self._outcomes) >= 10 and errors / len(self._outcomes) > self.max_error_rate:
+                self._decrease("error_rate")
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        recent = self._latencies[-1] if self._latencies else 1.0
+        if now - self._last_decrease < recent:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self._record(reason)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get controller state for monitoring
+
+        Returns:
+            Current limit, slots in use and recent limit changes
+        """
+        with self._lock:
+            outcomes = len(self._outcomes)
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "error_rate": self._outcomes.count(False) / outcomes if outcomes else 0.0,
+                "history": list(self.history)
+            }
@@ -0,0 +1,210 @@
+"""
+Shared GROQ SDK clients
+
+One pair of SDK clients (and so one set of HTTP connection pools) per API
+key and base URL, reused by every GroqClient in the process, plus shared
+GroqClients for stateless call sites.
+"""
+
+import os
+import threading
+import weakref
+from typing import Dict, Optional, Any, Tuple, TYPE_CHECKING
+import asyncio
+import importlib.util
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+    from groq_client import GroqClient
+
+from groq_core import _groq_sdk, _init_runtime
+
+
+# ============================================================================
+# CLIENT REGISTRY
+# ============================================================================
+
+class ClientRegistry:
+    """
+    Process-wide cache of SDK clients and shared GroqClients.
+
+    Creating a Groq/AsyncGroq pair opens new HTTP connection pools, so every
+    fresh client pays DNS, TCP and TLS setup on its first call. The registry
+    hands out one pair per API key, built on httpx clients with a long
+    keep-alive and HTTP/2 when the h2 package is installed, and one shared
+    GroqClient per (API key, options) for stateless call sites.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 90.0,
+        http2: Optional[bool] = None
+    ):
+        """
+        Initialize the registry
+
+        Args:
+            max_connections: Connection cap per HTTP pool
+            max_keepalive_connections: Idle connections kept open per pool
+            keepalive_expiry: Seconds an idle connection stays open
+            http2: Use HTTP/2 (defaults to whether h2 is installed, checked
+                when the first client is built)
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+
+        self._sdk: Dict[Tuple[str, Optional[str]], Tuple[Any, Any]] = {}
+        self._async: Dict[Tuple[str, Optional[str]], 'weakref.WeakKeyDictionary'] = {}
+        self._clients: Dict[Tuple, 'GroqClient'] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _limits(self) -> 'httpx.Limits':
+        import httpx
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def sdk_clients(self, api_key: str, base_url: Optional[str] = None) -> Tuple[Any, Any]:
+        """
+        Shared (Groq, AsyncGroq) pair for an API key
+
+        SDK-level retries are disabled; RetryPolicy owns retrying.
+
+        Args:
+            api_key: Groq API key
+            base_url: Optional API base URL override
+
+        Returns:
+            Tuple of (sync client, async client)
+        """
+        key = (api_key, base_url)
+        with self._lock:
+            pair = self._sdk.get(key)
+            if pair is None:
+                groq = _groq_sdk()
+                if self.http2 is None:
+                    self.http2 = importlib.util.find_spec("h2") is not None
+                pair = (
+                    groq.Groq(
+                        api_key=api_key, base_url=base_url, max_retries=0,
+                        http_client=groq.DefaultHttpxClient(limits=self._limits(), http2=self.http2)
+                    ),
+                    groq.AsyncGroq(
+                        api_key=api_key, base_url=base_url, max_retries=0,
+                        http_client=groq.DefaultAsyncHttpxClient(limits=self._limits(), http2=self.http2)
+                    )
+                )
+                self._sdk[key] = pair
+            return pair
+
+    def async_client(self, api_key: str, base_url: Optional[str] = None) -> 'AsyncGroq':
+        """
+        Shared AsyncGroq for an API key and the running event loop
+
+        httpx connections belong to the loop that opened them; reusing a
+        pooled connection from another loop (every asyncio.run, every
+        batch_complete) fails with a connection error. Each loop therefore
+        gets its own client, dropped when the loop is garbage collected.
+
+        Args:
+            api_key: Groq API key
+            base_url: Optional API base URL override
+
+        Returns:
+            Async client (the shared pair's one when no loop is running)
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.sdk_clients(api_key, base_url)[1]
+        key = (api_key, base_url)
+        with self._lock:
+            clients = self._async.setdefault(key, weakref.WeakKeyDictionary())
+            client = clients.get(loop)
+            if client is None:
+                groq = _groq_sdk()
+                if self.http2 is None:
+                    self.http2 = importlib.util.find_spec("h2") is not None
+                client = groq.AsyncGroq(
+                    api_key=api_key, base_url=base_url, max_retries=0,
+                    http_client=groq.DefaultAsyncHttpxClient(limits=self._limits(), http2=self.http2)
+                )
+                clients[loop] = client
+            return client
+
+    def get(self, api_key: Optional[str] = None, **options) -> 'GroqClient':
+        """
+        Shared GroqClient for an API key and constructor options
+
+        Options that are not plain values (caches, policies, routers) are
+        keyed by identity, so passing the same object reuses the same client.
+
+        Args:
+            api_key: Groq API key (defaults to GROQ_API_KEY)
+            **options: GroqClient keyword arguments
+
+        Returns:
+            GroqClient shared by every caller with the same key and options
+        """
+        _init_runtime()
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        key = (api_key,) + tuple(
+            (name, value if isinstance(value, (str, int, float, bool, type(None))) else id(value))
+            for name, value in sorted(options.items())
+        )
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+        from groq_client import GroqClient  # groq_client imports this module
+        client = GroqClient(api_key, **options)
+        with self._lock:
+            client = self._clients.setdefault(key, client)
+            self.misses += 1
+        return client
+
+    def clear(self):
+        """Forget all cached clients (open connections close when collected)"""
+        with self._lock:
+            self._sdk.clear()
+            self._async.clear()
+            self._clients.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cached client counts and hit rate"""
+        with self._lock:
+            return {
+                "sdk_clients": len(self._sdk),
+                "loop_clients": sum(len(clients) for clients in self._async.values()),
+                "groq_clients": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+                "http2": self.http2,
+                "keepalive_expiry": self.keepalive_expiry
+            }
+
+
+CLIENT_REGISTRY = ClientRegistry()
+
+
+def get_shared_client(api_key: Optional[str] = None, **options) -> 'GroqClient':
+    """
+    Process-wide GroqClient for short-lived call sites
+
+    Args:
+        api_key: Groq API key (defaults to GROQ_API_KEY)
+        **options: GroqClient keyword arguments
+
+    Returns:
+        Shared GroqClient
+    """
+    return CLIENT_REGISTRY.get(api_key, **options)
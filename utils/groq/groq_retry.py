@@ -0,0 +1,269 @@
+"""
+Retry policy for GROQ API calls
+
+Classifies errors as retryable, honours Retry-After and caps retries with a
+token-bucket retry budget shared between clients.
+"""
+
+import time
+import random
+import threading
+from typing import Dict, Optional, Callable
+import asyncio
+import logging
+
+from groq_core import _groq_errors
+from groq_deadlines import DeadlineExceeded, check_deadline, remaining_time
+
+logger = logging.getLogger("groq_client.retry")
+
+
+# ============================================================================
+# RETRY POLICY
+# ============================================================================
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Classify an API error as transient (worth retrying) or fatal
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        True for 429s, 5xx responses, timeouts and connection failures
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    return isinstance(
+        error,
+        (
+            *_groq_errors("APITimeoutError", "APIConnectionError"),
+            asyncio.TimeoutError, TimeoutError, ConnectionError
+        )
+    )
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read the Retry-After header from an API error, if present
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        Seconds to wait, or None
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """
+    Process-wide cap on retries so they cannot amplify an outage.
+
+    Every first attempt deposits `ratio` tokens and every retry withdraws
+    one, with a small per-second floor so low-traffic callers can still
+    retry. When the budget is empty, transient errors are raised immediately.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 20.0):
+        """
+        Initialize the retry budget
+
+        Args:
+            ratio: Retries allowed per first attempt
+            min_per_second: Retries always allowed per second
+            max_tokens: Maximum saved-up retries
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self):
+        """Record a first attempt"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take one retry from the budget
+
+        Returns:
+            False if the budget is exhausted
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+# Shared by every RetryPolicy unless one is given its own budget
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy:
+    """
+    Retry engine for sync and async calls.
+
+    Only transient errors (see is_retryable_error) are retried. Sleeps
+    honour Retry-After when the API sends it and otherwise use decorrelated
+    jitter: each delay is drawn from [base_delay, previous_delay * 3] and
+    capped at max_delay. Retries are charged against a shared RetryBudget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        budget: Optional[RetryBudget] = None,
+        classifier: Callable[[BaseException], bool] = is_retryable_error
+    ):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_attempts: Total attempts including the first
+            base_delay: Minimum backoff in seconds
+            max_delay: Maximum backoff in seconds
+            budget: Retry budget (defaults to the process-wide budget)
+            classifier: Returns True for errors worth retrying
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or DEFAULT_RETRY_BUDGET
+        self.classifier = classifier
+
+        self.calls = 0
+        self.retries = 0
+        self.fatal_errors = 0
+        self.budget_exhausted = 0
+        self._lock = threading.Lock()
+
+    def _next_delay(self, error: BaseException, previous: float) -> Optional[float]:
+        """Decide whether to retry; returns the sleep in seconds or None to give up"""
+        if isinstance(error, DeadlineExceeded) or not self.classifier(error):
+            with self._lock:
+                self.fatal_errors += 1
+            return None
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            delay = min(retry_after, self.max_delay)
+        else:
+            delay = min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            logger.warning("Not retrying: backoff would outlast the deadline")
+            return None
+        if not self.budget.withdraw():
+            with self._lock:
+                self.budget_exhausted += 1
+            logger.warning("Retry budget exhausted, not retrying")
+            return None
+        with self._lock:
+            self.retries += 1
+        return delay
+
+    def _start(self):
+        self.budget.deposit()
+        with self._lock:
+            self.calls += 1
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """
+        Call fn, retrying transient failures
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's result
+        """
+        self._start()
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            check_deadline(f"attempt {attempt}")
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(e, delay) if attempt < self.max_attempts else None
+                if delay is None:
+                    logger.error(f"Failed after {attempt} attempt(s): {str(e)}")
+                    if not isinstance(e, DeadlineExceeded) and remaining_time() == 0.0:
+                        raise DeadlineExceeded(f"Deadline exceeded after {attempt} attempt(s)") from e
+                    raise
+                logger.warning(f"Attempt {attempt} failed: {str(e)}. Retrying in {delay:.2f}s...")
+                time.sleep(delay)
+
+    async def call_async(self, fn: Callable, *args, **kwargs):
+        """
+        Await fn(*args, **kwargs), retrying transient failures
+
+        Args:
+            fn: Coroutine function to call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's result
+        """
+        self._start()
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            check_deadline(f"attempt {attempt}")
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(e, delay) if attempt < self.max_attempts else None
+                if delay is None:
+                    logger.error(f"Failed after {attempt} attempt(s): {str(e)}")
+                    if not isinstance(e, DeadlineExceeded) and remaining_time() == 0.0:
+                        raise DeadlineExceeded(f"Deadline exceeded after {attempt} attempt(s)") from e
+                    raise
+                logger.warning(f"Attempt {attempt} failed: {str(e)}. Retrying in {delay:.2f}s...")
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get retry counters
+
+        Returns:
+            Calls, retries, fatal errors and budget refusals
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "fatal_errors": self.fatal_errors,
+                "budget_exhausted": self.budget_exhausted
+            }
@@ -0,0 +1,328 @@
+"""
+Priority scheduling for the GROQ client
+
+Weighted fair queuing of requests by priority, so interactive calls are not
+starved by batch work sharing the same rate limits.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional, Union, Any, Tuple
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+import asyncio
+import contextvars
+
+from groq_core import RequestPriority
+from groq_metrics import MetricsRegistry
+from groq_deadlines import DeadlineExceeded, remaining_time
+from groq_rate_limit import AdaptiveConcurrency, RateLimiter, RateReservation
+
+
+# ============================================================================
+# PRIORITY SCHEDULING
+# ============================================================================
+
+# Share of dispatches each class gets while all of them have work queued
+DEFAULT_PRIORITY_WEIGHTS = {
+    RequestPriority.INTERACTIVE: 8.0,
+    RequestPriority.EMAIL: 4.0,
+    RequestPriority.BACKGROUND: 1.0,
+}
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "groq_priority", default=None
+)
+
+
+@contextmanager
+def priority(level: Optional[Union[RequestPriority, str]]):
+    """
+    Schedule every Groq call made inside the block at the given priority
+
+    Args:
+        level: RequestPriority (or its value), or None to keep the current one
+    """
+    if level is None:
+        yield
+        return
+    token = _current_priority.set(RequestPriority(level))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority(default: RequestPriority = RequestPriority.INTERACTIVE) -> RequestPriority:
+    """
+    Priority class of the calling code
+
+    Args:
+        default: Class to use when none was set
+
+    Returns:
+        RequestPriority
+    """
+    return _current_priority.get() or default
+
+
+@dataclass
+class SchedulerTicket:
+    """A request waiting for (or holding) a scheduler slot"""
+    priority: RequestPriority
+    tokens: int
+    limiter: Optional['RateLimiter'] = None
+    finish_tag: float = 0.0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    waited: float = 0.0
+    granted: bool = False
+    preempted: bool = False
+    reservation: Optional['RateReservation'] = None
+    event: Optional[threading.Event] = None
+    future: Optional[asyncio.Future] = None
+
+
+class PriorityScheduler:
+    """
+    Weighted fair queue in front of the Groq quota.
+
+    Requests take a slot (at most max_in_flight run at once) and, when a
+    rate limiter is passed in, their token reservation, in scheduler order
+    rather than first-come-first-served. Each class gets a share of
+    dispatches proportional to its weight, measured in reserved tokens, so
+    a backfill cannot starve chat. Preemptible classes (background by
+    default) are only dispatched when no other class has work queued:
+    an interactive request that arrives overtakes every queued background
+    request. Work that is already running is never interrupted.
+
+    One scheduler can be shared by several GroqClients so that all of them
+    draw on the same quota.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        weights: Optional[Dict[RequestPriority, float]] = None,
+        preemptible: Tuple[RequestPriority, ...] = (RequestPriority.BACKGROUND,),
+        history: int = 1000,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_in_flight: Requests allowed to run at once
+            weights: Relative share per class (defaults to DEFAULT_PRIORITY_WEIGHTS)
+            preemptible: Classes held back while any other class is waiting
+            history: Wait times kept per class for the stats percentiles
+            metrics: Registry for queue depth, wait time and preemptions
+                (GroqClient fills in its own when left empty)
+        """
+        self.max_in_flight = max_in_flight
+        self.weights = dict(DEFAULT_PRIORITY_WEIGHTS)
+        self.weights.update(weights or {})
+        self.preemptible = set(preemptible)
+        self.metrics = metrics
+
+        self._queues: Dict[RequestPriority, deque] = {level: deque() for level in RequestPriority}
+        self._last_finish: Dict[RequestPriority, float] = {level: 0.0 for level in RequestPriority}
+        self._virtual_time = 0.0
+        self._retry_at: Optional[float] = None
+        self.in_flight = 0
+        self._running: Dict[RequestPriority, int] = {level: 0 for level in RequestPriority}
+        self._dispatched: Dict[RequestPriority, int] = {level: 0 for level in RequestPriority}
+        self._preemptions: Dict[RequestPriority, int] = {level: 0 for level in RequestPriority}
+        self._waits: Dict[RequestPriority, deque] = {
+            level: deque(maxlen=history) for level in RequestPriority
+        }
+        self._lock = threading.Lock()
+
+    def _enqueue(self, ticket: SchedulerTicket):
+        # Start-time fair queuing: a class's tags advance by cost / weight,
+        # and an idle class restarts from the current virtual time
+        start = max(self._virtual_time, self._last_finish[ticket.priority])
+        ticket.finish_tag = start + max(1, ticket.tokens) / self.weights[ticket.priority]
+        self._last_finish[ticket.priority] = ticket.finish_tag
+        self._queues[ticket.priority].append(ticket)
+        self._publish_depth(ticket.priority)
+
+    def _pick(self) -> Optional[SchedulerTicket]:
+        heads = [queue[0] for queue in self._queues.values() if queue]
+        urgent = [ticket for ticket in heads if ticket.priority not in self.preemptible]
+        if urgent:
+            for waiting in heads:
+                if waiting.priority in self.preemptible and not waiting.preempted:
+                    waiting.preempted = True
+                    self._preemptions[waiting.priority] += 1
+                    if self.metrics is not None:
+                        self.metrics.inc("groq_scheduler_preemptions_total", priority=waiting.priority.value)
+            heads = urgent
+        return min(heads, key=lambda ticket: ticket.finish_tag, default=None)
+
+    def _dispatch(self):
+        """Grant slots to waiting tickets in fair-queue order"""
+        with self._lock:
+            while self.in_flight < self.max_in_flight:
+                ticket = self._pick()
+                if ticket is None:
+                    break
+                if ticket.limiter is not None:
+                    wait = ticket.limiter._try_take(ticket.tokens)
+                    if wait > 0.0:
+                        # Head of line waits for the quota; nobody overtakes it.
+                        # Wake it once so that its waiter polls the limiter
+                        if self._retry_at is None:
+                            self._wake(ticket)
+                        self._retry_at = time.monotonic() + wait
+                        break
+                    ticket.reservation = RateReservation(tokens=ticket.tokens)
+                self._retry_at = None
+                self._queues[ticket.priority].popleft()
+                self._virtual_time = ticket.finish_tag
+                self.in_flight += 1
+                self._running[ticket.priority] += 1
+                self._dispatched[ticket.priority] += 1
+                ticket.waited = time.monotonic() - ticket.enqueued_at
+                ticket.granted = True
+                self._waits[ticket.priority].append(ticket.waited)
+                self._publish_depth(ticket.priority)
+                if self.metrics is not None:
+                    self.metrics.observe(
+                        "groq_scheduler_wait_seconds", ticket.waited, priority=ticket.priority.value
+                    )
+                self._wake(ticket)
+
+    @staticmethod
+    def _wake(ticket: SchedulerTicket):
+        if ticket.event is not None:
+            ticket.event.set()
+        else:
+            ticket.future.get_loop().call_soon_threadsafe(AdaptiveConcurrency._resolve, ticket.future)
+
+    def _publish_depth(self, level: RequestPriority):
+        if self.metrics is not None:
+            self.metrics.set_gauge("groq_scheduler_queue_depth", len(self._queues[level]), priority=level.value)
+
+    def _poll_timeout(self) -> Optional[float]:
+        """How long a waiter may sleep before re-checking the rate limit and deadline"""
+        timeouts = [remaining_time()]
+        if self._retry_at is not None:
+            timeouts.append(max(0.001, self._retry_at - time.monotonic()))
+        timeouts = [timeout for timeout in timeouts if timeout is not None]
+        return min(timeouts) if timeouts else None
+
+    def _abandon(self, ticket: SchedulerTicket) -> bool:
+        """Withdraw a waiting ticket; False if it was granted meanwhile"""
+        with self._lock:
+            if ticket.granted:
+                return False
+            self._queues[ticket.priority].remove(ticket)
+            self._publish_depth(ticket.priority)
+        # It may have been holding up the queue
+        self._dispatch()
+        return True
+
+    def _ticket(self, tokens: int, level: Optional[RequestPriority], limiter: Optional['RateLimiter'], **waiter) -> SchedulerTicket:
+        ticket = SchedulerTicket(
+            priority=RequestPriority(level) if level is not None else current_priority(),
+            tokens=tokens,
+            limiter=limiter,
+            **waiter
+        )
+        with self._lock:
+            self._enqueue(ticket)
+        return ticket
+
+    def acquire(
+        self,
+        tokens: int = 0,
+        level: Optional[RequestPriority] = None,
+        limiter: Optional['RateLimiter'] = None
+    ) -> SchedulerTicket:
+        """
+        Block until the scheduler dispatches this request
+
+        Args:
+            tokens: Reservation size (the request's cost for fair queuing)
+            level: Priority class (defaults to current_priority())
+            limiter: Rate limiter to reserve tokens from when dispatched
+
+        Returns:
+            Granted ticket; its reservation belongs to limiter. Pass it to release
+        """
+        ticket = self._ticket(tokens, level, limiter, event=threading.Event())
+        self._dispatch()
+        while True:
+            with self._lock:
+                if ticket.granted:
+                    return ticket
+                ticket.event.clear()
+            if remaining_time() == 0.0 and self._abandon(ticket):
+                raise DeadlineExceeded(f"Deadline exceeded queued as {ticket.priority.value}")
+            ticket.event.wait(self._poll_timeout())
+            self._dispatch()
+
+    async def acquire_async(
+        self,
+        tokens: int = 0,
+        level: Optional[RequestPriority] = None,
+        limiter: Optional['RateLimiter'] = None
+    ) -> SchedulerTicket:
+        """Async counterpart of acquire"""
+        loop = asyncio.get_running_loop()
+        ticket = self._ticket(tokens, level, limiter, future=loop.create_future())
+        self._dispatch()
+        try:
+            while True:
+                with self._lock:
+                    if ticket.granted:
+                        return ticket
+                    if ticket.future.done():
+                        ticket.future = loop.create_future()
+                if remaining_time() == 0.0 and self._abandon(ticket):
+                    raise DeadlineExceeded(f"Deadline exceeded queued as {ticket.priority.value}")
+                await asyncio.wait({ticket.future}, timeout=self._poll_timeout())
+                self._dispatch()
+        except asyncio.CancelledError:
+            if not self._abandon(ticket):
+                self.release(ticket)
+            raise
+
+    def release(self, ticket: SchedulerTicket):
+        """
+        Free a granted ticket's slot and dispatch the next request
+
+        The rate reservation is settled separately with the limiter.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self._running[ticket.priority] -= 1
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth, running requests and wait times per class
+
+        Returns:
+            Totals plus one entry per priority class
+        """
+        with self._lock:
+            classes = {}
+            for level in RequestPriority:
+                waits = sorted(self._waits[level])
+                classes[level.value] = {
+                    "weight": self.weights[level],
+                    "queued": len(self._queues[level]),
+                    "in_flight": self._running[level],
+                    "dispatched": self._dispatched[level],
+                    "preempted": self._preemptions[level],
+                    "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                    "wait_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                    "wait_max": waits[-1] if waits else 0.0,
+                }
+            return {
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "classes": classes
+            }
@@ -23,7 +23,7 @@ if sys.platform == "win32":
 
 # Import the main GROQ client
 try:
-    from groq_client import GroqClient, CompletionConfig, Temperature
+    from groq_client import get_shared_client, CompletionConfig, Temperature
 except ImportError:
     print("ERROR: groq_client.py module not found. Please ensure groq_client.py is in the same directory.")
     exit(1)
@@ -148,7 +148,7 @@ class GroqContextQuery:
             csv_path: Path to CSV file
             api_key: Optional GROQ API key
         """
-        self.groq_client = GroqClient(api_key)
+        self.groq_client = get_shared_client(api_key)
         self.csv_loader = CSVContextLoader(csv_path)
         self.csv_loader.load()
 
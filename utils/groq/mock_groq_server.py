@@ -0,0 +1,523 @@
+"""
+Local Groq/OpenAI-compatible mock server for load tests and benchmarks
+
+Serves POST /openai/v1/chat/completions (streaming and non-streaming) so a
+GroqClient can be pointed at it with base_url (or GROQ_BASE_URL) and
+exercised without spending tokens. Answers come from, in order:
+
+1. A journal of recorded exchanges, matched on model + messages, then on
+   messages alone
+2. Canned JSON for the recruitment task recognised in the prompt
+   (CV parsing, matching, skills, sentiment, email classification, ...)
+3. A short generic reply
+
+Latency is time to first token (fixed, uniform, lognormal, or replayed
+from the journal) plus completion tokens at a configurable token rate.
+A share of requests can be answered with 429s (with Retry-After) or 5xx.
+
+Usage:
+    python mock_groq_server.py --port 8000
+    python mock_groq_server.py --journal journal/ --latency journal --rate-429 0.02
+    GROQ_BASE_URL=http://localhost:8000 python classify_email.py ...
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from groq_client import TaskType, read_journal
+
+
+# ============================================================================
+# CANNED RESPONSES
+# ============================================================================
+
+# Phrases from the prompts GroqClient and the email classifiers send
+TASK_MARKERS: List[Tuple[TaskType, re.Pattern]] = [
+    (TaskType.EMAIL_CLASSIFICATION, re.compile(r"email classification", re.IGNORECASE)),
+    (TaskType.CV_PARSING, re.compile(r"CV parser|Parse this CV", re.IGNORECASE)),
+    (TaskType.JOB_MATCHING, re.compile(r"candidate-job matching", re.IGNORECASE)),
+    (TaskType.INTERVIEW_QUESTIONS, re.compile(r"interview questions", re.IGNORECASE)),
+    (TaskType.SKILL_EXTRACTION, re.compile(r"skills (mentioned )?(from|in) this text", re.IGNORECASE)),
+    (TaskType.SENTIMENT_ANALYSIS, re.compile(r"sentiment of this text", re.IGNORECASE)),
+    (TaskType.JOB_DESCRIPTION, re.compile(r"job description", re.IGNORECASE)),
+    (TaskType.CANDIDATE_SUMMARY, re.compile(r"candidate summar", re.IGNORECASE)),
+    (TaskType.EMAIL_GENERATION, re.compile(r"communication specialist", re.IGNORECASE)),
+]
+
+CANNED_RESPONSES: Dict[TaskType, Any] = {
+    TaskType.EMAIL_CLASSIFICATION: {
+        "category": "candidate",
+        "subcategory": "application",
+        "confidence": 0.86,
+        "priority": "normal",
+        "sentiment": "positive",
+        "keywords": ["cv", "application"],
+        "requires_action": True,
+        "suggested_actions": ["Review CV", "Acknowledge application"],
+        "reasoning": "Sender is applying for a role and attached a CV"
+    },
+    TaskType.CV_PARSING: {
+        "personal_info": {"name": "Alex Morgan", "email": "alex@example.com", "phone": None, "location": "Leeds"},
+        "skills": ["Python", "SQL", "Stakeholder Management"],
+        "experience": [{"title": "Data Analyst", "company": "Acme Ltd", "duration": "2019-2024"}],
+        "education": [{"degree": "BSc Mathematics", "institution": "University of York", "year": "2019"}],
+        "summary": "Data analyst with five years of experience in reporting and automation",
+        "languages": ["English"],
+        "certifications": []
+    },
+    TaskType.JOB_MATCHING: {
+        "match_score": 72,
+        "strengths": ["Relevant industry experience", "Strong SQL"],
+        "gaps": ["No cloud certification"],
+        "recommendations": ["Probe cloud experience at interview"],
+        "summary": "Good match with minor gaps"
+    },
+    TaskType.INTERVIEW_QUESTIONS: [
+        {"question": "Describe a data pipeline you built end to end.", "category": "technical",
+         "skill_assessed": "Data Engineering"},
+        {"question": "Tell me about a time you handled a difficult stakeholder.", "category": "behavioral",
+         "skill_assessed": "Stakeholder Management"},
+        {"question": "How would you prioritise three urgent requests?", "category": "situational",
+         "skill_assessed": "Time Management"}
+    ],
+    TaskType.SKILL_EXTRACTION: {
+        "technical": ["Python", "SQL"],
+        "soft_skills": ["Communication"],
+        "domain_knowledge": ["Recruitment"],
+        "tools_and_technologies": ["Excel", "AWS"]
+    },
+    TaskType.SENTIMENT_ANALYSIS: {
+        "sentiment": "positive",
+        "confidence": 0.8,
+        "key_themes": ["responsiveness", "quality"],
+        "emotional_tone": "appreciative",
+        "summary": "Broadly positive feedback"
+    },
+    TaskType.JOB_DESCRIPTION: (
+        "## About the role\nWe are looking for an experienced professional to join a growing team.\n\n"
+        "## Responsibilities\n- Deliver high-quality work\n- Collaborate across teams\n\n"
+        "## Requirements\n- Relevant experience\n- Strong communication skills"
+    ),
+    TaskType.CANDIDATE_SUMMARY: (
+        "Experienced analyst with a track record of automating reporting and working closely "
+        "with stakeholders. Strong SQL and Python, available on one month's notice."
+    ),
+    TaskType.EMAIL_GENERATION: (
+        "Subject: Next steps\n\nHi,\n\nThank you for your time today. I will be in touch shortly "
+        "with next steps.\n\nKind regards"
+    ),
+}
+
+DEFAULT_REPLY = "OK"
+
+
+def detect_task(messages: List[Dict[str, Any]]) -> Optional[TaskType]:
+    """Recognise the recruitment task a request is for from its prompts"""
+    text = "\n".join(str(message.get("content", "")) for message in messages)
+    for task, marker in TASK_MARKERS:
+        if marker.search(text):
+            return task
+    return None
+
+
+def canned_content(messages: List[Dict[str, Any]]) -> str:
+    """Canned answer for a request, as the model would return it"""
+    task = detect_task(messages)
+    if task is None:
+        return DEFAULT_REPLY
+    answer = CANNED_RESPONSES[task]
+    if task == TaskType.SKILL_EXTRACTION and "JSON array" in str(messages[-1].get("content", "")):
+        answer = [skill for skills in answer.values() for skill in skills]
+    return answer if isinstance(answer, str) else json.dumps(answer)
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+# ============================================================================
+# JOURNAL REPLAY
+# ============================================================================
+
+def exchange_key(messages: List[Dict[str, Any]], model: Optional[str] = None) -> str:
+    """Key recorded exchanges by messages (and model, when given)"""
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ============================================================================
+# LATENCY PROFILE
+# ============================================================================
+
+@dataclass
+class LatencyProfile:
+    """
+    Time-to-first-token distribution plus a generation rate
+
+    Kinds (parameters in milliseconds):
+        fixed:a          always a
+        uniform:a,b      uniformly between a and b
+        lognormal:a,s    median a with log-space spread s
+        journal          latencies recorded in the journal (exact for
+                         replayed requests, sampled for the rest)
+    """
+    kind: str = "lognormal"
+    params: Tuple[float, ...] = (200.0, 0.35)
+    tokens_per_second: float = 400.0
+    recorded: List[float] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, spec: str, tokens_per_second: float = 400.0) -> 'LatencyProfile':
+        """
+        Build a profile from "kind:a,b" (e.g. "uniform:100,400")
+
+        Raises:
+            ValueError: For an unknown kind or missing parameters
+        """
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(value) for value in raw.split(",") if value)
+        needed = {"fixed": 1, "uniform": 2, "lognormal": 2, "journal": 0}
+        if kind not in needed or len(params) != needed[kind]:
+            raise ValueError(f"Invalid latency profile: {spec!r}")
+        return cls(kind, params, tokens_per_second)
+
+    def first_token(self, rng: random.Random, recorded: Optional[float] = None) -> float:
+        """Seconds before the first token"""
+        if self.kind == "journal":
+            if recorded is not None:
+                return recorded
+            return rng.choice(self.recorded) if self.recorded else 0.0
+        if self.kind == "fixed":
+            return self.params[0] / 1000
+        if self.kind == "uniform":
+            return rng.uniform(*self.params) / 1000
+        median, spread = self.params
+        return rng.lognormvariate(math.log(median), spread) / 1000
+
+    def generation(self, completion_tokens: int) -> float:
+        """Seconds to generate completion_tokens"""
+        if self.kind == "journal" or self.tokens_per_second <= 0:
+            return 0.0
+        return completion_tokens / self.tokens_per_second
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class MockGroqServer:
+    """
+    In-process Groq-compatible HTTP server
+
+    Example:
+        with MockGroqServer(error_429=0.05) as server:
+            client = GroqClient(api_key="mock", base_url=server.url)
+            client.complete("Hello")
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        journal: Optional[str] = None,
+        latency: Optional[LatencyProfile] = None,
+        error_429: float = 0.0,
+        error_5xx: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the server (call start() or use it as a context manager)
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            journal: Journal file or directory to replay
+            latency: Latency profile (defaults to LatencyProfile())
+            error_429: Share of requests answered with 429
+            error_5xx: Share of requests answered with 500/502/503
+            retry_after: Retry-After seconds sent with 429s
+            seed: Random seed for reproducible runs
+        """
+        self.latency = latency or LatencyProfile()
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "streams": 0, "replayed": 0, "canned": 0, "429": 0, "5xx": 0}
+
+        self._exchanges: Dict[str, Dict[str, Any]] = {}
+        self.recorded = 0
+        if journal is not None:
+            self.load(journal)
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL for GroqClient(base_url=...)"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def load(self, journal: str) -> int:
+        """
+        Add recorded exchanges from a journal
+
+        Returns:
+            Number of exchanges loaded
+        """
+        loaded = 0
+        for exchange in read_journal(journal):
+            request = exchange.get("request") or {}
+            messages = request.get("messages")
+            if not messages or not exchange.get("response"):
+                continue
+            # Later records win, so a re-recorded journal replays the newest answer
+            self._exchanges[exchange_key(messages, request.get("model"))] = exchange
+            self._exchanges[exchange_key(messages)] = exchange
+            if exchange.get("latency") is not None:
+                self.latency.recorded.append(float(exchange["latency"]))
+            loaded += 1
+        self.recorded += loaded
+        return loaded
+
+    def start(self) -> 'MockGroqServer':
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-groq", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread = None
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        """Serve on the calling thread"""
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> 'MockGroqServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served by outcome"""
+        with self._lock:
+            return dict(self.counts)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _fault(self) -> Optional[int]:
+        """Status code to fail this request with, if any"""
+        with self._lock:
+            roll = self._rng.random()
+            if roll < self.error_429:
+                return 429
+            if roll < self.error_429 + self.error_5xx:
+                return self._rng.choice((500, 502, 503))
+        return None
+
+    def _answer(self, body: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, int]], str, float]:
+        """Content, recorded usage, finish reason and first-token delay for a request"""
+        messages = body.get("messages") or []
+        exchange = (
+            self._exchanges.get(exchange_key(messages, body.get("model")))
+            or self._exchanges.get(exchange_key(messages))
+        )
+        with self._lock:
+            if exchange is not None:
+                self.counts["replayed"] += 1
+                response = exchange["response"]
+                delay = self.latency.first_token(self._rng, exchange.get("latency"))
+                return response["content"], response.get("usage"), response.get("finish_reason", "stop"), delay
+            self.counts["canned"] += 1
+            delay = self.latency.first_token(self._rng)
+
+        content = canned_content(messages)
+        finish_reason = "stop"
+        max_tokens = body.get("max_tokens")
+        if max_tokens and count_tokens(content) > max_tokens:
+            content = content[:max_tokens * 4]
+            finish_reason = "length"
+        return content, None, finish_reason, delay
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this,
+            # Nagle plus delayed ACKs add ~40ms to every response
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    models = sorted({
+                        exchange["request"].get("model") for exchange in server._exchanges.values()
+                    } - {None})
+                    self._send_json(200, {"object": "list", "data": [
+                        {"id": model, "object": "model", "owned_by": "mock"} for model in models
+                    ]})
+                elif self.path.rstrip("/") == "/stats":
+                    self._send_json(200, server.stats())
+                else:
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                    return
+                server._count("requests")
+
+                status = server._fault()
+                if status == 429:
+                    server._count("429")
+                    self._send_json(429, {"error": {
+                        "message": "Rate limit reached (mock)", "type": "tokens", "code": "rate_limit_exceeded"
+                    }}, {"Retry-After": f"{server.retry_after:g}"})
+                    return
+
+                content, usage, finish_reason, delay = server._answer(body)
+                if status is not None:
+                    server._count("5xx")
+                    time.sleep(delay)
+                    self._send_json(status, {"error": {"message": "Service unavailable (mock)", "type": "internal_server_error"}})
+                    return
+
+                if usage is None:
+                    prompt_tokens = sum(count_tokens(str(m.get("content", ""))) for m in body.get("messages") or [])
+                    completion_tokens = count_tokens(content)
+                    usage = {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens
+                    }
+                model = body.get("model", "mock")
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+                created = int(time.time())
+
+                time.sleep(delay)
+                if body.get("stream"):
+                    server._count("streams")
+                    self._stream(completion_id, created, model, content, usage, finish_reason)
+                    return
+
+                time.sleep(server.latency.generation(usage["completion_tokens"]))
+                self._send_json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "logprobs": None,
+                        "finish_reason": finish_reason
+                    }],
+                    "usage": usage
+                })
+
+            def _stream(self, completion_id: str, created: int, model: str,
+                        content: str, usage: Dict[str, int], finish_reason: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def event(delta: Dict[str, Any], finish: Optional[str] = None, **extra) -> bytes:
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                        "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                        **extra
+                    }
+                    return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+                # About four characters per token; send roughly 20ms of tokens per chunk
+                tokens_per_second = server.latency.tokens_per_second
+                step = max(4, int(tokens_per_second * 0.02) * 4) if tokens_per_second > 0 else len(content) or 1
+                try:
+                    self._write_chunk(event({"role": "assistant", "content": ""}))
+                    for start in range(0, len(content), step):
+                        piece = content[start:start + step]
+                        time.sleep(server.latency.generation(count_tokens(piece)))
+                        self._write_chunk(event({"content": piece}))
+                    self._write_chunk(event({}, finish_reason, x_groq={"usage": usage}))
+                    self._write_chunk(b"data: [DONE]\n\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client closed the stream early (e.g. stop_at_json)
+                    self.close_connection = True
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local Groq-compatible mock API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument("--journal", help="Journal file or directory to replay")
+    parser.add_argument("--latency", default="lognormal:200,0.35",
+                        help="First-token latency: fixed:ms, uniform:ms,ms, lognormal:median_ms,spread or journal")
+    parser.add_argument("--tps", type=float, default=400.0, help="Generated tokens per second")
+    parser.add_argument("--rate-429", dest="rate_429", type=float, default=0.0, help="Share of requests rate limited")
+    parser.add_argument("--rate-5xx", dest="rate_5xx", type=float, default=0.0, help="Share of requests failing with 5xx")
+    parser.add_argument("--retry-after", dest="retry_after", type=float, default=1.0, help="Retry-After on 429s")
+    parser.add_argument("--seed", type=int, help="Random seed")
+    args = parser.parse_args()
+
+    server = MockGroqServer(
+        args.host, args.port, journal=args.journal,
+        latency=LatencyProfile.parse(args.latency, args.tps),
+        error_429=args.rate_429, error_5xx=args.rate_5xx,
+        retry_after=args.retry_after, seed=args.seed
+    )
+    print(f"Mock Groq API on {server.url} ({server.recorded} recorded exchanges)")
+    print(f"Point clients at it with GROQ_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
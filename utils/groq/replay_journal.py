@@ -0,0 +1,153 @@
+"""
+Replay a request journal against a new model or prompt version
+
+Re-sends journaled requests (see RequestJournal) and compares the new
+answers with the recorded ones: identical content, JSON validity, tokens
+and latency. Use it to check a model switch or a system prompt change on
+real traffic before rolling it out, or to reproduce a slow or bad response.
+
+Usage:
+    python replay_journal.py journal/ --model llama-3.1-8b-instant --limit 200
+    python replay_journal.py journal/ --operation extract_skills --system-prompt prompts/skills_v2.txt
+    python replay_journal.py journal/ --base-url http://localhost:8000 --output replayed.jsonl --show-diffs 5
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from groq_client import GroqClient, RequestJournal, read_journal, replay_entry
+
+
+def is_json(text: str) -> bool:
+    """Whether text parses as JSON"""
+    try:
+        json.loads(text)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def replay_one(client: GroqClient, entry: Dict[str, Any], model: Optional[str],
+               system_prompt: Optional[str]) -> Dict[str, Any]:
+    """Replay one entry and compare it with the recorded response"""
+    old = entry["response"]
+    start = time.perf_counter()
+    try:
+        new = replay_entry(client, entry, model=model, system_prompt=system_prompt)
+    except Exception as e:
+        return {"entry": entry, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "entry": entry,
+        "new": new.to_dict(),
+        "latency": time.perf_counter() - start,
+        "identical": new.content.strip() == old["content"].strip(),
+        "old_json": is_json(old["content"]),
+        "new_json": is_json(new.content),
+    }
+
+
+def summarize(results: List[Dict[str, Any]]):
+    """Print old vs new totals for a replay"""
+    done = [result for result in results if "error" not in result]
+    errors = len(results) - len(done)
+    print(f"\nReplayed {len(results)} requests ({errors} errors)")
+    if not done:
+        return
+
+    def tokens(side: str) -> int:
+        return sum(
+            (result["entry"]["response"] if side == "old" else result["new"])["usage"].get("total_tokens", 0)
+            for result in done
+        )
+
+    old_latency = [result["entry"].get("latency") or 0.0 for result in done]
+    new_latency = [result["latency"] for result in done]
+    print(f"  identical answers   {sum(result['identical'] for result in done) / len(done):8.1%}")
+    print(f"  valid JSON          old {sum(r['old_json'] for r in done) / len(done):7.1%}"
+          f"   new {sum(r['new_json'] for r in done) / len(done):7.1%}")
+    print(f"  total tokens        old {tokens('old'):>8}   new {tokens('new'):>8}")
+    for name, fraction in (("p50", 0.50), ("p95", 0.95)):
+        print(f"  latency {name}         old {percentile(old_latency, fraction) * 1000:6.0f} ms"
+              f"  new {percentile(new_latency, fraction) * 1000:6.0f} ms")
+    print(f"  mean latency        old {statistics.mean(old_latency) * 1000:6.0f} ms"
+          f"  new {statistics.mean(new_latency) * 1000:6.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Groq request journal")
+    parser.add_argument("journal", help="Journal file or directory")
+    parser.add_argument("--model", help="Send every request to this model instead")
+    parser.add_argument("--system-prompt", dest="system_prompt", help="File with a replacement system prompt")
+    parser.add_argument("--operation", help="Only replay entries of this operation (e.g. parse_cv)")
+    parser.add_argument("--limit", type=int, help="Replay at most this many entries (newest last)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    parser.add_argument("--base-url", dest="base_url", help="API base URL (e.g. a local mock server)")
+    parser.add_argument("--output", help="Write old/new pairs to this JSON-lines file")
+    parser.add_argument("--record", help="Journal directory for the replayed requests")
+    parser.add_argument("--show-diffs", dest="show_diffs", type=int, default=0, help="Print this many differing answers")
+    args = parser.parse_args()
+    if args.limit is not None and args.limit < 1:
+        parser.error("--limit must be at least 1")
+
+    system_prompt = None
+    if args.system_prompt:
+        with open(args.system_prompt, "r", encoding="utf-8") as f:
+            system_prompt = f.read()
+
+    entries = [
+        entry for entry in read_journal(args.journal)
+        if entry.get("response") and not entry.get("error")
+        and (args.operation is None or entry.get("operation") == args.operation)
+    ]
+    if args.limit is not None:
+        entries = entries[-args.limit:]
+
+    journal = RequestJournal(args.record) if args.record else None
+    client = GroqClient(base_url=args.base_url, journal=journal)
+    for name in ("groq_client", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda entry: replay_one(client, entry, args.model, system_prompt), entries))
+    if journal is not None:
+        journal.close()
+
+    summarize(results)
+
+    shown = 0
+    for result in results:
+        if shown >= args.show_diffs:
+            break
+        if "error" in result or result["identical"]:
+            continue
+        shown += 1
+        print(f"\n--- {result['entry'].get('operation')} ({result['entry']['request']['model']})")
+        print(f"old: {result['entry']['response']['content'][:500]}")
+        print(f"new: {result['new']['content'][:500]}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps({
+                    "operation": result["entry"].get("operation"),
+                    "request": result["entry"]["request"],
+                    "old": result["entry"]["response"],
+                    "new": result.get("new"),
+                    "error": result.get("error"),
+                    "identical": result.get("identical")
+                }, ensure_ascii=False) + "\n")
+        print(f"\nWrote {len(results)} comparisons to {args.output}")
+
+
+if __name__ == "__main__":
+    main()